@@ -0,0 +1,232 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+import contextlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tkinter as tk
+import tracemalloc
+
+from bench.fake_meson import fake_meson_on_path
+from code.app import MesonBuild, MesonBuildGUI, ReusableDialog, SetupDialog, ConfigureDialog, InitDialog
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_TOLERANCE = 0.25
+# Measured only with a display; a headless run reports them as skipped, but
+# they are gated all the same, so each one needs a recorded baseline value.
+GUI_METRICS = (
+    "update_terminal_throughput", "update_terminal_line_latency", "dialog_open_SetupDialog",
+    "dialog_open_ConfigureDialog", "dialog_open_InitDialog", "theme_switch", "memory_growth_per_job",
+)
+
+
+class BenchResult:
+    def __init__(self, name, value, unit, higher_is_better=False):
+        self.name = name
+        self.value = value
+        self.unit = unit
+        self.higher_is_better = higher_is_better
+
+    def to_dict(self):
+        return {"value": self.value, "unit": self.unit, "higher_is_better": self.higher_is_better}
+
+
+def timed(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+@contextlib.contextmanager
+def scratch_cwd():
+    # MesonBuildGUI writes settings.ini into the working directory.
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="fossil-bench-") as directory:
+        os.chdir(directory)
+        try:
+            yield directory
+        finally:
+            os.chdir(previous)
+
+
+def bench_run_command(repeat=20):
+    results = []
+    build = MesonBuild(os.getcwd(), "builddir")
+    with fake_meson_on_path(lines=0):
+        raw = timed(lambda: subprocess.run(["meson", "--version"], capture_output=True), repeat)
+        wrapped = timed(lambda: build.run_command(["meson", "--version"]), repeat)
+    # The overhead is reported for reading; the latency itself is what gets compared.
+    results.append(BenchResult("run_command_latency", wrapped * 1000.0, "ms"))
+    print(f"run_command overhead over a bare subprocess.run: {(wrapped - raw) * 1000.0:.2f} ms")
+
+    lines = 200000
+    with fake_meson_on_path(lines=lines, line_size=100):
+        elapsed = timed(lambda: build.run_command(["meson", "compile"]), 3)
+    results.append(BenchResult(
+        "run_command_throughput", lines * 101 / elapsed / (1 << 20), "MiB/s", True
+    ))
+    return results
+
+
+def close_dialogs(root):
+    for child in root.winfo_children():
+        if isinstance(child, ReusableDialog):
+            child.cancel()
+        elif isinstance(child, tk.Toplevel):
+            child.destroy()
+
+
+def bench_gui(repeat=10):
+    results = []
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Skipping GUI benchmarks: {e}")
+        return results
+    root.withdraw()
+    try:
+        app = MesonBuildGUI(root)
+        line = "[123/4567] Compiling C++ object src/libfoo.so.p/module_with_a_long_name.cpp.o\n"
+
+        chunk = line * 1000
+        started = time.perf_counter()
+        for _ in range(50):
+            app.update_terminal(chunk)
+        elapsed = time.perf_counter() - started
+        results.append(BenchResult("update_terminal_throughput", 50000 / elapsed, "lines/s", True))
+
+        started = time.perf_counter()
+        for _ in range(2000):
+            app.update_terminal(line)
+        elapsed = time.perf_counter() - started
+        results.append(BenchResult("update_terminal_line_latency", elapsed / 2000 * 1e6, "us"))
+        app.clear_terminal()
+
+        options = [
+            {"name": f"option{index}", "value": bool(index % 2), "section": "user",
+             "type": "boolean", "description": ""}
+            for index in range(200)
+        ]
+        dialogs = {
+            "SetupDialog": lambda: app.dialog(SetupDialog).show(),
+            "ConfigureDialog": lambda: app.dialog(ConfigureDialog).show("builddir", options),
+            "InitDialog": lambda: app.dialog(InitDialog).show(),
+        }
+        for name, show in dialogs.items():
+            def open_dialog(show=show):
+                root.after(1, close_dialogs, root)
+                show()
+            results.append(BenchResult(
+                f"dialog_open_{name}", timed(open_dialog, repeat) * 1000.0, "ms"
+            ))
+
+        themes = ("light", "dark", "meson")
+        started = time.perf_counter()
+        for index in range(30):
+            app.set_theme(themes[index % len(themes)])
+            root.update_idletasks()
+        results.append(BenchResult("theme_switch", (time.perf_counter() - started) / 30 * 1000.0, "ms"))
+
+        tracemalloc.start()
+        with fake_meson_on_path(lines=20000, line_size=100):
+            app.update_terminal(app.meson_build.run_command(["meson", "compile"]))
+            app.clear_terminal()
+            before = tracemalloc.get_traced_memory()[0]
+            for _ in range(5):
+                app.update_terminal(app.meson_build.run_command(["meson", "compile"]))
+                app.clear_terminal()
+                root.update()
+            after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        results.append(BenchResult("memory_growth_per_job", (after - before) / 5 / 1024.0, "KiB"))
+    finally:
+        root.destroy()
+    return results
+
+
+def run_benchmarks():
+    results = bench_run_command()
+    with scratch_cwd():
+        results.extend(bench_gui())
+    return results
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    # Returns (regressions, gated metrics with no baseline value); both fail
+    # the comparison. Only --update-baseline records a missing value.
+    regressions = []
+    gated = {result.name for result in results} | set(GUI_METRICS)
+    unbaselined = sorted(name for name in gated if not (baseline.get(name) or {}).get("value"))
+    for result in results:
+        reference = baseline.get(result.name)
+        if not reference or not reference.get("value"):
+            continue
+        change = (result.value - reference["value"]) / abs(reference["value"])
+        if result.higher_is_better:
+            change = -change
+        if change > tolerance:
+            regressions.append((result, reference["value"], change))
+    return regressions, unbaselined
+
+
+def skipped(results, baseline):
+    # Baselined metrics this run did not measure, such as the GUI metrics
+    # without a display.
+    measured = {result.name for result in results}
+    expected = set(baseline) | set(GUI_METRICS)
+    return sorted(name for name in expected if name not in measured and (baseline.get(name) or {}).get("value"))
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    results = run_benchmarks()
+    for result in results:
+        print(f"{result.name:32} {result.value:14.2f} {result.unit}")
+
+    if "--update-baseline" in argv:
+        baseline = {}
+        if os.path.exists(BASELINE_FILE):
+            # A headless run keeps the GUI values recorded on a machine with a display.
+            with open(BASELINE_FILE) as handle:
+                baseline = json.load(handle)
+        baseline.update({result.name: result.to_dict() for result in results})
+        with open(BASELINE_FILE, "w") as handle:
+            json.dump(baseline, handle, indent=2)
+            handle.write("\n")
+        print(f"Baseline written to {BASELINE_FILE}")
+        return 0
+
+    if not os.path.exists(BASELINE_FILE):
+        print("No baseline stored; run with --update-baseline to create one.")
+        return 0
+    with open(BASELINE_FILE) as handle:
+        baseline = json.load(handle)
+    regressions, unbaselined = compare(results, baseline)
+    for name in skipped(results, baseline):
+        print(f"SKIPPED {name}: not measured in this run (GUI metrics need a display, e.g. xvfb-run)")
+    for name in unbaselined:
+        print(f"FAILED {name}: no baseline value; record one with --update-baseline (under a display for GUI metrics)")
+    for result, reference, change in regressions:
+        print(f"REGRESSION {result.name}: {result.value:.2f} {result.unit} vs {reference:.2f} ({change:+.0%})")
+    return 1 if regressions or unbaselined else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from bench.synth_project import generate_project
+from code.app import MesonBuild
+from code.sampler import format_bytes
+
+DEFAULT_SIZES = [(5, 5, 5), (20, 10, 20), (50, 20, 50)]
+STEPS = ("setup", "compile", "test", "introspect")
+
+
+def parse_sizes(text):
+    sizes = []
+    for item in text.split(","):
+        targets, sources, tests = (int(part) for part in item.lower().split("x"))
+        sizes.append((targets, sources, tests))
+    return sizes
+
+
+def measure_latency(function, tick=0.01):
+    # Runs the step on a worker thread, like MesonBuildGUI does, and records how
+    # late a 10 ms main-thread timer fires meanwhile. That lag is what the Tk
+    # event loop would feel as GUI latency.
+    worker = threading.Thread(target=function)
+    worker.start()
+    worst = 0.0
+    while worker.is_alive():
+        expected = time.perf_counter() + tick
+        time.sleep(tick)
+        worst = max(worst, time.perf_counter() - expected)
+    worker.join()
+    return worst
+
+
+def run_step(build, step):
+    outcome = {}
+
+    def target():
+        if step == "introspect":
+            outcome["result"] = build.introspect("--targets")
+        else:
+            outcome["result"] = getattr(build, step)()
+
+    started = time.perf_counter()
+    latency = measure_latency(target)
+    elapsed = time.perf_counter() - started
+    result = outcome.get("result")
+    peak_rss = result.resources.peak_rss if result is not None and result.resources else 0
+    failed = result is None or not result.ok
+    return elapsed, latency, peak_rss, failed
+
+
+def bench_size(targets, sources, tests):
+    workspace = tempfile.mkdtemp(prefix="fossil-synth-")
+    try:
+        source_dir = generate_project(os.path.join(workspace, "src"), targets, sources, tests)
+        build = MesonBuild(source_dir, os.path.join(workspace, "build"))
+        rows = []
+        tracemalloc.start()
+        for step in STEPS:
+            rows.append((step,) + run_step(build, step))
+        python_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return rows, python_peak
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if shutil.which("meson") is None:
+        print("Skipping scaling benchmark: meson is not installed.")
+        return 0
+    sizes = DEFAULT_SIZES
+    if "--sizes" in argv:
+        sizes = parse_sizes(argv[argv.index("--sizes") + 1])
+
+    print(f"{'size':>12} {'step':>10} {'wall':>9} {'gui lag':>9} {'tree rss':>12}")
+    for targets, sources, tests in sizes:
+        rows, python_peak = bench_size(targets, sources, tests)
+        label = f"{targets}x{sources}x{tests}"
+        for step, elapsed, latency, peak_rss, failed in rows:
+            print(
+                f"{label:>12} {step:>10} {elapsed:8.2f}s {latency * 1000:7.1f}ms "
+                f"{format_bytes(peak_rss):>12}{'  FAILED' if failed else ''}"
+            )
+        print(f"{label:>12} {'python':>10} peak traced memory {format_bytes(python_peak)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+# Stand-in for the meson executable. The amount and pace of output is taken
+# from FAKE_MESON_* environment variables so benchmarks can drive MesonBuild
+# without a real toolchain.
+#
+import contextlib
+import os
+import stat
+import sys
+import tempfile
+import time
+
+FAKE_VERSION = "1.0.0-fake"
+
+
+def fake_meson_main(argv):
+    if "--version" in argv:
+        print(FAKE_VERSION)
+        return 0
+
+    lines = int(os.environ.get("FAKE_MESON_LINES", "1000"))
+    line_size = int(os.environ.get("FAKE_MESON_LINE_SIZE", "80"))
+    rate = float(os.environ.get("FAKE_MESON_RATE", "0"))
+    exit_code = int(os.environ.get("FAKE_MESON_EXIT", "0"))
+
+    out = sys.stdout
+    delay = 1.0 / rate if rate > 0 else 0.0
+    for index in range(1, lines + 1):
+        prefix = f"[{index}/{lines}] Compiling C object fake.p/source_{index}.c.o "
+        out.write(prefix.ljust(line_size, "."))
+        out.write("\n")
+        if delay:
+            out.flush()
+            time.sleep(delay)
+    out.flush()
+    if exit_code:
+        sys.stderr.write("fake meson: simulated failure\n")
+    return exit_code
+
+
+def install_fake_meson(directory):
+    script = os.path.abspath(__file__)
+    if os.name == "nt":
+        path = os.path.join(directory, "meson.bat")
+        with open(path, "w") as handle:
+            handle.write(f'@"{sys.executable}" "{script}" %*\n')
+    else:
+        path = os.path.join(directory, "meson")
+        with open(path, "w") as handle:
+            handle.write(f"#!{sys.executable}\n")
+            handle.write("import runpy, sys\n")
+            handle.write(f"sys.argv[0] = {script!r}\n")
+            handle.write(f"runpy.run_path({script!r}, run_name='__main__')\n")
+        os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return path
+
+
+@contextlib.contextmanager
+def fake_meson_on_path(lines=1000, line_size=80, rate=0, exit_code=0):
+    saved = {key: os.environ.get(key) for key in (
+        "PATH", "FAKE_MESON_LINES", "FAKE_MESON_LINE_SIZE", "FAKE_MESON_RATE", "FAKE_MESON_EXIT"
+    )}
+    with tempfile.TemporaryDirectory(prefix="fake-meson-") as directory:
+        install_fake_meson(directory)
+        os.environ["PATH"] = directory + os.pathsep + os.environ.get("PATH", "")
+        os.environ["FAKE_MESON_LINES"] = str(lines)
+        os.environ["FAKE_MESON_LINE_SIZE"] = str(line_size)
+        os.environ["FAKE_MESON_RATE"] = str(rate)
+        os.environ["FAKE_MESON_EXIT"] = str(exit_code)
+        try:
+            yield directory
+        finally:
+            for key, value in saved.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+
+if __name__ == "__main__":
+    sys.exit(fake_meson_main(sys.argv[1:]))
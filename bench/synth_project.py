@@ -0,0 +1,70 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+import os
+
+
+def write_file(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as handle:
+        handle.write(content)
+
+
+def generate_project(root, targets, sources, tests):
+    # Each target is a static library in its own subdir that links against the
+    # previous one, so the generated tree also has a dependency chain.
+    top = ["project('synthetic', 'c')", ""]
+    for target in range(targets):
+        name = f"lib{target}"
+        top.append(f"subdir('{name}')")
+        lines = [f"{name}_sources = files("]
+        for source in range(sources):
+            lines.append(f"  'source{source}.c',")
+            body = [f'#include "{name}.h"', ""]
+            body.append(f"int {name}_function{source}(int value)")
+            body.append("{")
+            body.append(f"    int result = value * {source + 1};")
+            body.append(f"    for (int i = 0; i < {10 + source}; ++i) result ^= i << (i % 7);")
+            body.append("    return result;")
+            body.append("}")
+            write_file(os.path.join(root, name, f"source{source}.c"), "\n".join(body) + "\n")
+        lines.append(")")
+        link_with = f", link_with: lib{target - 1}" if target else ""
+        lines.append(
+            f"{name} = static_library('{name}', {name}_sources, "
+            f"include_directories: include_directories('.'){link_with})"
+        )
+        lines.append(f"{name}_inc = include_directories('.')")
+        write_file(os.path.join(root, name, "meson.build"), "\n".join(lines) + "\n")
+        header = [f"int {name}_function{source}(int value);" for source in range(sources)]
+        write_file(os.path.join(root, name, f"{name}.h"), "\n".join(header) + "\n")
+
+    if tests and targets:
+        top.append("")
+        top.append("subdir('tests')")
+        lines = []
+        for test in range(tests):
+            target = test % targets
+            lines.append(
+                f"test_exe{test} = executable('test{test}', 'test{test}.c', "
+                f"link_with: lib{target}, include_directories: lib{target}_inc)"
+            )
+            lines.append(f"test('test{test}', test_exe{test})")
+            write_file(
+                os.path.join(root, "tests", f"test{test}.c"),
+                f'#include "lib{target}.h"\n'
+                f"int main(void) {{ return lib{target}_function0(0) == -1; }}\n",
+            )
+        write_file(os.path.join(root, "tests", "meson.build"), "\n".join(lines) + "\n")
+
+    write_file(os.path.join(root, "meson.build"), "\n".join(top) + "\n")
+    return root
@@ -0,0 +1,207 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+import os
+
+from code.affected import load_intro, object_owners, target_files
+from code.buildoptions import load_build_options
+from code.ninjafiles import graph_outputs, read_deps, read_ninja_log, target_durations
+
+OBJECT_SUFFIXES = (".o", ".obj")
+# A header counts as shared when at least this share of a target's TUs include it.
+SHARED_FRACTION = 0.75
+# A PCH still has to be loaded by every TU, so it does not remove all parsing.
+PCH_EFFICIENCY = 0.8
+# Headers the compiler pulls into every TU on its own; no source includes them.
+IMPLICIT_HEADERS = {"stdc-predef.h"}
+
+
+def object_language(output):
+    # "libfoo.a.p/src_bar.cpp.o" -> "cpp"
+    stem = os.path.splitext(output)[0]
+    return os.path.splitext(stem)[1].lstrip(".")
+
+
+def compile_units(build_dir, targets=None, durations=None):
+    # Per target: [(object, language, duration_ms)] for every object ninja has
+    # a timing for. Objects outside a "<target>.p/" dir are not attributable.
+    targets = targets if targets is not None else load_intro(build_dir, "targets", [])
+    if durations is None:
+        durations = target_durations(read_ninja_log(build_dir))
+        current = graph_outputs(build_dir)
+        if current is not None:
+            durations = {output: duration for output, duration in durations.items() if output in current}
+    owners = object_owners(targets, build_dir)
+    units = {}
+    for output, duration in durations.items():
+        if not output.endswith(OBJECT_SUFFIXES) or ".p/" not in output:
+            continue
+        owner = owners.get(output[:output.find(".p/") + 2])
+        if owner is not None:
+            units.setdefault(owner, []).append((output, object_language(output), duration))
+    return units
+
+
+def compile_cpu_ms(units):
+    return sum(duration for target_units in units.values() for _, _, duration in target_units)
+
+
+class TargetAdvice:
+    def __init__(self, target, units, shared_headers, stable_headers, unity_savings, pch_savings):
+        self.target = target
+        self.units = units
+        self.shared_headers = shared_headers
+        self.stable_headers = stable_headers
+        self.unity_savings = unity_savings
+        self.pch_savings = pch_savings
+
+    @property
+    def name(self):
+        return self.target["name"]
+
+    @property
+    def cpu_ms(self):
+        return sum(duration for _, _, duration in self.units)
+
+    @property
+    def language(self):
+        languages = [language for _, language, _ in self.units]
+        return max(set(languages), key=languages.count) if languages else ""
+
+    def snippet(self, unity, pch):
+        # Per-target settings only exist in meson.build, not as -D options.
+        lines = []
+        if unity:
+            lines.append("override_options: ['unity=on'],")
+        if pch:
+            language = "cpp" if self.language in ("cpp", "cc", "cxx", "C") else "c"
+            lines.append(f"{language}_pch: 'pch/{self.name}_pch.h',  # include: "
+                         + ", ".join(os.path.basename(header) for header in self.stable_headers[:8]))
+        return lines
+
+
+class BuildAdvice:
+    def __init__(self, targets, unity_size, unity_enabled, pch_enabled, min_savings_ms):
+        self.targets = targets
+        self.unity_size = unity_size
+        self.unity_enabled = unity_enabled
+        self.pch_enabled = pch_enabled
+        self.min_savings_ms = min_savings_ms
+
+    def unity_targets(self):
+        return [advice for advice in self.targets
+                if len(advice.units) >= 3 and advice.unity_savings > 0
+                and advice.unity_savings >= self.min_savings_ms]
+
+    def pch_targets(self):
+        return [advice for advice in self.targets
+                if advice.stable_headers and advice.pch_savings > 0
+                and advice.pch_savings >= self.min_savings_ms]
+
+    def arguments(self):
+        # Only the global switches can go through "meson configure"; which
+        # targets get a PCH is up to their meson.build.
+        arguments = []
+        unity = self.unity_targets()
+        if unity and not self.unity_enabled:
+            in_subprojects = all(advice.target.get("subproject") for advice in unity)
+            arguments.append(f"-Dunity={'subprojects' if in_subprojects else 'on'}")
+            arguments.append(f"-Dunity_size={self.unity_size}")
+        if self.pch_targets() and not self.pch_enabled:
+            arguments.append("-Db_pch=true")
+        return arguments
+
+    def format(self, limit=15):
+        if not self.targets:
+            return "No compile timings found; build the project once before asking for advice.\n"
+        unity = self.unity_targets()
+        pch = self.pch_targets()
+        total = sum(advice.cpu_ms for advice in self.targets)
+        lines = [f"{len(self.targets)} targets, {total / 1000:.1f}s of compile CPU time."]
+        if self.unity_enabled:
+            lines.append("Unity builds are already enabled.")
+        lines.append(
+            f"Unity builds (unity_size={self.unity_size}) would save an estimated "
+            f"{sum(advice.unity_savings for advice in unity) / 1000:.1f}s over {len(unity)} targets."
+        )
+        lines.append(
+            f"Precompiled headers would save an estimated "
+            f"{sum(advice.pch_savings for advice in pch) / 1000:.1f}s over {len(pch)} targets."
+        )
+        ranked = sorted(
+            self.targets, key=lambda advice: max(advice.unity_savings, advice.pch_savings), reverse=True
+        )
+        for advice in ranked[:limit]:
+            use_unity = advice in unity
+            use_pch = advice in pch
+            if not (use_unity or use_pch):
+                continue
+            lines.append(
+                f"  {advice.name}: {len(advice.units)} TUs, {advice.cpu_ms / 1000:.1f}s; "
+                f"unity -{advice.unity_savings / 1000:.1f}s, PCH -{advice.pch_savings / 1000:.1f}s"
+            )
+            lines.extend(f"      {line}" for line in advice.snippet(use_unity, use_pch))
+        arguments = self.arguments()
+        if arguments:
+            lines.append(f"Suggested configure options: {' '.join(arguments)}")
+        return "\n".join(lines) + "\n"
+
+
+def advise(build_dir, source_dir, unity_size=None, min_savings_ms=500, targets=None, deps=None, durations=None):
+    targets = targets if targets is not None else load_intro(build_dir, "targets", [])
+    options = {option["name"]: option["value"] for option in load_build_options(build_dir) or []}
+    unity_size = unity_size or options.get("unity_size", 4)
+    units = compile_units(build_dir, targets, durations)
+    deps = deps if deps is not None else read_deps(build_dir)
+    source_dir = os.path.abspath(source_dir)
+    by_id = {target["id"]: target for target in targets}
+    advice = []
+    for target_id, target_units in units.items():
+        target = by_id[target_id]
+        sources = target_files(target)
+        headers = {
+            output: set(
+                path for path in deps.get(output, [])
+                if path not in sources and os.path.basename(path) not in IMPLICIT_HEADERS
+            )
+            for output, _, _ in target_units
+        }
+        counts = {}
+        for included in headers.values():
+            for header in included:
+                counts[header] = counts.get(header, 0) + 1
+        threshold = max(2, SHARED_FRACTION * len(target_units))
+        shared = {header for header, count in counts.items() if count >= threshold}
+        # Project headers change too often to be worth precompiling.
+        stable = {header for header in shared if not header.startswith(source_dir + os.sep)}
+        shared_cost = []
+        stable_cost = []
+        for output, _, duration in target_units:
+            included = headers[output]
+            if included:
+                shared_cost.append(duration * len(included & shared) / len(included))
+                stable_cost.append(duration * len(included & stable) / len(included))
+        # Estimates: a unity batch of N parses the shared headers once instead
+        # of N times; a PCH is built once and then loaded by every TU.
+        unity_savings = sum(shared_cost) * (1 - 1 / unity_size) if len(target_units) > 1 else 0
+        pch_savings = max(sum(stable_cost) * PCH_EFFICIENCY - max(stable_cost, default=0), 0)
+        advice.append(TargetAdvice(
+            target, target_units, sorted(shared), sorted(stable, key=lambda header: (-counts[header], header)),
+            unity_savings, pch_savings,
+        ))
+    return BuildAdvice(
+        advice,
+        unity_size,
+        options.get("unity", "off") != "off",
+        bool(options.get("b_pch", False)),
+        min_savings_ms,
+    )
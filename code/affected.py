@@ -0,0 +1,210 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+import os
+import subprocess
+import time
+
+from code.buildcache import walk_sources
+from code.ninjafiles import read_deps
+from code.statedir import build_state_dir, load_json, save_json
+
+STAMP_FILE = "stamps.json"
+
+
+def load_intro(build_dir, name, default=None):
+    return load_json(os.path.join(build_dir, "meson-info", f"intro-{name}.json"), default)
+
+
+def git_head(source_dir):
+    try:
+        return subprocess.run(
+            ["git", "-C", source_dir, "rev-parse", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def record_stamp(build_dir, source_dir, kind):
+    path = os.path.join(build_state_dir(build_dir), STAMP_FILE)
+    stamps = load_json(path, {})
+    stamps[kind] = {"time": time.time(), "head": git_head(source_dir)}
+    save_json(path, stamps)
+
+
+def load_stamp(build_dir, kind):
+    return load_json(os.path.join(build_dir, ".fossil-builddir", STAMP_FILE), {}).get(kind)
+
+
+def git_changed_files(source_dir, stamp):
+    try:
+        top = subprocess.run(
+            ["git", "-C", source_dir, "rev-parse", "--show-toplevel"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "-C", top, "status", "--porcelain", "--untracked-files=all"],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        committed = ""
+        if stamp.get("head"):
+            committed = subprocess.run(
+                ["git", "-C", top, "diff", "--name-only", stamp["head"], "HEAD"],
+                capture_output=True, text=True, check=True,
+            ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    changed = set()
+    for line in status.splitlines():
+        name = line[3:].split(" -> ")[-1].strip('"')
+        path = os.path.normpath(os.path.join(top, name))
+        # Dirty files that have not been touched since the stamp were already built.
+        if not os.path.exists(path) or os.path.getmtime(path) > stamp["time"]:
+            changed.add(path)
+    for name in committed.splitlines():
+        changed.add(os.path.normpath(os.path.join(top, name)))
+    return changed
+
+
+def mtime_changed_files(source_dir, build_dir, stamp):
+    changed = set()
+    for relpath in walk_sources(source_dir, build_dir):
+        path = os.path.join(source_dir, relpath)
+        if os.path.getmtime(path) > stamp["time"]:
+            changed.add(os.path.normpath(os.path.abspath(path)))
+    return changed
+
+
+def changed_files(source_dir, build_dir, kind):
+    stamp = load_stamp(build_dir, kind)
+    if stamp is None:
+        return None
+    changed = git_changed_files(source_dir, stamp)
+    if changed is None:
+        changed = mtime_changed_files(source_dir, build_dir, stamp)
+    return changed
+
+
+def target_files(target):
+    files = set()
+    for group in target.get("target_sources", []):
+        for key in ("sources", "generated_sources", "unity_sources"):
+            files.update(os.path.normpath(path) for path in group.get(key, []))
+    files.update(os.path.normpath(path) for path in target.get("extra_files", []))
+    return files
+
+
+def target_dependencies(targets, build_dir):
+    by_path = {}
+    for target in targets:
+        for filename in target.get("filename", []):
+            by_path[os.path.normpath(filename)] = target["id"]
+            by_path[os.path.relpath(filename, build_dir)] = target["id"]
+    graph = {}
+    for target in targets:
+        deps = set(target.get("depends", []))
+        # Link dependencies only show up as paths in the linker parameters.
+        for group in target.get("target_sources", []):
+            for parameter in group.get("parameters", []):
+                if parameter in by_path:
+                    deps.add(by_path[parameter])
+        deps.discard(target["id"])
+        graph[target["id"]] = deps
+    return graph
+
+
+def dependents_closure(graph, seeds):
+    reverse = {}
+    for target, deps in graph.items():
+        for dep in deps:
+            reverse.setdefault(dep, set()).add(target)
+    closure = set(seeds)
+    pending = list(seeds)
+    while pending:
+        for dependent in reverse.get(pending.pop(), ()):
+            if dependent not in closure:
+                closure.add(dependent)
+                pending.append(dependent)
+    return closure
+
+
+def object_owners(targets, build_dir):
+    # Meson puts a target's objects under "<target filename>.p/".
+    owners = {}
+    for target in targets:
+        for filename in target.get("filename", [])[:1]:
+            owners[os.path.relpath(filename, build_dir).replace(os.sep, "/") + ".p"] = target["id"]
+    return owners
+
+
+def affected_target_ids(build_dir, changed, targets=None, deps=None):
+    targets = targets if targets is not None else load_intro(build_dir, "targets", [])
+    build_files = set(os.path.normpath(path) for path in load_intro(build_dir, "buildsystem_files", []))
+    if changed & build_files:
+        return None
+
+    direct = set()
+    unmapped = set(changed)
+    for target in targets:
+        hits = target_files(target) & changed
+        if hits:
+            direct.add(target["id"])
+            unmapped -= hits
+    if unmapped:
+        deps = deps if deps is not None else read_deps(build_dir)
+        owners = object_owners(targets, build_dir)
+        for output, inputs in deps.items():
+            if not unmapped.intersection(inputs):
+                continue
+            owner = owners.get(output[:output.find(".p/") + 2]) if ".p/" in output else None
+            if owner is None:
+                # A changed header feeds an output we cannot attribute to a target.
+                return None
+            direct.add(owner)
+        # Changed files no recorded output depends on (docs, scripts) are ignored.
+    return dependents_closure(target_dependencies(targets, build_dir), direct)
+
+
+def target_spec(target, source_dir):
+    name = target["name"]
+    subdir = os.path.relpath(os.path.dirname(target["defined_in"]), source_dir)
+    spec = name if subdir == "." else f"{subdir.replace(os.sep, '/')}/{name}"
+    return f"{spec}:{target['type'].replace(' ', '_')}"
+
+
+def affected_target_specs(build_dir, source_dir, changed):
+    targets = load_intro(build_dir, "targets", [])
+    ids = affected_target_ids(build_dir, changed, targets)
+    if ids is None:
+        return None
+    return [target_spec(target, source_dir) for target in targets if target["id"] in ids]
+
+
+def affected_tests(build_dir, changed, targets=None, tests=None, deps=None):
+    targets = targets if targets is not None else load_intro(build_dir, "targets", [])
+    tests = tests if tests is not None else load_intro(build_dir, "tests", [])
+    ids = affected_target_ids(build_dir, changed, targets, deps)
+    if ids is None:
+        return None
+    affected_files = set(changed)
+    for target in targets:
+        if target["id"] in ids:
+            affected_files.update(os.path.normpath(path) for path in target.get("filename", []))
+    selected = []
+    for test in tests:
+        command = [os.path.normpath(part) for part in test.get("cmd", [])[:2]]
+        if ids.intersection(test.get("depends", [])) or affected_files.intersection(command):
+            if test["name"] not in selected:
+                selected.append(test["name"])
+    return selected
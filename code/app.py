@@ -14,12 +14,54 @@ import tkinter as tk
 from tkinter import ttk, simpledialog, messagebox, filedialog
 from tkinter.scrolledtext import ScrolledText
 import configparser
+import contextlib
+import sqlite3
+import shutil
 import subprocess
 import webbrowser
 import threading
 import urllib.request
 import os
 import json
+import time
+
+from code.advisor import advise, compile_cpu_ms, compile_units
+from code.affected import affected_target_specs, affected_tests, changed_files, record_stamp
+from code.buildcache import BuildDirCache, is_build_dir
+from code.buildoptions import changed_arguments, display_value, load_build_options, option_key, options_by_section
+from code.coalesce import RequestCoalescer
+from code.devenv import DevEnvironment
+from code.events import EventStream, MetricsFile
+from code.fanout import header_fanout
+from code.dist import ARCHIVE_EXTENSIONS, newest_archive, repack_archives, tested_build_is_current
+from code.history import RunHistory
+from code.incinstall import IncrementalInstall
+from code.mesonbench import (
+    BASELINE_FILE, BENCHMARK_LOG, benchmark_command, benchmark_stats, compare_benchmarks, format_benchmarks,
+    load_samples, read_benchmark_log, save_samples,
+)
+from code.ninjafiles import dry_run_plan, ninja_log_size, read_ninja_log, target_durations
+from code.parallelism import AdaptiveParallelism
+from code.ramdisk import TmpfsStaging
+from code.regression import TimingBaseline, format_regressions
+from code.sampler import ProcessTreeSampler, format_bytes, read_meminfo, sampler_supported
+from code.setupprofile import OutputTimeline, SetupProfile, profile_hotspots
+from code.snapshots import BuildSnapshots, format_snapshot
+from code.spool import CommandOutput, CommandResult, prepend
+from code.statedir import build_state_dir, load_json, save_json
+from code.themes import ThemeEngine
+from code.workspace import Workspace, WorkspaceBuilder, WorkspaceProject
+
+TERMINAL_OUTPUT_LINES = 2000
+VERSION_CACHE_SECONDS = 300
+INTROSPECTION_CACHE_SECONDS = 30
+
+
+def intro_stamp(build_dir):
+    try:
+        return os.stat(os.path.join(build_dir, "meson-info", "meson-info.json")).st_mtime_ns
+    except OSError:
+        return None
 
 
 class AppInfo:
@@ -111,13 +153,77 @@ class AppThemes:
         self.root.destroy()
 
 
-class InitDialog(simpledialog.Dialog):
-    def __init__(self, parent, theme):
-        self.theme = theme
+class ReusableDialog(tk.Toplevel):
+    # Built once and hidden when closed; show() brings the same widgets back
+    # instead of rebuilding the whole dialog on every open.
+    def __init__(self, parent, title):
         super().__init__(parent)
+        self.withdraw()
+        self.title(title)
+        self.transient(parent)
+        self.parent = parent
+        self.result = None
+        self.closed = tk.BooleanVar(self, value=False)
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+        body = ttk.Frame(self, padding=5)
+        self.initial_focus = self.body(body) or self
+        body.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.buttonbox()
+
+    def body(self, master):
+        pass
+
+    def buttonbox(self):
+        box = ttk.Frame(self)
+        ttk.Button(box, text="OK", width=10, command=self.ok, default=tk.ACTIVE).pack(
+            side=tk.LEFT, padx=5, pady=5
+        )
+        ttk.Button(box, text="Cancel", width=10, command=self.cancel).pack(
+            side=tk.LEFT, padx=5, pady=5
+        )
+        self.bind("<Return>", self.ok)
+        self.bind("<Escape>", self.cancel)
+        box.pack()
+
+    def prepare(self):
+        pass
+
+    def show(self, *args):
+        self.result = None
+        self.prepare(*args)
+        self.closed.set(False)
+        self.deiconify()
+        self.lift()
+        self.wait_visibility()
+        self.grab_set()
+        self.initial_focus.focus_set()
+        self.wait_variable(self.closed)
+        if self.winfo_exists():
+            self.grab_release()
+            self.withdraw()
+        return self.result
+
+    def close(self, event=None):
+        self.closed.set(True)
+
+    def apply(self):
+        pass
+
+    def ok(self, event=None):
+        self.apply()
+        if self.result is not None:
+            self.close()
+
+    def cancel(self, event=None):
+        self.result = None
+        self.close()
+
+
+class InitDialog(ReusableDialog):
+    def __init__(self, parent):
+        super().__init__(parent, "Meson Init")
 
     def body(self, master):
-        self.apply_theme()
         ttk.Label(
             master,
             text="Meson Init Options",
@@ -134,63 +240,24 @@ class InitDialog(simpledialog.Dialog):
         ttk.Label(master, text="Other Options:").grid(row=3, column=0, sticky=tk.W)
         self.other_options_entry = ttk.Entry(master, width=40)
         self.other_options_entry.grid(row=3, column=1, pady=10, sticky=tk.W + tk.E)
+        return self.project_name_entry
 
     def apply(self):
         project_name = self.project_name_entry.get().strip()
         language = self.language_entry.get().strip()
         other_options = self.other_options_entry.get().strip()
         if not project_name or not language:
-            tk.messagebox.showerror("Error", "Project name and language cannot be empty.")
+            tk.messagebox.showerror("Error", "Project name and language cannot be empty.", parent=self)
             self.result = None
         else:
             self.result = (project_name, language, other_options)
 
-    def cancel(self, event=None):
-        self.result = None
-        super().cancel(event)
-
-    def ok(self, event=None):
-        self.apply()
-        if self.result is not None:
-            self.cancel()
 
-    def apply_theme(self):
-        if self.theme == "light":
-            self.configure(bg="white")
-            for widget in self.winfo_children():
-                if isinstance(widget, ttk.Label):
-                    widget.configure(background="white", foreground="black")
-                elif isinstance(widget, ttk.Entry):
-                    widget.configure(background="white", foreground="black")
-                elif isinstance(widget, ttk.Button):
-                    widget.configure(background="white", foreground="black")
-        elif self.theme == "dark":
-            self.configure(bg="black")
-            for widget in self.winfo_children():
-                if isinstance(widget, ttk.Label):
-                    widget.configure(background="black", foreground="light blue")
-                elif isinstance(widget, ttk.Entry):
-                    widget.configure(background="black", foreground="light blue")
-                elif isinstance(widget, ttk.Button):
-                    widget.configure(background="black", foreground="light blue")
-        elif self.theme == "meson":
-            self.configure(bg="dark gray")
-            for widget in self.winfo_children():
-                if isinstance(widget, ttk.Label):
-                    widget.configure(background="dark gray", foreground="black")
-                elif isinstance(widget, ttk.Entry):
-                    widget.configure(background="dark gray", foreground="black")
-                elif isinstance(widget, ttk.Button):
-                    widget.configure(background="#ADD8E6", foreground="black")
-
-
-class SetupDialog(simpledialog.Dialog):
-    def __init__(self, parent, theme):
-        self.theme = theme
-        super().__init__(parent)
+class SetupDialog(ReusableDialog):
+    def __init__(self, parent):
+        super().__init__(parent, "Meson Setup")
 
     def body(self, master):
-        self.apply_theme()
         ttk.Label(
             master,
             text="Meson Setup Options",
@@ -204,132 +271,110 @@ class SetupDialog(simpledialog.Dialog):
         ttk.Label(master, text="Other Options:").grid(row=2, column=0, sticky=tk.W)
         self.other_options_entry = ttk.Entry(master, width=40)
         self.other_options_entry.grid(row=2, column=1, pady=10, sticky=tk.W + tk.E)
+        return self.build_dir_entry
 
     def apply(self):
         build_dir = self.build_dir_entry.get().strip()
         other_options = self.other_options_entry.get().strip()
         if not build_dir:
-            tk.messagebox.showerror("Error", "Build directory cannot be empty.")
+            tk.messagebox.showerror("Error", "Build directory cannot be empty.", parent=self)
             self.result = None
         else:
             self.result = (build_dir, other_options)
 
-    def cancel(self, event=None):
-        self.result = None
-        super().cancel(event)
-
-    def ok(self, event=None):
-        self.apply()
-        if self.result is not None:
-            self.cancel()
 
-    def apply_theme(self):
-        if self.theme == "light":
-            self.configure(bg="white")
-            for widget in self.winfo_children():
-                if isinstance(widget, ttk.Label):
-                    widget.configure(background="white", foreground="black")
-                elif isinstance(widget, ttk.Entry):
-                    widget.configure(background="white", foreground="black")
-                elif isinstance(widget, ttk.Button):
-                    widget.configure(background="white", foreground="black")
-        elif self.theme == "dark":
-            self.configure(bg="black")
-            for widget in self.winfo_children():
-                if isinstance(widget, ttk.Label):
-                    widget.configure(background="black", foreground="light blue")
-                elif isinstance(widget, ttk.Entry):
-                    widget.configure(background="black", foreground="light blue")
-                elif isinstance(widget, ttk.Button):
-                    widget.configure(background="black", foreground="light blue")
-        elif self.theme == "meson":
-            self.configure(bg="dark gray")
-            for widget in self.winfo_children():
-                if isinstance(widget, ttk.Label):
-                    widget.configure(background="dark gray", foreground="black")
-                elif isinstance(widget, ttk.Entry):
-                    widget.configure(background="dark gray", foreground="black")
-                elif isinstance(widget, ttk.Button):
-                    widget.configure(background="#ADD8E6", foreground="black")
-
-
-class ConfigureDialog(simpledialog.Dialog):
-    def __init__(self, parent, theme):
-        self.theme = theme
-        super().__init__(parent)
+class ConfigureDialog(ReusableDialog):
+    def __init__(self, parent):
+        self.build_dir = None
+        self.options = []
+        self.variables = {}
+        self.initial_values = {}
+        super().__init__(parent, "Meson Configure")
 
     def body(self, master):
-        self.apply_theme()
         ttk.Label(
             master,
             text="Meson Configure Options",
         ).grid(row=0, column=0, columnspan=2, pady=10)
+        self.build_dir_label = ttk.Label(master, text="")
+        self.build_dir_label.grid(row=1, column=0, columnspan=2, sticky=tk.W)
 
-        ttk.Label(master, text="Build Directory:").grid(row=1, column=0, sticky=tk.W)
-        self.build_dir_entry = ttk.Entry(master, width=40)
-        self.build_dir_entry.insert(0, "builddir")
-        self.build_dir_entry.grid(row=1, column=1, pady=10, sticky=tk.W + tk.E)
-
-        ttk.Label(master, text="Other Options:").grid(row=2, column=0, sticky=tk.W)
-        self.other_options_entry = ttk.Entry(master, width=40)
-        self.other_options_entry.grid(row=2, column=1, pady=10, sticky=tk.W + tk.E)
+        self.notebook = ttk.Notebook(master)
+        self.notebook.grid(row=2, column=0, columnspan=2, pady=10)
+
+        self.description_label = ttk.Label(master, text="", wraplength=560)
+        self.description_label.grid(row=3, column=0, columnspan=2, sticky=tk.W)
+
+    def prepare(self, build_dir, options):
+        self.build_dir_label.configure(text=f"Build Directory: {build_dir}")
+        if build_dir == self.build_dir and options == self.options:
+            # Same build dir and values as last time: keep the widgets and only
+            # drop edits left over from a cancelled open.
+            for key, variable in self.variables.items():
+                variable.set(self.initial_values[key])
+            return
+        self.build_dir = build_dir
+        self.options = options
+        self.variables = {}
+        self.initial_values = {}
+        for tab in self.notebook.tabs():
+            self.nametowidget(tab).destroy()
+        for section, section_options in options_by_section(options):
+            self.create_section(section, section_options)
+
+    def create_section(self, section, options):
+        frame = ttk.Frame(self.notebook, padding=10)
+        self.notebook.add(frame, text=section.capitalize())
+        canvas = tk.Canvas(
+            frame, width=560, height=300, highlightthickness=0,
+            background=ttk.Style(self).lookup("TFrame", "background"),
+        )
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=canvas.yview)
+        inner = ttk.Frame(canvas)
+        inner.bind("<Configure>", lambda event: canvas.configure(scrollregion=canvas.bbox("all")))
+        canvas.create_window((0, 0), window=inner, anchor=tk.NW)
+        canvas.configure(yscrollcommand=scrollbar.set)
+        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        for row, option in enumerate(options):
+            key = option_key(option)
+            ttk.Label(inner, text=key).grid(row=row, column=0, sticky=tk.W, padx=5, pady=2)
+            value = display_value(option)
+            if option["type"] == "boolean":
+                variable = tk.BooleanVar(value=value)
+                widget = ttk.Checkbutton(inner, variable=variable)
+            elif option["type"] in ("combo", "feature") and option.get("choices"):
+                variable = tk.StringVar(value=value)
+                widget = ttk.Combobox(
+                    inner, textvariable=variable, values=option["choices"], state="readonly", width=30
+                )
+            elif option["type"] == "integer" and isinstance(value, int):
+                variable = tk.StringVar(value=str(value))
+                widget = ttk.Spinbox(inner, textvariable=variable, from_=-(2 ** 31), to=2 ** 31, width=30)
+            else:
+                variable = tk.StringVar(value=str(value))
+                widget = ttk.Entry(inner, textvariable=variable, width=32)
+            widget.grid(row=row, column=1, sticky=tk.W, padx=5, pady=2)
+            description = option.get("description", "")
+            widget.bind("<FocusIn>", lambda event, text=description: self.description_label.configure(text=text))
+            self.variables[key] = variable
+            self.initial_values[key] = variable.get()
 
     def apply(self):
-        build_dir = self.build_dir_entry.get().strip()
-        other_options = self.other_options_entry.get().strip()
-        if not build_dir:
-            tk.messagebox.showerror("Error", "Build directory cannot be empty.")
+        edited = {key: variable.get() for key, variable in self.variables.items()}
+        try:
+            self.result = (self.build_dir, changed_arguments(self.options, edited))
+        except ValueError as e:
+            tk.messagebox.showerror("Error", str(e), parent=self)
             self.result = None
-        else:
-            self.result = (build_dir, other_options)
-
-    def cancel(self, event=None):
-        self.result = None
-        super().cancel(event)
 
-    def ok(self, event=None):
-        self.apply()
-        if self.result is not None:
-            self.cancel()
 
-    def apply_theme(self):
-        if self.theme == "light":
-            self.configure(bg="white")
-            for widget in self.winfo_children():
-                if isinstance(widget, ttk.Label):
-                    widget.configure(background="white", foreground="black")
-                elif isinstance(widget, ttk.Entry):
-                    widget.configure(background="white", foreground="black")
-                elif isinstance(widget, ttk.Button):
-                    widget.configure(background="white", foreground="black")
-        elif self.theme == "dark":
-            self.configure(bg="black")
-            for widget in self.winfo_children():
-                if isinstance(widget, ttk.Label):
-                    widget.configure(background="black", foreground="light blue")
-                elif isinstance(widget, ttk.Entry):
-                    widget.configure(background="black", foreground="light blue")
-                elif isinstance(widget, ttk.Button):
-                    widget.configure(background="black", foreground="light blue")
-        elif self.theme == "meson":
-            self.configure(bg="dark gray")
-            for widget in self.winfo_children():
-                if isinstance(widget, ttk.Label):
-                    widget.configure(background="dark gray", foreground="black")
-                elif isinstance(widget, ttk.Entry):
-                    widget.configure(background="dark gray", foreground="black")
-                elif isinstance(widget, ttk.Button):
-                    widget.configure(background="#ADD8E6", foreground="black")
-
-
-class TutorialDialog(simpledialog.Dialog):
-    def __init__(self, parent, theme):
-        self.theme = theme
-        super().__init__(parent)
+class TutorialDialog(ReusableDialog):
+    def __init__(self, parent):
+        super().__init__(parent, "Meson UI Tutorial")
 
     def body(self, master):
-        self.title("Meson UI Tutorial")
-        self.apply_theme()
         ttk.Label(
             master,
             text="Tutorial: How to Use Meson Build GUI",
@@ -380,57 +425,24 @@ class TutorialDialog(simpledialog.Dialog):
             text.pack(expand=True, fill=tk.BOTH)
 
     def buttonbox(self):
-        box = tk.Frame(self)
+        box = ttk.Frame(self)
 
         button_close = ttk.Button(
-            box, text="Close", command=self.ok, style="Blue.TButton"
+            box, text="Close", command=self.close, style="Blue.TButton"
         )
         button_close.pack(pady=10)
 
-        self.bind("<Return>", self.ok)
-        self.bind("<Escape>", self.cancel)
+        self.bind("<Return>", self.close)
+        self.bind("<Escape>", self.close)
 
-        box.pack()
         box.pack(pady=10)
 
-    def apply_theme(self):
-        if self.theme == "light":
-            self.configure(bg="white")
-            for widget in self.winfo_children():
-                if isinstance(widget, ttk.Label):
-                    widget.configure(background="white", foreground="black")
-                elif isinstance(widget, ttk.Entry):
-                    widget.configure(background="white", foreground="black")
-                elif isinstance(widget, ttk.Button):
-                    widget.configure(background="white", foreground="black")
-        elif self.theme == "dark":
-            self.configure(bg="black")
-            for widget in self.winfo_children():
-                if isinstance(widget, ttk.Label):
-                    widget.configure(background="black", foreground="light blue")
-                elif isinstance(widget, ttk.Entry):
-                    widget.configure(background="black", foreground="light blue")
-                elif isinstance(widget, ttk.Button):
-                    widget.configure(background="black", foreground="light blue")
-        elif self.theme == "meson":
-            self.configure(bg="dark gray")
-            for widget in self.winfo_children():
-                if isinstance(widget, ttk.Label):
-                    widget.configure(background="dark gray", foreground="black")
-                elif isinstance(widget, ttk.Entry):
-                    widget.configure(background="dark gray", foreground="black")
-                elif isinstance(widget, ttk.Button):
-                    widget.configure(background="#ADD8E6", foreground="black")
-
-
-class SubprojectsDialog(simpledialog.Dialog):
-    def __init__(self, parent, theme):
-        self.theme = theme
-        super().__init__(parent)
+
+class SubprojectsDialog(ReusableDialog):
+    def __init__(self, parent):
+        super().__init__(parent, "Meson Subprojects")
 
     def body(self, master):
-        self.title("Meson Subprojects")
-        self.apply_theme()
         ttk.Label(
             master,
             text="Manage Meson Subprojects",
@@ -467,52 +479,26 @@ class SubprojectsDialog(simpledialog.Dialog):
             width=80,
         )
         self.subprojects_text.pack(expand=True, fill=tk.BOTH)
+
+    def prepare(self):
+        self.subprojects_text.configure(state=tk.NORMAL)
+        self.subprojects_text.delete("1.0", tk.END)
         self.subprojects_text.insert(tk.END, self.fetch_subprojects())
         self.subprojects_text.configure(state=tk.DISABLED)
 
     def buttonbox(self):
-        box = tk.Frame(self)
+        box = ttk.Frame(self)
 
         button_close = ttk.Button(
-            box, text="Close", command=self.ok, style="Blue.TButton"
+            box, text="Close", command=self.close, style="Blue.TButton"
         )
         button_close.pack(pady=10)
 
-        self.bind("<Return>", self.ok)
-        self.bind("<Escape>", self.cancel)
+        self.bind("<Return>", self.close)
+        self.bind("<Escape>", self.close)
 
-        box.pack()
         box.pack(pady=10)
 
-    def apply_theme(self):
-        if self.theme == "light":
-            self.configure(bg="white")
-            for widget in self.winfo_children():
-                if isinstance(widget, ttk.Label):
-                    widget.configure(background="white", foreground="black")
-                elif isinstance(widget, ttk.Entry):
-                    widget.configure(background="white", foreground="black")
-                elif isinstance(widget, ttk.Button):
-                    widget.configure(background="white", foreground="black")
-        elif self.theme == "dark":
-            self.configure(bg="black")
-            for widget in self.winfo_children():
-                if isinstance(widget, ttk.Label):
-                    widget.configure(background="black", foreground="light blue")
-                elif isinstance(widget, ttk.Entry):
-                    widget.configure(background="black", foreground="light blue")
-                elif isinstance(widget, ttk.Button):
-                    widget.configure(background="black", foreground="light blue")
-        elif self.theme == "meson":
-            self.configure(bg="dark gray")
-            for widget in self.winfo_children():
-                if isinstance(widget, ttk.Label):
-                    widget.configure(background="dark gray", foreground="black")
-                elif isinstance(widget, ttk.Entry):
-                    widget.configure(background="dark gray", foreground="black")
-                elif isinstance(widget, ttk.Button):
-                    widget.configure(background="#ADD8E6", foreground="black")
-
     def fetch_subprojects(self):
         try:
             subprojects_dir = os.path.join(os.getcwd(), "subprojects")
@@ -551,30 +537,929 @@ class SubprojectsDialog(simpledialog.Dialog):
             tk.messagebox.showerror("Error", str(e))
 
 
+class ResourceMonitor(tk.Toplevel):
+    def __init__(self, parent, meson_build, interval=500):
+        super().__init__(parent)
+        self.meson_build = meson_build
+        self.interval = interval
+        self.title("Resource Monitor")
+        self.resizable(False, False)
+        self.mem_total = read_meminfo().get("MemTotal", 0)
+
+        self.canvas = tk.Canvas(self, width=360, height=120, background="black")
+        self.canvas.pack(padx=10, pady=10)
+        self.status_label = ttk.Label(self, text="Waiting for a job...")
+        self.status_label.pack(padx=10, pady=(0, 10), anchor=tk.W)
+        ttk.Label(
+            self, text="Green: CPU %   Orange: RSS", font=("Helvetica", 8)
+        ).pack(padx=10, pady=(0, 10), anchor=tk.W)
+
+        self.refresh()
+
+    def refresh(self):
+        if not self.winfo_exists():
+            return
+        sampler = self.meson_build.sampler
+        samples = list(sampler.samples) if sampler is not None else []
+        self.draw(samples, sampler.cpu_count if sampler is not None else 1)
+        if samples:
+            latest = samples[-1]
+            self.status_label.configure(
+                text=f"CPU {latest.cpu_percent:.0f}%  RSS {format_bytes(latest.rss)}  "
+                f"read {format_bytes(latest.read_bytes)}  "
+                f"written {format_bytes(latest.write_bytes)}  "
+                f"({latest.processes} processes)"
+            )
+        self.after(self.interval, self.refresh)
+
+    def draw(self, samples, cpu_count):
+        self.canvas.delete("all")
+        if len(samples) < 2:
+            return
+        width = int(self.canvas["width"])
+        height = int(self.canvas["height"])
+        step = width / (len(samples) - 1)
+        cpu_scale = 100.0 * max(cpu_count, 1)
+        rss_scale = self.mem_total or max(sample.rss for sample in samples) or 1
+        cpu_points = []
+        rss_points = []
+        for index, sample in enumerate(samples):
+            x = index * step
+            cpu_points.extend((x, height - height * min(sample.cpu_percent / cpu_scale, 1.0)))
+            rss_points.extend((x, height - height * min(sample.rss / rss_scale, 1.0)))
+        self.canvas.create_line(*cpu_points, fill="lime green")
+        self.canvas.create_line(*rss_points, fill="orange")
+
+
+class WorkspaceWindow(tk.Toplevel):
+    def __init__(self, parent, workspace, on_output):
+        super().__init__(parent)
+        self.workspace = workspace
+        self.on_output = on_output
+        self.builder = None
+        self.title("Workspace")
+        self.resizable(False, False)
+
+        self.grid_view = ttk.Treeview(
+            self, columns=("source", "depends", "status", "detail"), height=10
+        )
+        self.grid_view.heading("#0", text="Project")
+        self.grid_view.heading("source", text="Source Directory")
+        self.grid_view.heading("depends", text="Depends On")
+        self.grid_view.heading("status", text="Status")
+        self.grid_view.heading("detail", text="Detail")
+        self.grid_view.column("#0", width=120)
+        self.grid_view.column("source", width=220)
+        self.grid_view.column("depends", width=140)
+        self.grid_view.column("status", width=90)
+        self.grid_view.column("detail", width=90)
+        self.grid_view.grid(row=0, column=0, columnspan=6, padx=10, pady=10)
+
+        ttk.Label(self, text="Concurrent Projects:").grid(row=1, column=0, padx=5, sticky=tk.E)
+        self.max_parallel_var = tk.StringVar(value=str(workspace.max_parallel))
+        ttk.Spinbox(self, from_=1, to=64, textvariable=self.max_parallel_var, width=5).grid(
+            row=1, column=1, sticky=tk.W
+        )
+        ttk.Label(self, text="Total Jobs:").grid(row=1, column=2, padx=5, sticky=tk.E)
+        self.jobs_var = tk.StringVar(value=str(workspace.jobs))
+        ttk.Spinbox(self, from_=1, to=1024, textvariable=self.jobs_var, width=5).grid(
+            row=1, column=3, sticky=tk.W
+        )
+        ttk.Button(self, text="Add Project", command=self.add_project).grid(row=2, column=0, pady=10)
+        ttk.Button(self, text="Remove", command=self.remove_project).grid(row=2, column=1, pady=10)
+        self.build_button = ttk.Button(
+            self, text="Build All", command=self.build_all, style="Blue.TButton"
+        )
+        self.build_button.grid(row=2, column=2, pady=10)
+        ttk.Button(self, text="Close", command=self.destroy).grid(row=2, column=3, pady=10)
+
+        self.refresh()
+
+    def refresh(self):
+        self.grid_view.delete(*self.grid_view.get_children())
+        for project in self.workspace.projects:
+            self.grid_view.insert(
+                "", tk.END, iid=project.name, text=project.name,
+                values=(project.source_dir, ", ".join(project.depends), "", ""),
+            )
+
+    def add_project(self):
+        try:
+            source_dir = filedialog.askdirectory(parent=self, title="Project Source Directory")
+            if not source_dir:
+                return
+            name = simpledialog.askstring(
+                "Add Project", "Project name:", parent=self, initialvalue=os.path.basename(source_dir)
+            )
+            if not name:
+                return
+            depends = simpledialog.askstring(
+                "Add Project", "Depends on (comma separated project names):", parent=self
+            ) or ""
+            project = WorkspaceProject(
+                name,
+                source_dir,
+                os.path.join(source_dir, "builddir"),
+                [item.strip() for item in depends.split(",") if item.strip()],
+            )
+            self.workspace.add(project)
+            self.workspace.save()
+            self.refresh()
+        except ValueError as e:
+            tk.messagebox.showerror("Error", str(e), parent=self)
+
+    def remove_project(self):
+        for name in self.grid_view.selection():
+            self.workspace.remove(name)
+        self.workspace.save()
+        self.refresh()
+
+    def set_status(self, name, status, detail):
+        # Builds report from worker threads; Tk calls are marshalled onto the UI thread.
+        self.after(0, self.show_status, name, status, detail)
+
+    def show_status(self, name, status, detail):
+        if self.winfo_exists() and self.grid_view.exists(name):
+            self.grid_view.set(name, "status", status)
+            self.grid_view.set(name, "detail", detail)
+
+    def build_all(self):
+        try:
+            self.workspace.max_parallel = max(1, int(self.max_parallel_var.get()))
+            self.workspace.jobs = max(1, int(self.jobs_var.get()))
+            self.workspace.build_order()
+        except ValueError as e:
+            tk.messagebox.showerror("Error", str(e), parent=self)
+            return
+        self.workspace.save()
+        self.build_button.configure(state=tk.DISABLED)
+        self.builder = WorkspaceBuilder(self.workspace, MesonBuild, on_status=self.set_status)
+        threading.Thread(target=self.run_build_thread, daemon=True).start()
+
+    def run_build_thread(self):
+        started = time.monotonic()
+        success = self.builder.build()
+        for project in self.workspace.build_order():
+            output = self.builder.outputs.get(project.name)
+            if output:
+                self.on_output(f"==== {project.name} ====\n{output}")
+        self.on_output(
+            f"Workspace build {'succeeded' if success else 'failed'} "
+            f"in {time.monotonic() - started:.1f}s.\n"
+        )
+        self.after(0, self.build_button.configure, {"state": tk.NORMAL})
+
+
+class HistoryWindow(tk.Toplevel):
+    def __init__(self, parent, history, build_dir, days=30):
+        super().__init__(parent)
+        self.history = history
+        self.build_dir = build_dir
+        self.days = days
+        self.title("Run History")
+        self.resizable(False, False)
+
+        self.summary_label = ttk.Label(self, text="", justify=tk.LEFT)
+        self.summary_label.grid(row=0, column=0, padx=10, pady=10, sticky=tk.W)
+
+        self.runs_view = ttk.Treeview(
+            self, columns=("action", "options", "duration", "status", "output"), height=12
+        )
+        self.runs_view.heading("#0", text="Started")
+        self.runs_view.heading("action", text="Action")
+        self.runs_view.heading("options", text="Options")
+        self.runs_view.heading("duration", text="Duration")
+        self.runs_view.heading("status", text="Exit")
+        self.runs_view.heading("output", text="Output")
+        self.runs_view.column("#0", width=140)
+        self.runs_view.column("action", width=80)
+        self.runs_view.column("options", width=220)
+        self.runs_view.column("duration", width=80)
+        self.runs_view.column("status", width=50)
+        self.runs_view.column("output", width=80)
+        self.runs_view.grid(row=1, column=0, padx=10)
+
+        self.targets_view = ttk.Treeview(self, columns=("runs", "average", "worst"), height=6)
+        self.targets_view.heading("#0", text=f"Slowest Targets ({days} days)")
+        self.targets_view.heading("runs", text="Builds")
+        self.targets_view.heading("average", text="Average")
+        self.targets_view.heading("worst", text="Worst")
+        self.targets_view.column("#0", width=400)
+        self.targets_view.column("runs", width=60)
+        self.targets_view.column("average", width=90)
+        self.targets_view.column("worst", width=90)
+        self.targets_view.grid(row=2, column=0, padx=10, pady=10)
+
+        ttk.Button(self, text="Refresh", command=self.refresh).grid(row=3, column=0, pady=(0, 10))
+        self.refresh()
+
+    def refresh(self):
+        median = self.history.median_duration(self.build_dir, "compile", self.days)
+        days = self.history.daily_summary(self.build_dir, "compile", self.days)
+        lines = [f"Build directory: {self.build_dir}"]
+        if median is None:
+            lines.append(f"No successful compiles recorded in the last {self.days} days.")
+        else:
+            runs = sum(row[1] for row in days)
+            lines.append(
+                f"Median compile time over the last {self.days} days: {median:.1f}s ({runs} compiles)"
+            )
+        self.summary_label.configure(text="\n".join(lines))
+
+        self.runs_view.delete(*self.runs_view.get_children())
+        for run_id, action, options, build_dir, started, duration, returncode, output_size in (
+            self.history.recent(build_dir=self.build_dir)
+        ):
+            self.runs_view.insert(
+                "", tk.END, text=time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(started)),
+                values=(action, options, f"{duration:.1f}s", returncode, format_bytes(output_size)),
+            )
+
+        self.targets_view.delete(*self.targets_view.get_children())
+        for output, runs, average, worst in self.history.slowest_targets(self.build_dir, self.days):
+            self.targets_view.insert(
+                "", tk.END, text=output, values=(runs, f"{average / 1000:.2f}s", f"{worst / 1000:.2f}s")
+            )
+
+
+class AdvisorWindow(tk.Toplevel):
+    def __init__(self, parent, meson_build, on_output):
+        super().__init__(parent)
+        self.meson_build = meson_build
+        self.on_output = on_output
+        self.title("Build Tuning Advisor")
+        self.resizable(False, False)
+
+        self.summary_label = ttk.Label(self, text="", justify=tk.LEFT)
+        self.summary_label.grid(row=0, column=0, columnspan=3, padx=10, pady=10, sticky=tk.W)
+
+        self.targets_view = ttk.Treeview(
+            self, columns=("units", "cpu", "unity", "pch", "headers"), height=12
+        )
+        self.targets_view.heading("#0", text="Target")
+        self.targets_view.heading("units", text="TUs")
+        self.targets_view.heading("cpu", text="Compile CPU")
+        self.targets_view.heading("unity", text="Unity Saves")
+        self.targets_view.heading("pch", text="PCH Saves")
+        self.targets_view.heading("headers", text="PCH Candidates")
+        self.targets_view.column("#0", width=160)
+        self.targets_view.column("units", width=50)
+        self.targets_view.column("cpu", width=90)
+        self.targets_view.column("unity", width=90)
+        self.targets_view.column("pch", width=90)
+        self.targets_view.column("headers", width=240)
+        self.targets_view.grid(row=1, column=0, columnspan=3, padx=10)
+
+        ttk.Label(self, text="Configure Options:").grid(row=2, column=0, padx=10, pady=10, sticky=tk.E)
+        self.arguments_entry = ttk.Entry(self, width=50)
+        self.arguments_entry.grid(row=2, column=1, pady=10, sticky=tk.W)
+        self.apply_button = ttk.Button(
+            self, text="Apply and Re-measure", command=self.apply, style="Blue.TButton"
+        )
+        self.apply_button.grid(row=3, column=0, pady=(0, 10))
+        ttk.Button(self, text="Refresh", command=self.refresh).grid(row=3, column=1, pady=(0, 10))
+        ttk.Button(self, text="Close", command=self.destroy).grid(row=3, column=2, pady=(0, 10))
+
+        self.refresh()
+
+    def refresh(self):
+        advice = self.meson_build.build_advice()
+        self.summary_label.configure(text=advice.format(limit=0).rstrip("\n"))
+        self.targets_view.delete(*self.targets_view.get_children())
+        ranked = sorted(
+            advice.targets, key=lambda target: max(target.unity_savings, target.pch_savings), reverse=True
+        )
+        for target in ranked:
+            self.targets_view.insert(
+                "", tk.END, text=target.name,
+                values=(
+                    len(target.units),
+                    f"{target.cpu_ms / 1000:.1f}s",
+                    f"{target.unity_savings / 1000:.1f}s",
+                    f"{target.pch_savings / 1000:.1f}s",
+                    ", ".join(os.path.basename(header) for header in target.stable_headers[:5]),
+                ),
+            )
+        self.arguments_entry.delete(0, tk.END)
+        self.arguments_entry.insert(0, " ".join(advice.arguments()))
+
+    def apply(self):
+        arguments = self.arguments_entry.get().split()
+        if not arguments:
+            tk.messagebox.showinfo("Build Tuning Advisor", "No configure options to apply.", parent=self)
+            return
+        self.apply_button.configure(state=tk.DISABLED)
+        threading.Thread(target=self.run_apply_thread, args=(arguments,)).start()
+
+    def run_apply_thread(self, arguments):
+        applied = False
+        try:
+            self.on_output(f"Applying {' '.join(arguments)} and rebuilding from clean to measure...\n")
+            self.on_output(self.meson_build.apply_build_advice(arguments))
+            applied = True
+        except Exception as e:
+            self.on_output(f"Error: {str(e)}\n")
+        finally:
+            # Widgets are only touched from the Tk thread.
+            self.after(0, self.finish_apply, applied)
+
+    def finish_apply(self, applied):
+        if not self.winfo_exists():
+            return
+        self.apply_button.configure(state=tk.NORMAL)
+        if applied:
+            self.refresh()
+
+
+class BenchmarkWindow(tk.Toplevel):
+    def __init__(self, parent, meson_build, on_output):
+        super().__init__(parent)
+        self.meson_build = meson_build
+        self.on_output = on_output
+        self.title("Benchmarks")
+        self.resizable(False, False)
+
+        ttk.Label(self, text="Runs:").grid(row=0, column=0, padx=10, pady=10, sticky=tk.E)
+        self.repeat_var = tk.StringVar(value="5")
+        ttk.Spinbox(self, from_=2, to=100, textvariable=self.repeat_var, width=5).grid(
+            row=0, column=1, sticky=tk.W
+        )
+        ttk.Label(self, text="Compare With Build Dir:").grid(row=1, column=0, padx=10, sticky=tk.E)
+        self.reference_entry = ttk.Entry(self, width=40)
+        self.reference_entry.grid(row=1, column=1, columnspan=2, sticky=tk.W)
+        ttk.Label(self, text="(empty: the saved baseline)").grid(row=1, column=3, padx=5, sticky=tk.W)
+
+        self.results_view = ttk.Treeview(
+            self, columns=("mean", "interval", "reference", "change", "verdict"), height=12
+        )
+        self.results_view.heading("#0", text="Benchmark")
+        self.results_view.heading("mean", text="Mean")
+        self.results_view.heading("interval", text="95% CI")
+        self.results_view.heading("reference", text="Reference")
+        self.results_view.heading("change", text="Change")
+        self.results_view.heading("verdict", text="Verdict")
+        self.results_view.column("#0", width=200)
+        self.results_view.column("mean", width=90)
+        self.results_view.column("interval", width=90)
+        self.results_view.column("reference", width=90)
+        self.results_view.column("change", width=90)
+        self.results_view.column("verdict", width=90)
+        self.results_view.tag_configure("regression", foreground="red")
+        self.results_view.tag_configure("improvement", foreground="dark green")
+        self.results_view.grid(row=2, column=0, columnspan=4, padx=10, pady=10)
+
+        self.run_button = ttk.Button(self, text="Run", command=self.run, style="Blue.TButton")
+        self.run_button.grid(row=3, column=0, pady=(0, 10))
+        ttk.Button(self, text="Save as Baseline", command=self.save_baseline).grid(row=3, column=1, pady=(0, 10))
+        ttk.Button(self, text="Close", command=self.destroy).grid(row=3, column=2, pady=(0, 10))
+
+    def run(self):
+        try:
+            repeat = int(self.repeat_var.get())
+        except ValueError:
+            tk.messagebox.showerror("Error", "The number of runs must be a number.", parent=self)
+            return
+        reference = self.reference_entry.get().strip() or None
+        self.run_button.configure(state=tk.DISABLED)
+        threading.Thread(target=self.run_benchmark_thread, args=(max(repeat, 2), reference)).start()
+
+    def run_benchmark_thread(self, repeat, reference):
+        try:
+            self.on_output(f"Running benchmarks {repeat} times in {self.meson_build.build_dir}...\n")
+            self.on_output(self.meson_build.benchmark(repeat, reference=reference))
+        except Exception as e:
+            self.on_output(f"Error: {str(e)}\n")
+        finally:
+            # Widgets are only touched from the Tk thread.
+            self.after(0, self.finish_run)
+
+    def finish_run(self):
+        if not self.winfo_exists():
+            return
+        self.run_button.configure(state=tk.NORMAL)
+        self.show_results()
+
+    def show_results(self):
+        self.results_view.delete(*self.results_view.get_children())
+        compared = {comparison.name: comparison for comparison in self.meson_build.last_benchmarks or []}
+        results = benchmark_stats(load_samples(self.meson_build.build_dir))
+        if not results:
+            self.results_view.insert("", tk.END, text="No results from the last run")
+        for name, stats in sorted(results.items()):
+            comparison = compared.get(name)
+            values = [f"{stats.mean * 1000:.2f}ms", f"±{stats.interval * 1000:.2f}ms"]
+            if comparison is None:
+                values += ["", "", "no reference"]
+            else:
+                values += [
+                    f"{comparison.reference.mean * 1000:.2f}ms",
+                    f"{comparison.change:+.1%}",
+                    comparison.verdict,
+                ]
+            tags = (comparison.verdict,) if comparison is not None else ()
+            self.results_view.insert("", tk.END, text=name, values=values, tags=tags)
+
+    def save_baseline(self):
+        count = self.meson_build.save_benchmark_baseline()
+        if count:
+            self.on_output(f"Saved {count} benchmark results as the baseline.\n")
+        else:
+            tk.messagebox.showinfo("Benchmarks", "Run the benchmarks before saving a baseline.", parent=self)
+
+
+class SnapshotsWindow(tk.Toplevel):
+    def __init__(self, parent, meson_build, on_output):
+        super().__init__(parent)
+        self.meson_build = meson_build
+        self.on_output = on_output
+        self.title("Build Snapshots")
+        self.resizable(False, False)
+
+        self.snapshots_view = ttk.Treeview(
+            self, columns=("label", "created", "files", "methods"), height=8
+        )
+        self.snapshots_view.heading("#0", text="Snapshot")
+        self.snapshots_view.heading("label", text="Taken")
+        self.snapshots_view.heading("created", text="Created")
+        self.snapshots_view.heading("files", text="Files")
+        self.snapshots_view.heading("methods", text="Stored As")
+        self.snapshots_view.column("#0", width=150)
+        self.snapshots_view.column("label", width=240)
+        self.snapshots_view.column("created", width=140)
+        self.snapshots_view.column("files", width=60)
+        self.snapshots_view.column("methods", width=160)
+        self.snapshots_view.grid(row=0, column=0, columnspan=4, padx=10, pady=10)
+
+        ttk.Button(self, text="Snapshot Now", command=self.snapshot).grid(row=1, column=0, pady=(0, 10))
+        ttk.Button(self, text="Restore", command=self.restore, style="Blue.TButton").grid(
+            row=1, column=1, pady=(0, 10)
+        )
+        ttk.Button(self, text="Delete", command=self.delete).grid(row=1, column=2, pady=(0, 10))
+        ttk.Button(self, text="Close", command=self.destroy).grid(row=1, column=3, pady=(0, 10))
+
+        self.refresh()
+
+    def refresh(self):
+        self.snapshots_view.delete(*self.snapshots_view.get_children())
+        for info in self.meson_build.snapshots().list():
+            methods = ", ".join(f"{count} {method}" for method, count in sorted(info["methods"].items()))
+            self.snapshots_view.insert(
+                "", tk.END, iid=info["id"], text=info["id"],
+                values=(
+                    info["label"],
+                    time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(info["created"])),
+                    info["files"],
+                    methods,
+                ),
+            )
+
+    def selected(self):
+        selection = self.snapshots_view.selection()
+        if not selection:
+            tk.messagebox.showinfo("Build Snapshots", "Select a snapshot first.", parent=self)
+            return None
+        return selection[0]
+
+    def snapshot(self):
+        try:
+            info = self.meson_build.snapshots().create("manual snapshot")
+            self.on_output(f"Snapshot {format_snapshot(info)}\n")
+        except OSError as e:
+            tk.messagebox.showerror("Error", str(e), parent=self)
+        self.refresh()
+
+    def restore(self):
+        snapshot_id = self.selected()
+        if snapshot_id is None:
+            return
+        try:
+            self.on_output(self.meson_build.restore_snapshot(snapshot_id))
+        except (OSError, ValueError) as e:
+            tk.messagebox.showerror("Error", str(e), parent=self)
+        self.refresh()
+
+    def delete(self):
+        snapshot_id = self.selected()
+        if snapshot_id is not None:
+            self.meson_build.snapshots().delete(snapshot_id)
+            self.refresh()
+
+
+class FanoutWindow(tk.Toplevel):
+    def __init__(self, parent, meson_build):
+        super().__init__(parent)
+        self.meson_build = meson_build
+        self.title("Header Fan-out")
+        self.resizable(False, False)
+
+        self.summary_label = ttk.Label(self, text="", justify=tk.LEFT)
+        self.summary_label.grid(row=0, column=0, columnspan=3, padx=10, pady=10, sticky=tk.W)
+
+        self.headers_view = ttk.Treeview(self, columns=("units", "targets", "cost", "share"), height=15)
+        self.headers_view.heading("#0", text="Header")
+        self.headers_view.heading("units", text="TUs")
+        self.headers_view.heading("targets", text="Targets")
+        self.headers_view.heading("cost", text="Cost to Touch")
+        self.headers_view.heading("share", text="Of Full Compile")
+        self.headers_view.column("#0", width=360)
+        self.headers_view.column("units", width=60)
+        self.headers_view.column("targets", width=60)
+        self.headers_view.column("cost", width=100)
+        self.headers_view.column("share", width=100)
+        self.headers_view.grid(row=1, column=0, columnspan=3, padx=10)
+
+        self.project_only_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(
+            self, text="Project headers only", variable=self.project_only_var, command=self.refresh
+        ).grid(row=2, column=0, padx=10, pady=10, sticky=tk.W)
+        ttk.Button(self, text="Refresh", command=self.refresh).grid(row=2, column=1, pady=10)
+        ttk.Button(self, text="Close", command=self.destroy).grid(row=2, column=2, pady=10)
+
+        self.refresh()
+
+    def refresh(self):
+        report = self.meson_build.header_fanout(self.project_only_var.get())
+        self.summary_label.configure(text=report.summary())
+        self.headers_view.delete(*self.headers_view.get_children())
+        source_root = os.path.abspath(self.meson_build.source_dir) + os.sep
+        for cost in report.headers[:500]:
+            name = cost.header
+            if name.startswith(source_root):
+                name = name[len(source_root):]
+            share = cost.cost_ms / report.total_ms if report.total_ms else 0.0
+            self.headers_view.insert(
+                "", tk.END, text=name,
+                values=(cost.units, len(cost.targets), f"{cost.cost_ms / 1000:.1f}s", f"{share:.0%}"),
+            )
+
+
 class MesonBuild:
     def __init__(self, source_dir, build_dir):
+        self.tmpfs = None
+        self.last_sync = None
         self.source_dir = source_dir
         self.build_dir = build_dir
+        self.sample_resources = sampler_supported()
+        self.sampler = None
+        self.adaptive_parallelism = False
+        self.last_parallelism = None
+        self.build_cache = None
+        self.cache_store = None
+        self.history = None
+        self.detect_regressions = True
+        self.last_regressions = []
+        self.spool_output = False
+        self.last_output = None
+        self.skip_clean_builds = False
+        self.last_plan = None
+        self.last_setup_profile = None
+        self.events = None
+        self.last_advice = None
+        self.last_benchmarks = None
+        self.snapshot_before_configure = False
+        self.max_snapshots = 3
+
+    @property
+    def build_dir(self):
+        # With tmpfs staging the configured path only holds synced artifacts;
+        # every command works in the staged tree it maps to.
+        if self.tmpfs is not None:
+            staged = self.tmpfs.staged_dir(self.configured_build_dir)
+            if staged is not None:
+                return staged
+        return self.configured_build_dir
+
+    @build_dir.setter
+    def build_dir(self, build_dir):
+        self.configured_build_dir = build_dir
+
+    def stage_on_tmpfs(self, options):
+        build_dir = self.configured_build_dir
+        if self.tmpfs is None or is_build_dir(build_dir) or self.tmpfs.staged_dir(build_dir):
+            return ""
+        if not self.tmpfs.has_room():
+            return f"Not staging on tmpfs ({self.tmpfs.shortage()}); using {build_dir}.\n"
+        os.makedirs(build_dir, exist_ok=True)
+        staged = self.tmpfs.stage(build_dir, options)
+        return f"Staging {build_dir} on tmpfs at {staged}.\n"
+
+    def ensure_tmpfs_room(self):
+        # The result's output is a note for the compile; it fails when the
+        # build dir could not be set up again on disk.
+        build_dir = self.configured_build_dir
+        if self.tmpfs is None or self.tmpfs.staged_dir(build_dir) is None:
+            return CommandResult("", 0)
+        checks = self.tmpfs.short_of_room(build_dir)
+        if not checks:
+            return CommandResult("", 0)
+        shortage = self.tmpfs.shortage()
+        if checks < self.tmpfs.shortage_limit:
+            return CommandResult(
+                f"Memory is low ({shortage}); the build moves back to disk if this lasts "
+                f"{self.tmpfs.shortage_limit} compiles in a row ({checks} so far).\n", 0
+            )
+        # Memory has stayed short: give the RAM back and rebuild on disk.
+        options = self.tmpfs.setup_options(build_dir)
+        self.tmpfs.unstage(build_dir)
+        return prepend(f"Moving the build back to disk ({shortage}).\n", self.setup(options))
 
     def setup(self, options=""):
+        self.wait_for_cache_store()
+        note = self.stage_on_tmpfs(options)
         command = ["meson", "setup", self.build_dir, self.source_dir] + options.split()
-        return self.run_command(command)
+        if self.build_cache is not None and not is_build_dir(self.build_dir):
+            key = self.build_cache.key_for(self.source_dir, self.build_dir, options)
+            entry = self.build_cache.restore(key, self.source_dir, self.build_dir)
+            if entry is not None:
+                restored = self.relocate_restored(entry, options)
+                if restored.ok:
+                    self.save_cache_state(options)
+                    return prepend(note + f"Restored {self.build_dir} from the build cache ({key[:12]}).\n", restored)
+                shutil.rmtree(self.build_dir, ignore_errors=True)
+                note += "The cached build dir could not be moved here; setting up from scratch.\n"
+        result = self.run_command(command)
+        if result.ok:
+            self.save_cache_state(options)
+        elif self.tmpfs is not None and note.startswith("Staging"):
+            self.tmpfs.unstage(self.configured_build_dir)
+        return prepend(note, result)
+
+    def relocate_restored(self, entry, options):
+        # Meson build dirs hold absolute paths. A tree built at another path is
+        # pointed at this checkout with a reconfigure; the compile commands stay
+        # the same, so ninja keeps the restored outputs.
+        here = (os.path.abspath(self.source_dir), os.path.abspath(self.build_dir))
+        if (entry.get("source_dir"), entry.get("build_dir")) == here:
+            return CommandResult("", 0)
+        return self.run_command(["meson", "setup", "--reconfigure", self.build_dir, self.source_dir] + options.split())
+
+    def profile_setup(self, options="", on_output=None):
+        # Profiling needs a full configure, so a configured build dir is wiped
+        # (meson keeps its options) rather than merely regenerated.
+        self.wait_for_cache_store()
+        wipe = is_build_dir(self.build_dir)
+        command = ["meson", "setup", "--profile-self"] + (["--wipe"] if wipe else [])
+        command += [self.build_dir, self.source_dir] + options.split()
+        timeline = OutputTimeline(on_output)
+        result = self.run_command(command, on_output=timeline)
+        self.last_setup_profile = None
+        if not result.ok:
+            return result
+        if not wipe:
+            self.save_cache_state(options)
+        profile = SetupProfile.from_lines(timeline.lines)
+        profile.hotspots = profile_hotspots(self.build_dir)
+        self.last_setup_profile = profile
+        return result.with_output(result.output + "\n" + profile.format(self.source_dir))
 
     def configure(self, options=""):
-        command = ["meson", "configure", self.build_dir] + options.split()
-        return self.run_command(command)
+        self.wait_for_cache_store()
+        options = options.split() if isinstance(options, str) else list(options)
+        note = ""
+        if options and self.snapshot_before_configure and is_build_dir(self.build_dir):
+            try:
+                snapshot = self.snapshots().create(f"before configure {' '.join(options)}")
+                note = f"Snapshot {format_snapshot(snapshot)}\n"
+            except OSError as e:
+                note = f"Could not snapshot {self.build_dir}: {str(e)}\n"
+        command = ["meson", "configure", self.build_dir] + options
+        result = self.run_command(command)
+        if options:
+            # The build dir no longer matches what setup produced for these options.
+            self.save_cache_state(None)
+        return prepend(note, result)
+
+    def snapshots(self):
+        return BuildSnapshots(self.build_dir, self.max_snapshots)
+
+    def restore_snapshot(self, snapshot_id):
+        self.wait_for_cache_store()
+        stale, current = self.snapshots().restore(snapshot_id)
+        output = f"Restored snapshot {snapshot_id} into {self.build_dir}.\n"
+        if current is not None:
+            output += f"The replaced build dir was kept as snapshot {current['id']}.\n"
+        if stale:
+            output += f"{len(stale)} files changed since the snapshot and will be rebuilt.\n"
+        return CommandResult(output, 0)
+
+    def cache_state_path(self):
+        return os.path.join(build_state_dir(self.build_dir), "buildcache.json")
+
+    def save_cache_state(self, options):
+        save_json(self.cache_state_path(), {"setup_options": options})
+
+    def store_in_cache(self):
+        # Copying a build dir takes a while, so it runs on a worker thread and
+        # the compile returns at once. Anything that changes the build dir
+        # waits for the copy first (wait_for_cache_store).
+        options = load_json(self.cache_state_path(), {}).get("setup_options")
+        if self.build_cache is None or options is None:
+            return None
+        self.wait_for_cache_store()
+        self.cache_store = threading.Thread(
+            target=self.store_build_dir, args=(self.build_cache, self.source_dir, self.build_dir, options)
+        )
+        self.cache_store.start()
+        return self.cache_store
 
-    def compile(self):
+    def store_build_dir(self, build_cache, source_dir, build_dir, options):
+        try:
+            manifest = build_cache.source_manifest(source_dir, build_dir)
+            key = build_cache.key_for(source_dir, build_dir, options, manifest)
+            if not build_cache.contains(key):
+                build_cache.store(key, source_dir, build_dir, manifest)
+        except OSError:
+            # The cache only saves time; a failed store means a later miss.
+            pass
+
+    def wait_for_cache_store(self):
+        worker = self.cache_store
+        if worker is not None and worker is not threading.current_thread():
+            worker.join()
+
+    def dirty_check(self, targets=None):
+        self.last_plan = dry_run_plan(self.build_dir, targets)
+        return self.last_plan
+
+    def compile(self, jobs=None, load_average=None, targets=None):
+        self.wait_for_cache_store()
+        self.last_plan = None
+        self.last_sync = None
+        room = self.ensure_tmpfs_room()
+        if not room.ok:
+            return room
+        note = room.output
+        if self.skip_clean_builds and is_build_dir(self.build_dir):
+            # A ninja dry run is far cheaper than starting meson on a clean tree.
+            self.stage("dirty check")
+            plan = self.dirty_check()
+            if plan is not None and plan.up_to_date:
+                record_stamp(self.configured_build_dir, self.source_dir, "compile")
+                return CommandResult(note + "Up to date; nothing to compile.\n", 0)
         command = ["meson", "compile", "-C", self.build_dir]
-        return self.run_command(command)
+        parallelism = None
+        if jobs is None and self.adaptive_parallelism:
+            parallelism = AdaptiveParallelism(self.build_dir)
+            self.last_parallelism = parallelism.plan()
+            jobs = self.last_parallelism.jobs
+            load_average = self.last_parallelism.load_average
+        if jobs:
+            command += ["-j", str(jobs)]
+        if load_average:
+            command += ["-l", f"{load_average:g}"]
+        command += targets or []
+        log_offset = ninja_log_size(self.build_dir)
+        self.last_regressions = []
+        self.stage("build")
+        result = self.run_command(command, spool=self.spool_output)
+        self.stage("timings")
+        durations = target_durations(read_ninja_log(self.build_dir, log_offset))
+        if self.history is not None and result.run_id is not None:
+            self.history.record_targets(result.run_id, durations)
+        if self.detect_regressions and result.ok and durations:
+            baseline = TimingBaseline(self.build_dir, state_dir=self.configured_build_dir)
+            self.last_regressions = baseline.check(durations)
+            baseline.record(durations)
+        if parallelism is not None:
+            parallelism.record(result.resources)
+        if result.ok:
+            record_stamp(self.configured_build_dir, self.source_dir, "compile")
+            if self.build_cache is not None and not targets:
+                self.store_in_cache()
+            if self.build_dir != self.configured_build_dir:
+                self.stage("sync back")
+                self.last_sync = self.tmpfs.sync_back(self.build_dir, self.configured_build_dir)
+        return prepend(note, result) if note else result
+
+    def header_fanout(self, project_only=True):
+        return header_fanout(self.build_dir, self.source_dir, project_only)
+
+    def build_advice(self):
+        self.last_advice = advise(self.build_dir, self.source_dir)
+        return self.last_advice
+
+    def apply_build_advice(self, arguments):
+        # Both sides of the comparison are whole-tree compiles, so the
+        # settings are measured with a clean rebuild.
+        before = compile_cpu_ms(compile_units(self.build_dir))
+        configured = self.configure(arguments)
+        if not configured.ok:
+            return configured
+        cleaned = prepend(configured.output, self.run_command(["meson", "compile", "-C", self.build_dir, "--clean"]))
+        if not cleaned.ok:
+            return cleaned
+        log_offset = ninja_log_size(self.build_dir)
+        result = prepend(cleaned.output, self.compile())
+        if not result.ok:
+            return result
+        entries = read_ninja_log(self.build_dir, log_offset)
+        after = compile_cpu_ms(compile_units(self.build_dir, durations=target_durations(entries)))
+        wall = (max(end for _, end, _ in entries) - min(start for start, _, _ in entries)) if entries else 0
+        change = f" ({(after - before) / before:+.0%})" if before else ""
+        summary = (
+            f"Compile CPU time {before / 1000:.1f}s -> {after / 1000:.1f}s{change}; "
+            f"the rebuild took {wall / 1000:.1f}s.\n"
+        )
+        return prepend(summary, result)
+
+    def compile_affected(self):
+        changed = changed_files(self.source_dir, self.configured_build_dir, "compile")
+        if changed is None:
+            return prepend("No previous successful build recorded; compiling everything.\n", self.compile())
+        if not changed:
+            return CommandResult("No files changed since the last successful build.\n", 0)
+        targets = affected_target_specs(self.build_dir, self.source_dir, changed)
+        if targets is None:
+            return prepend("Build files or unmapped inputs changed; compiling everything.\n", self.compile())
+        if not targets:
+            return CommandResult(f"{len(changed)} changed files affect no targets.\n", 0)
+        header = f"{len(changed)} changed files affect {len(targets)} targets: {' '.join(targets)}\n"
+        return prepend(header, self.compile(targets=targets))
+
+    def test(self, tests=None):
+        self.wait_for_cache_store()
+        command = ["meson", "test", "-C", self.build_dir] + (tests or [])
+        result = self.run_command(command, spool=self.spool_output)
+        if result.ok:
+            record_stamp(self.configured_build_dir, self.source_dir, "test")
+        return result
+
+    def test_affected(self):
+        changed = changed_files(self.source_dir, self.configured_build_dir, "test")
+        if changed is None:
+            return prepend("No previous green test run recorded; running all tests.\n", self.test())
+        if not changed:
+            return CommandResult("No files changed since the last green test run.\n", 0)
+        tests = affected_tests(self.build_dir, changed)
+        if tests is None:
+            return prepend("Build files or unmapped inputs changed; running all tests.\n", self.test())
+        if not tests:
+            return CommandResult(f"{len(changed)} changed files affect no tests.\n", 0)
+        header = f"{len(changed)} changed files affect {len(tests)} tests: {' '.join(tests)}\n"
+        return prepend(header, self.test(tests))
+
+    def benchmark(self, repeat=5, benchmarks=None, reference=None):
+        # Compares against the saved baseline, or against the last benchmark
+        # run of another build dir when one is given.
+        with contextlib.suppress(OSError):
+            os.remove(os.path.join(self.build_dir, "meson-logs", f"{BENCHMARK_LOG}.json"))
+        result = self.run_command(benchmark_command(self.build_dir, repeat, benchmarks))
+        samples, failed = read_benchmark_log(self.build_dir)
+        # Saved even when empty, so the last run never shows an older run's samples.
+        save_samples(self.build_dir, samples)
+        if reference is None:
+            reference_samples = load_samples(self.build_dir, BASELINE_FILE)
+        else:
+            reference_samples = load_samples(reference)
+        self.last_benchmarks = compare_benchmarks(samples, reference_samples)
+        return result.with_output(result.output + "\n" + format_benchmarks(samples, self.last_benchmarks, failed))
 
-    def test(self):
-        command = ["meson", "test", "-C", self.build_dir]
-        return self.run_command(command)
+    def save_benchmark_baseline(self):
+        samples = load_samples(self.build_dir)
+        if samples:
+            save_samples(self.build_dir, samples, BASELINE_FILE)
+        return len(samples)
 
     def install(self):
+        self.wait_for_cache_store()
         command = ["meson", "install", "-C", self.build_dir]
-        return self.run_command(command)
+        return self.run_command(command, spool=self.spool_output)
+
+    def install_incremental(self, dry_run=False, use_hash=False):
+        if not dry_run:
+            compiled = self.compile()
+            if not compiled.ok:
+                return compiled
+        installer = IncrementalInstall(self.build_dir, use_hash=use_hash)
+        actions = installer.diff()
+        counts = {kind: sum(1 for action in actions if action.kind == kind)
+                  for kind in ("add", "update", "remove")}
+        report = "".join(action.format() + "\n" for action in actions)
+        report += (
+            f"{counts['add']} new, {counts['update']} changed, "
+            f"{counts['remove']} stale files{' (dry run)' if dry_run else ''}.\n"
+        )
+        reasons = installer.meson_only()
+        if installer.needs_fixups() & {action.source for action in actions}:
+            reasons.append("rpath fixups")
+        copies = [action for action in actions if action.kind != "remove"]
+        if reasons and copies:
+            report += f"Installing through meson install --only-changed ({', '.join(reasons)}).\n"
+        if dry_run or not actions:
+            return CommandResult(report, 0)
+        if reasons and copies:
+            # --only-changed keeps unchanged files untouched; meson runs the
+            # scripts and applies modes, stripping and rpaths itself.
+            installed = self.run_command(
+                ["meson", "install", "-C", self.build_dir, "--no-rebuild", "--only-changed"]
+            )
+            if not installed.ok:
+                return installed
+            installer.apply([action for action in actions if action.kind == "remove"])
+        else:
+            installer.apply(actions)
+        installer.save_manifest()
+        return CommandResult(report, 0)
 
     def introspect(self, options=""):
         command = ["meson", "introspect", self.build_dir] + options.split()
@@ -584,14 +1469,61 @@ class MesonBuild:
         command = ["meson", "rewrite"] + options.split()
         return self.run_command(command)
 
-    def dist(self, options=""):
-        command = ["meson", "dist"] + options.split()
-        return self.run_command(command)
+    def dist(self, options="", on_output=None):
+        command = ["meson", "dist", "-C", self.build_dir] + options.split()
+        return self.run_command(command, on_output)
+
+    def dist_parallel(self, formats=("xztar", "gztar", "zip"), reuse_tested=False,
+                      include_subprojects=False, allow_dirty=False, on_output=None):
+        formats = [archive_format for archive_format in formats if archive_format in ARCHIVE_EXTENSIONS]
+        primary_format = formats[0] if formats else "xztar"
+        options = f"--formats {primary_format}"
+        notes = []
+        if reuse_tested and tested_build_is_current(self.configured_build_dir, self.source_dir):
+            options += " --no-tests"
+            notes.append("Reusing the tested build; skipping the dist build and test.\n")
+        if include_subprojects:
+            options += " --include-subprojects"
+        if allow_dirty:
+            options += " --allow-dirty"
+        for note in notes:
+            if on_output is not None:
+                on_output(note)
+
+        timings = {}
+        started = time.perf_counter()
+        result = self.dist(options, on_output)
+        timings[f"meson dist ({primary_format})"] = time.perf_counter() - started
+        if not result.ok:
+            if on_output is not None:
+                # The output has already been streamed line by line.
+                return result.with_output(f"meson dist failed with exit code {result.returncode}.\n")
+            return result
+
+        primary = newest_archive(os.path.join(self.build_dir, "meson-dist"), primary_format)
+        _, repack_timings = repack_archives(primary, formats[1:], on_output)
+        timings.update(repack_timings)
+        report = "".join(notes) + "Dist phase timings:\n"
+        report += "".join(f"  {phase:24} {elapsed:8.2f}s\n" for phase, elapsed in timings.items())
+        report += f"  {'total':24} {time.perf_counter() - started:8.2f}s\n"
+        return result.with_output(report)
 
     def devenv(self, options=""):
         command = ["meson", "devenv"] + options.split()
         return self.run_command(command)
 
+    def run_program(self, program, args=(), on_output=None):
+        process = DevEnvironment(self).launch(
+            program, args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+        )
+        lines = []
+        for line in process.stdout:
+            lines.append(line)
+            if on_output is not None:
+                on_output(line)
+        process.wait()
+        return CommandResult("".join(lines), process.returncode)
+
     def wrap(self, options=""):
         command = ["meson", "wrap"] + options.split()
         return self.run_command(command)
@@ -604,14 +1536,79 @@ class MesonBuild:
         command = ["meson", "init"] + options.split()
         return self.run_command(command)
 
-    def run_command(self, command):
+    def stage(self, name):
+        if self.events is not None:
+            self.events.emit("stage", action="compile", build_dir=os.path.abspath(self.configured_build_dir), stage=name)
+
+    def run_command(self, command, on_output=None, spool=False):
+        started = time.time()
+        # Each call gets its own handle; GUI actions run on separate threads
+        # and may spool at the same time.
+        spooled = CommandOutput() if spool else None
+        job = None
+        if self.events is not None:
+            job = self.events.start(command, self.configured_build_dir)
+            if on_output is not None or spool:
+                # Only commands that already stream get progress events; the
+                # rest keep stderr separate and are scanned once they finish.
+                on_output = job.output_handler(on_output)
+        result = self.execute(command, on_output, spooled)
+        if spooled is not None:
+            # The previous output is not closed here: the GUI may still be
+            # showing it. Its temp file goes away once nothing refers to it.
+            self.last_output = spooled
+        if job is not None:
+            job.finish(result.returncode, result.output)
+        if self.history is not None:
+            result.run_id = self.history.record(
+                command, self.configured_build_dir, started, time.time(), result.returncode, len(result.output)
+            )
+        return result
+
+    def execute(self, command, on_output=None, output=None):
+        # With an output handle, lines go straight to it instead of piling up
+        # in strings, so memory stays bounded however verbose the command is.
+        streaming = on_output is not None or output is not None
         try:
-            result = subprocess.run(command, capture_output=True, text=True, check=True)
-            return result.stdout
-        except subprocess.CalledProcessError as e:
-            return f"Command '{' '.join(command)}' failed with error: {e.stderr}"
+            # Streaming merges stderr into stdout so one pipe can be read line by line.
+            process = subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT if streaming else subprocess.PIPE,
+                text=True,
+            )
+            sampler = resources = None
+            if self.sample_resources:
+                # self.sampler only feeds the live resource view; the summary
+                # travels with this command's result.
+                sampler = self.sampler = ProcessTreeSampler(process.pid).start()
+            try:
+                if not streaming:
+                    stdout, stderr = process.communicate()
+                else:
+                    lines = []
+                    for line in process.stdout:
+                        if output is not None:
+                            output.write(line)
+                        else:
+                            lines.append(line)
+                        if on_output is not None:
+                            on_output(line)
+                    process.wait()
+                    stdout = stderr = "".join(lines)
+            finally:
+                if sampler is not None:
+                    resources = sampler.stop()
+            if process.returncode != 0:
+                if output is not None:
+                    output = prepend(f"Command '{' '.join(command)}' failed with error: ", output)
+                else:
+                    output = f"Command '{' '.join(command)}' failed with error: {stderr}"
+            return CommandResult(output if output is not None else stdout, process.returncode, resources)
         except Exception as e:
-            return f"An unexpected error occurred: {str(e)}"
+            if output is not None:
+                return CommandResult(prepend(f"An unexpected error occurred: {str(e)}\n", output), None)
+            return CommandResult(f"An unexpected error occurred: {str(e)}", None)
 
 
 class MesonBuildGUI:
@@ -633,6 +1630,20 @@ class MesonBuildGUI:
         self.meson_build = MesonBuild(
             self.source_dir_entry.get(), self.build_dir_entry.get()
         )
+        self.meson_build.adaptive_parallelism = self.adaptive_parallelism_var.get()
+        if self.build_cache_var.get():
+            self.meson_build.build_cache = BuildDirCache()
+        if self.history_var.get():
+            self.meson_build.history = self.open_history()
+        self.meson_build.spool_output = True
+        self.meson_build.skip_clean_builds = self.config.getboolean(
+            "Settings", "skip_clean_builds", fallback=True
+        )
+        if self.tmpfs_var.get():
+            self.meson_build.tmpfs = TmpfsStaging()
+        if self.telemetry_var.get():
+            self.meson_build.events = self.create_event_stream()
+        self.meson_build.snapshot_before_configure = self.snapshots_var.get()
 
     def load_settings(self):
         if not os.path.exists(self.config_file):
@@ -640,6 +1651,28 @@ class MesonBuildGUI:
         self.config.read(self.config_file)
         self.build_dir_entry.delete(0, tk.END)
         self.build_dir_entry.insert(0, os.path.join(os.getcwd(), self.config["Settings"]["build_dir"]))
+        self.adaptive_parallelism_var.set(
+            self.config.get("Settings", "parallelism", fallback="default") == "adaptive"
+        )
+        self.build_cache_var.set(
+            self.config.getboolean("Settings", "build_cache", fallback=False)
+        )
+        self.history_var.set(
+            self.config.getboolean("Settings", "history", fallback=True)
+        )
+        self.tmpfs_var.set(
+            self.config.getboolean("Settings", "tmpfs", fallback=False)
+        )
+        self.telemetry_var.set(
+            self.config.getboolean("Settings", "telemetry", fallback=False)
+        )
+        self.snapshots_var.set(
+            self.config.getboolean("Settings", "snapshots", fallback=True)
+        )
+
+    def save_settings(self):
+        with open(self.config_file, "w") as configfile:
+            self.config.write(configfile)
 
     def create_default_settings(self):
         self.config["Settings"] = {"build_dir": "builddir", "theme": "meson"}
@@ -647,13 +1680,16 @@ class MesonBuildGUI:
             self.config.write(configfile)
 
     def apply_styles(self):
-        self.style = ttk.Style()
-        self.style.configure(
-            "Blue.TButton",
-            foreground="black",
-            background="#ADD8E6",
-            font=("Helvetica", 10, "bold"),
-        )
+        self.requests = RequestCoalescer()
+        self.themes = ThemeEngine(self.root)
+        self.style = self.themes.style
+        self.dialogs = {}
+
+    def dialog(self, dialog_class):
+        dialog = self.dialogs.get(dialog_class)
+        if dialog is None or not dialog.winfo_exists():
+            dialog = self.dialogs[dialog_class] = dialog_class(self.root)
+        return dialog
 
     def create_widgets(self):
         self.create_menu()
@@ -710,8 +1746,7 @@ class MesonBuildGUI:
         self.source_dir_label = ttk.Label(
             self.root,
             text="Source Directory:",
-            background="dark gray",
-            font=("Helvetica", 10, "bold"),
+            style="Path.TLabel",
         )
         self.source_dir_entry = ttk.Entry(self.root, width=50)
         self.source_dir_entry.insert(0, os.getcwd())
@@ -725,8 +1760,7 @@ class MesonBuildGUI:
         self.build_dir_label = ttk.Label(
             self.root,
             text="Build Directory:",
-            background="dark gray",
-            font=("Helvetica", 10, "bold"),
+            style="Path.TLabel",
         )
         self.build_dir_entry = ttk.Entry(self.root, width=50)
         self.build_dir_entry.insert(0, os.path.join(os.getcwd(), "builddir"))
@@ -804,21 +1838,79 @@ class MesonBuildGUI:
         themes_menu.add_command(label="Dark", command=lambda: self.set_theme("dark"))
         themes_menu.add_command(label="Meson", command=lambda: self.set_theme("meson"))
         options_menu.add_cascade(label="Themes", menu=themes_menu)
+        self.adaptive_parallelism_var = tk.BooleanVar(value=False)
+        options_menu.add_checkbutton(
+            label="Adaptive Parallelism",
+            variable=self.adaptive_parallelism_var,
+            command=self.toggle_adaptive_parallelism,
+        )
+        self.build_cache_var = tk.BooleanVar(value=False)
+        options_menu.add_checkbutton(
+            label="Build Cache",
+            variable=self.build_cache_var,
+            command=self.toggle_build_cache,
+        )
+        options_menu.add_command(label="Build Cache Report", command=self.show_build_cache_report)
+        self.tmpfs_var = tk.BooleanVar(value=False)
+        options_menu.add_checkbutton(
+            label="RAM-Disk Build Directory",
+            variable=self.tmpfs_var,
+            command=self.toggle_tmpfs,
+        )
+        self.snapshots_var = tk.BooleanVar(value=True)
+        options_menu.add_checkbutton(
+            label="Snapshot Before Reconfigure",
+            variable=self.snapshots_var,
+            command=self.toggle_snapshots,
+        )
+        options_menu.add_command(label="Build Snapshots", command=self.show_snapshots)
+        self.history_var = tk.BooleanVar(value=True)
+        options_menu.add_checkbutton(
+            label="Record Run History",
+            variable=self.history_var,
+            command=self.toggle_history,
+        )
+        options_menu.add_command(label="Run History", command=self.show_history)
+        self.telemetry_var = tk.BooleanVar(value=False)
+        options_menu.add_checkbutton(
+            label="Event Stream and Metrics",
+            variable=self.telemetry_var,
+            command=self.toggle_telemetry,
+        )
         options_menu.add_command(label="Tutorial", command=self.show_tutorial)
         options_menu.add_command(label="Version", command=self.show_version)
         options_menu.add_command(label="Clear Terminal", command=self.clear_terminal)
+        options_menu.add_command(label="Save Last Output", command=self.save_last_output)
+        options_menu.add_command(label="Resource Monitor", command=self.show_resource_monitor)
         options_menu.add_command(label="Help", command=self.get_tool_info)
         menubar.add_cascade(label="Options", menu=options_menu)
 
         actions_menu = tk.Menu(menubar, tearoff=0)
         actions_menu.add_command(label="Setup", command=self.setup_project)
+        actions_menu.add_command(label="Profile Setup", command=self.profile_setup_project)
         actions_menu.add_command(label="Configure", command=self.configure_project)
         actions_menu.add_command(label="Compile", command=self.compile_project)
+        actions_menu.add_command(label="Compile Affected", command=self.compile_affected_project)
+        actions_menu.add_command(label="Check Dirty", command=self.dirty_check_project)
+        actions_menu.add_command(label="Build Tuning Advisor", command=self.show_advisor)
+        actions_menu.add_command(label="Header Fan-out", command=self.show_fanout)
         actions_menu.add_command(label="Test", command=self.test_project)
+        actions_menu.add_command(label="Test Affected", command=self.test_affected_project)
+        actions_menu.add_command(label="Benchmarks", command=self.show_benchmarks)
         actions_menu.add_command(label="Introspection", command=self.show_introspection)
         actions_menu.add_command(label="Install", command=self.install_project)
+        actions_menu.add_command(
+            label="Incremental Install", command=lambda: self.install_incremental_project(False)
+        )
+        actions_menu.add_command(
+            label="Incremental Install (Dry Run)",
+            command=lambda: self.install_incremental_project(True),
+        )
+        actions_menu.add_command(label="Run Program", command=self.run_program)
+        actions_menu.add_command(label="Dist", command=self.dist_project)
         actions_menu.add_command(label="Init", command=self.init_project)
         actions_menu.add_command(label="Subprojects", command=self.manage_subprojects)
+        actions_menu.add_command(label="Workspace", command=self.show_workspace)
         menubar.add_cascade(label="Actions", menu=actions_menu)
 
         support_menu = tk.Menu(menubar, tearoff=0)
@@ -852,27 +1944,102 @@ class MesonBuildGUI:
         self.apply_theme()
 
     def apply_theme(self):
-        if self.theme == "light":
-            self.root.configure(bg="white")
-            self.source_dir_label.configure(background="white", foreground="black")
-            self.build_dir_label.configure(background="white", foreground="black")
-            self.terminal.configure(background="black", foreground="white")
-            self.style.configure("Blue.TButton", background="white", foreground="black")
-        elif self.theme == "dark":
-            self.root.configure(bg="black")
-            self.source_dir_label.configure(background="black", foreground="light blue")
-            self.build_dir_label.configure(background="black", foreground="light blue")
-            self.terminal.configure(background="black", foreground="light blue")
-            self.style.configure("Blue.TButton", background="black", foreground="blue")
-        elif self.theme == "meson":
-            self.root.configure(bg="dark gray")
-            self.source_dir_label.configure(background="dark gray", foreground="black")
-            self.build_dir_label.configure(background="dark gray", foreground="black")
-            self.terminal.configure(background="black", foreground="white")
-            self.style.configure(
-                "Blue.TButton", background="#ADD8E6", foreground="black"
+        self.themes.use(self.theme)
+        palette = self.themes.palette
+        self.terminal.configure(
+            background=palette["terminal_background"], foreground=palette["terminal_foreground"]
+        )
+
+    def toggle_adaptive_parallelism(self):
+        enabled = self.adaptive_parallelism_var.get()
+        self.meson_build.adaptive_parallelism = enabled
+        self.config["Settings"]["parallelism"] = "adaptive" if enabled else "default"
+        self.save_settings()
+
+    def toggle_build_cache(self):
+        enabled = self.build_cache_var.get()
+        self.meson_build.build_cache = BuildDirCache() if enabled else None
+        self.config["Settings"]["build_cache"] = "yes" if enabled else "no"
+        self.save_settings()
+
+    def toggle_tmpfs(self):
+        enabled = self.tmpfs_var.get()
+        staging = TmpfsStaging() if enabled else None
+        if staging is not None and staging.root is None:
+            tk.messagebox.showerror("Error", "No writable tmpfs (such as /dev/shm) is available.")
+            self.tmpfs_var.set(False)
+            return
+        self.meson_build.tmpfs = staging
+        self.config["Settings"]["tmpfs"] = "yes" if enabled else "no"
+        self.save_settings()
+        if enabled:
+            self.update_terminal(
+                "New build directories will be set up on tmpfs; existing ones stay where they are.\n"
+            )
+
+    def open_history(self):
+        # A locked or unwritable cache database turns history off instead of
+        # keeping the GUI from starting.
+        try:
+            return RunHistory()
+        except (sqlite3.Error, OSError) as e:
+            self.update_terminal(f"Run history is disabled: {e}\n")
+            return None
+
+    def toggle_history(self):
+        enabled = self.history_var.get()
+        self.meson_build.history = self.open_history() if enabled else None
+        self.config["Settings"]["history"] = "yes" if enabled else "no"
+        self.save_settings()
+
+    def toggle_snapshots(self):
+        enabled = self.snapshots_var.get()
+        self.meson_build.snapshot_before_configure = enabled
+        self.config["Settings"]["snapshots"] = "yes" if enabled else "no"
+        self.save_settings()
+
+    def show_snapshots(self):
+        try:
+            build_dir = self.build_dir_entry.get()
+            if not self.validate_directory(build_dir):
+                return
+            self.meson_build.build_dir = build_dir
+            SnapshotsWindow(self.root, self.meson_build, self.update_terminal)
+        except Exception as e:
+            tk.messagebox.showerror("Error", str(e))
+
+    def create_event_stream(self):
+        # Targets default to the user cache dir; "events_target" may also be
+        # unix:<path> or tcp:<host>:<port>.
+        metrics = MetricsFile(self.config.get("Settings", "metrics_file", fallback=None) or None)
+        return EventStream(self.config.get("Settings", "events_target", fallback=None) or None, metrics)
+
+    def toggle_telemetry(self):
+        enabled = self.telemetry_var.get()
+        if self.meson_build.events is not None:
+            self.meson_build.events.close()
+        self.meson_build.events = self.create_event_stream() if enabled else None
+        self.config["Settings"]["telemetry"] = "yes" if enabled else "no"
+        self.save_settings()
+        if enabled:
+            self.update_terminal(
+                f"Writing job events to {self.meson_build.events.target} and metrics to "
+                f"{self.meson_build.events.metrics.path}.\n"
             )
 
+    def show_history(self):
+        try:
+            HistoryWindow(self.root, self.meson_build.history or RunHistory(), self.build_dir_entry.get())
+        except Exception as e:
+            tk.messagebox.showerror("Error", str(e))
+
+    def show_build_cache_report(self):
+        try:
+            cache = self.meson_build.build_cache or BuildDirCache()
+            self.update_terminal(cache.report() + "\n")
+        except Exception as e:
+            tk.messagebox.showerror("Error", str(e))
+
     def browse_source_dir(self):
         try:
             directory = tk.filedialog.askdirectory()
@@ -900,14 +2067,109 @@ class MesonBuildGUI:
         return True
 
     def update_terminal(self, message):
+        if isinstance(message, CommandResult):
+            message = message.output
+        if isinstance(message, CommandOutput):
+            # Only the tail of a long log goes into the widget; the rest stays spooled.
+            message = message.display(TERMINAL_OUTPUT_LINES)
         self.terminal.configure(state=tk.NORMAL)
         self.terminal.insert(tk.END, message, "custom")
         self.terminal.yview(tk.END)
         self.terminal.configure(state=tk.DISABLED)
 
+    def show_resource_summary(self, result):
+        if result.resources is not None:
+            self.update_terminal(result.resources.format() + "\n")
+
+    def save_last_output(self):
+        try:
+            output = self.meson_build.last_output
+            if output is None:
+                tk.messagebox.showinfo("Save Last Output", "No build output to save yet.")
+                return
+            path = filedialog.asksaveasfilename(
+                title="Save Last Output", defaultextension=".log", initialfile="meson-output.log"
+            )
+            if path:
+                output.save(path)
+                self.update_terminal(f"Saved {format_bytes(len(output))} of output to {path}\n")
+        except Exception as e:
+            tk.messagebox.showerror("Error", str(e))
+
+    def coalesced(self, action, build_dir, method, **arguments):
+        # A second click while the same method runs with the same arguments for
+        # this build dir attaches to the running job instead of launching a
+        # duplicate meson process; anything else gets its own run.
+        def on_join():
+            self.update_terminal(f"{action} is already running for {build_dir}; attaching to it.\n")
+        key = (method.__name__, os.path.abspath(build_dir), tuple(sorted(arguments.items())))
+        return self.requests.run(key, lambda: method(**arguments), on_join)
+
+    def show_tmpfs_sync(self):
+        if self.meson_build.last_sync is not None:
+            copied, size = self.meson_build.last_sync
+            self.update_terminal(
+                f"Synced {copied} artifacts ({format_bytes(size)}) from tmpfs to "
+                f"{self.meson_build.configured_build_dir}.\n"
+            )
+
+    def show_timing_regressions(self):
+        report = format_regressions(self.meson_build.last_regressions)
+        if report:
+            self.update_terminal(report)
+
+    def show_resource_monitor(self):
+        try:
+            if not self.meson_build.sample_resources:
+                tk.messagebox.showinfo(
+                    "Resource Monitor", "Resource sampling needs a /proc filesystem."
+                )
+                return
+            ResourceMonitor(self.root, self.meson_build)
+        except Exception as e:
+            tk.messagebox.showerror("Error", str(e))
+
+    def show_benchmarks(self):
+        try:
+            build_dir = self.build_dir_entry.get()
+            if not self.validate_directory(build_dir):
+                return
+            self.meson_build.build_dir = build_dir
+            BenchmarkWindow(self.root, self.meson_build, self.update_terminal)
+        except Exception as e:
+            tk.messagebox.showerror("Error", str(e))
+
+    def show_fanout(self):
+        try:
+            build_dir = self.build_dir_entry.get()
+            if not self.validate_directory(build_dir):
+                return
+            self.meson_build.build_dir = build_dir
+            FanoutWindow(self.root, self.meson_build)
+        except Exception as e:
+            tk.messagebox.showerror("Error", str(e))
+
+    def show_advisor(self):
+        try:
+            build_dir = self.build_dir_entry.get()
+            if not self.validate_directory(build_dir):
+                return
+            self.meson_build.build_dir = build_dir
+            AdvisorWindow(self.root, self.meson_build, self.update_terminal)
+        except Exception as e:
+            tk.messagebox.showerror("Error", str(e))
+
+    def show_workspace(self):
+        try:
+            WorkspaceWindow(self.root, Workspace(), self.update_terminal)
+        except ValueError as e:
+            tk.messagebox.showerror("Error", f"Invalid workspace file: {str(e)}")
+        except Exception as e:
+            tk.messagebox.showerror("Error", str(e))
+
     def setup_project(self):
         try:
-            result = SetupDialog(self.root, self.theme).result
+            result = self.dialog(SetupDialog).show()
             if result is None:
                 return
             build_dir, other_options = result
@@ -923,34 +2185,73 @@ class MesonBuildGUI:
         try:
             self.meson_build.build_dir = build_dir
             self.update_terminal(f"Setting up the project in {build_dir}...\n")
-            output = self.meson_build.setup(other_options)
-            self.update_terminal(output)
+            result = self.meson_build.setup(other_options)
+            self.update_terminal(result)
+            self.show_resource_summary(result)
         except Exception as e:
             self.update_terminal(f"Error: {str(e)}\n")
 
-    def configure_project(self):
+    def profile_setup_project(self):
         try:
-            result = ConfigureDialog(self.root, self.theme).result
+            result = self.dialog(SetupDialog).show()
             if result is None:
                 return
             build_dir, other_options = result
 
             if build_dir and self.validate_directory(build_dir):
                 threading.Thread(
-                    target=self.run_configure_thread, args=(build_dir, other_options)
+                    target=self.run_profile_setup_thread, args=(build_dir, other_options)
                 ).start()
         except Exception as e:
             tk.messagebox.showerror("Error", str(e))
 
-    def run_configure_thread(self, build_dir, other_options):
+    def run_profile_setup_thread(self, build_dir, other_options):
         try:
             self.meson_build.build_dir = build_dir
-            self.update_terminal(f"Configuring the project in {build_dir}...\n")
-            output = self.meson_build.configure(other_options)
+            self.update_terminal(f"Profiling meson setup in {build_dir}...\n")
+            output = self.meson_build.profile_setup(other_options)
             self.update_terminal(output)
         except Exception as e:
             self.update_terminal(f"Error: {str(e)}\n")
 
+    def configure_project(self):
+        try:
+            build_dir = self.build_dir_entry.get()
+            if not self.validate_directory(build_dir):
+                return
+            self.meson_build.build_dir = build_dir
+            options = load_build_options(self.meson_build.build_dir)
+            if not options:
+                tk.messagebox.showerror(
+                    "Error", f"'{build_dir}' is not a configured build directory; run Setup first."
+                )
+                return
+            result = self.dialog(ConfigureDialog).show(build_dir, options)
+            if result is None:
+                return
+            build_dir, changed_options = result
+            if not changed_options:
+                self.update_terminal("No build options changed; nothing to reconfigure.\n")
+                return
+
+            threading.Thread(
+                target=self.run_configure_thread, args=(build_dir, changed_options)
+            ).start()
+        except Exception as e:
+            tk.messagebox.showerror("Error", str(e))
+
+    def run_configure_thread(self, build_dir, changed_options):
+        try:
+            self.meson_build.build_dir = build_dir
+            self.update_terminal(
+                f"Configuring the project in {build_dir}: {' '.join(changed_options)}\n"
+            )
+            result = self.meson_build.configure(changed_options)
+            self.update_terminal(result)
+            self.show_resource_summary(result)
+        except Exception as e:
+            self.update_terminal(f"Error: {str(e)}\n")
+
     def compile_project(self):
         try:
             build_dir = self.build_dir_entry.get()
@@ -964,8 +2265,62 @@ class MesonBuildGUI:
             build_dir = self.build_dir_entry.get()
             self.meson_build.build_dir = build_dir
             self.update_terminal(f"Compiling the project in {build_dir}...\n")
-            output = self.meson_build.compile()
-            self.update_terminal(output)
+            result, shared = self.coalesced("Compile", build_dir, self.meson_build.compile)
+            if shared:
+                return
+            plan = self.meson_build.last_plan
+            if plan is not None and not plan.up_to_date:
+                self.update_terminal(plan.format() + "\n")
+            if self.meson_build.adaptive_parallelism and self.meson_build.last_parallelism:
+                self.update_terminal(self.meson_build.last_parallelism.format() + "\n")
+            self.update_terminal(result)
+            self.show_resource_summary(result)
+            self.show_timing_regressions()
+            self.show_tmpfs_sync()
+        except Exception as e:
+            self.update_terminal(f"Error: {str(e)}\n")
+
+    def dirty_check_project(self):
+        try:
+            build_dir = self.build_dir_entry.get()
+            if self.validate_directory(build_dir):
+                threading.Thread(target=self.run_dirty_check_thread).start()
+        except Exception as e:
+            tk.messagebox.showerror("Error", str(e))
+
+    def run_dirty_check_thread(self):
+        try:
+            build_dir = self.build_dir_entry.get()
+            self.meson_build.build_dir = build_dir
+            plan = self.meson_build.dirty_check()
+            if plan is None:
+                self.update_terminal(f"Could not get a dry-run plan from ninja for {build_dir}.\n")
+            else:
+                self.update_terminal(f"{build_dir}: {plan.format(limit=20)}\n")
+        except Exception as e:
+            self.update_terminal(f"Error: {str(e)}\n")
+
+    def compile_affected_project(self):
+        try:
+            build_dir = self.build_dir_entry.get()
+            if self.validate_directory(build_dir):
+                threading.Thread(target=self.run_compile_affected_thread).start()
+        except Exception as e:
+            tk.messagebox.showerror("Error", str(e))
+
+    def run_compile_affected_thread(self):
+        try:
+            build_dir = self.build_dir_entry.get()
+            self.meson_build.build_dir = build_dir
+            self.meson_build.source_dir = self.source_dir_entry.get()
+            self.update_terminal(f"Compiling targets affected by changes in {build_dir}...\n")
+            result, shared = self.coalesced("Compile Affected", build_dir, self.meson_build.compile_affected)
+            if shared:
+                return
+            self.update_terminal(result)
+            self.show_resource_summary(result)
+            self.show_timing_regressions()
+            self.show_tmpfs_sync()
         except Exception as e:
             self.update_terminal(f"Error: {str(e)}\n")
 
@@ -982,8 +2337,33 @@ class MesonBuildGUI:
             build_dir = self.build_dir_entry.get()
             self.meson_build.build_dir = build_dir
             self.update_terminal(f"Testing the project in {build_dir}...\n")
-            output = self.meson_build.test()
-            self.update_terminal(output)
+            result, shared = self.coalesced("Test", build_dir, self.meson_build.test)
+            if shared:
+                return
+            self.update_terminal(result)
+            self.show_resource_summary(result)
+        except Exception as e:
+            self.update_terminal(f"Error: {str(e)}\n")
+
+    def test_affected_project(self):
+        try:
+            build_dir = self.build_dir_entry.get()
+            if self.validate_directory(build_dir):
+                threading.Thread(target=self.run_test_affected_thread).start()
+        except Exception as e:
+            tk.messagebox.showerror("Error", str(e))
+
+    def run_test_affected_thread(self):
+        try:
+            build_dir = self.build_dir_entry.get()
+            self.meson_build.build_dir = build_dir
+            self.meson_build.source_dir = self.source_dir_entry.get()
+            self.update_terminal(f"Testing what changed since the last green run in {build_dir}...\n")
+            result, shared = self.coalesced("Test Affected", build_dir, self.meson_build.test_affected)
+            if shared:
+                return
+            self.update_terminal(result)
+            self.show_resource_summary(result)
         except Exception as e:
             self.update_terminal(f"Error: {str(e)}\n")
 
@@ -1000,11 +2380,96 @@ class MesonBuildGUI:
             build_dir = self.build_dir_entry.get()
             self.meson_build.build_dir = build_dir
             self.update_terminal(f"Installing the project in {build_dir}...\n")
-            output = self.meson_build.install()
+            result, shared = self.coalesced("Install", build_dir, self.meson_build.install)
+            if shared:
+                return
+            self.update_terminal(result)
+            self.show_resource_summary(result)
+        except Exception as e:
+            self.update_terminal(f"Error: {str(e)}\n")
+
+    def install_incremental_project(self, dry_run):
+        try:
+            build_dir = self.build_dir_entry.get()
+            if self.validate_directory(build_dir):
+                threading.Thread(
+                    target=self.run_install_incremental_thread, args=(dry_run,)
+                ).start()
+        except Exception as e:
+            tk.messagebox.showerror("Error", str(e))
+
+    def run_install_incremental_thread(self, dry_run):
+        try:
+            build_dir = self.build_dir_entry.get()
+            self.meson_build.build_dir = build_dir
+            self.update_terminal(f"Installing changed files from {build_dir}...\n")
+            output, shared = self.coalesced(
+                "Incremental Install",
+                build_dir,
+                self.meson_build.install_incremental,
+                dry_run=dry_run,
+                use_hash=self.config.getboolean("Settings", "install_hash", fallback=False),
+            )
+            if shared:
+                return
             self.update_terminal(output)
         except Exception as e:
             self.update_terminal(f"Error: {str(e)}\n")
 
+    def run_program(self):
+        try:
+            build_dir = self.build_dir_entry.get()
+            if not self.validate_directory(build_dir):
+                return
+            command = simpledialog.askstring(
+                "Run Program", "Built program and arguments:", parent=self.root
+            )
+            if command and command.split():
+                threading.Thread(target=self.run_program_thread, args=(command,)).start()
+        except Exception as e:
+            tk.messagebox.showerror("Error", str(e))
+
+    def run_program_thread(self, command):
+        try:
+            self.meson_build.build_dir = self.build_dir_entry.get()
+            program, *args = command.split()
+            self.update_terminal(f"Running {command} in the devenv environment...\n")
+            result = self.meson_build.run_program(program, args, on_output=self.update_terminal)
+            self.update_terminal(f"{program} exited with status {result.returncode}\n")
+        except Exception as e:
+            self.update_terminal(f"Error: {str(e)}\n")
+
+    def dist_project(self):
+        try:
+            build_dir = self.build_dir_entry.get()
+            if self.validate_directory(build_dir):
+                threading.Thread(target=self.run_dist_thread).start()
+        except Exception as e:
+            tk.messagebox.showerror("Error", str(e))
+
+    def run_dist_thread(self):
+        try:
+            build_dir = self.build_dir_entry.get()
+            self.meson_build.build_dir = build_dir
+            self.meson_build.source_dir = self.source_dir_entry.get()
+            self.update_terminal(f"Creating release archives from {build_dir}...\n")
+            formats = self.config.get("Settings", "dist_formats", fallback="xztar,gztar,zip")
+            result, shared = self.coalesced(
+                "Dist",
+                build_dir,
+                self.meson_build.dist_parallel,
+                formats=tuple(item.strip() for item in formats.split(",") if item.strip()),
+                reuse_tested=self.config.getboolean("Settings", "dist_reuse_tested", fallback=True),
+                include_subprojects=self.config.getboolean("Settings", "dist_include_subprojects", fallback=False),
+                on_output=self.update_terminal,
+            )
+            if shared:
+                return
+            self.update_terminal(result)
+            self.show_resource_summary(result)
+        except Exception as e:
+            self.update_terminal(f"Error: {str(e)}\n")
+
     def show_version(self):
         try:
             threading.Thread(target=self.run_version_thread).start()
@@ -1014,11 +2479,19 @@ class MesonBuildGUI:
     def run_version_thread(self):
         try:
             self.update_terminal("Meson Version:\n")
-            output = self.meson_build.run_command(["meson", "--version"])
-            self.update_terminal(output)
+            result, _ = self.requests.cached(
+                ("version",), self.run_version_command, VERSION_CACHE_SECONDS, keep=lambda result: result.ok
+            )
+            self.update_terminal(result)
         except Exception as e:
             self.update_terminal(f"Error: {str(e)}\n")
 
+    def run_version_command(self):
+        return self.meson_build.run_command(["meson", "--version"])
+
+    def run_introspect_command(self):
+        return self.meson_build.introspect()
+
     def show_introspection(self):
         try:
             threading.Thread(target=self.run_introspection_thread).start()
@@ -1030,8 +2503,13 @@ class MesonBuildGUI:
             build_dir = self.build_dir_entry.get()
             self.meson_build.build_dir = build_dir
             self.update_terminal(f"Introspecting build directory {build_dir}...\n")
-            output = self.meson_build.introspect()
-            self.update_terminal(output)
+            # Keyed by meson-info.json's mtime, so a reconfigure invalidates the entry.
+            key = ("introspect", os.path.abspath(build_dir), intro_stamp(build_dir))
+            result, _ = self.requests.cached(
+                key, self.run_introspect_command, INTROSPECTION_CACHE_SECONDS,
+                keep=lambda result: result.ok,
+            )
+            self.update_terminal(result)
         except Exception as e:
             self.update_terminal(f"Error: {str(e)}\n")
 
@@ -1066,13 +2544,13 @@ class MesonBuildGUI:
 
     def show_tutorial(self):
         try:
-            TutorialDialog(self.root, self.theme)
+            self.dialog(TutorialDialog).show()
         except Exception as e:
             tk.messagebox.showerror("Error", str(e))
 
     def init_project(self):
         try:
-            result = InitDialog(self.root, self.theme).result
+            result = self.dialog(InitDialog).show()
             if result is None:
                 return
             project_name, language, other_options = result
@@ -1093,7 +2571,7 @@ class MesonBuildGUI:
 
     def manage_subprojects(self):
         try:
-            SubprojectsDialog(self.root, self.theme)
+            self.dialog(SubprojectsDialog).show()
         except Exception as e:
             tk.messagebox.showerror("Error", str(e))
 
@@ -0,0 +1,242 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+import functools
+import hashlib
+import os
+import shutil
+import subprocess
+import time
+
+from code.ninjafiles import restamp_ninja_deps, restamp_ninja_log
+from code.sampler import format_bytes
+from code.statedir import STATE_DIR_NAME, load_json, save_json, user_cache_dir
+
+TOOLCHAIN_ENV = ("CC", "CXX", "CFLAGS", "CXXFLAGS", "LDFLAGS", "PKG_CONFIG_PATH")
+TOOLCHAIN_PROGRAMS = ("meson", "ninja", "cc", "c++")
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def is_build_dir(path):
+    return os.path.isdir(os.path.join(path, "meson-private"))
+
+
+def walk_sources(source_dir, build_dir):
+    build_dir = os.path.abspath(build_dir)
+    for root, dirs, files in os.walk(source_dir):
+        dirs[:] = sorted(
+            name for name in dirs
+            if not name.startswith(".")
+            and os.path.abspath(os.path.join(root, name)) != build_dir
+            and not is_build_dir(os.path.join(root, name))
+        )
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            if os.path.isfile(path):
+                yield os.path.relpath(path, source_dir)
+
+
+@functools.lru_cache(maxsize=None)
+def probe_toolchain(environment):
+    # Running every compiler with --version takes a noticeable moment, so the
+    # answer is kept for the life of the process, per toolchain environment.
+    environment = dict(environment)
+    identity = [f"{name}={environment[name]}" for name in TOOLCHAIN_ENV]
+    programs = list(TOOLCHAIN_PROGRAMS)
+    programs.extend(environment[name].split()[0] for name in ("CC", "CXX") if environment[name].split())
+    for program in programs:
+        path = shutil.which(program, path=environment["PATH"] or None)
+        if path is None:
+            continue
+        try:
+            version = subprocess.run(
+                [path, "--version"], capture_output=True, text=True, timeout=30
+            ).stdout.strip().splitlines()
+        except (OSError, subprocess.SubprocessError):
+            version = []
+        identity.append(f"{program}={os.path.realpath(path)}:{version[0] if version else ''}")
+    return tuple(identity)
+
+
+def restamp_build_tree(build_dir, mtime_ns):
+    # The key proves the sources are byte-identical to the stored ones, but a
+    # fresh checkout gives them new mtimes. Every restored file, and the
+    # mtimes ninja recorded for them, moves to one time no older than any
+    # source, so ninja sees the tree as up to date. Sources are left alone.
+    for root, _, files in os.walk(build_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            if not os.path.islink(path):
+                os.utime(path, ns=(mtime_ns, mtime_ns))
+    restamp_ninja_log(build_dir, mtime_ns)
+    restamp_ninja_deps(build_dir, mtime_ns)
+
+
+class BuildDirCache:
+    def __init__(self, cache_dir=None, max_size=10 << 30, max_age_days=14):
+        self.cache_dir = cache_dir or os.path.join(user_cache_dir(), "builddirs")
+        self.max_size = max_size
+        self.max_age = max_age_days * 86400
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @property
+    def index_path(self):
+        return os.path.join(self.cache_dir, "index.json")
+
+    def load_index(self):
+        index = load_json(self.index_path, {})
+        index.setdefault("entries", {})
+        index.setdefault("stats", {"hits": 0, "misses": 0, "stores": 0, "evictions": 0})
+        return index
+
+    def source_manifest(self, source_dir, build_dir):
+        # Digests are memoised by size and mtime so unchanged trees hash quickly.
+        memo_name = hashlib.sha256(os.path.abspath(source_dir).encode()).hexdigest()
+        memo_path = os.path.join(self.cache_dir, f"tree-{memo_name}.json")
+        memo = load_json(memo_path, {})
+        manifest = {}
+        for relpath in walk_sources(source_dir, build_dir):
+            stat = os.stat(os.path.join(source_dir, relpath))
+            cached = memo.get(relpath)
+            if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+                digest = cached[2]
+            else:
+                digest = hash_file(os.path.join(source_dir, relpath))
+            manifest[relpath] = [stat.st_size, stat.st_mtime_ns, digest]
+        save_json(memo_path, manifest)
+        return manifest
+
+    def newest_source_mtime(self, source_dir, build_dir):
+        newest = time.time_ns()
+        for relpath in walk_sources(source_dir, build_dir):
+            newest = max(newest, os.stat(os.path.join(source_dir, relpath)).st_mtime_ns)
+        return newest
+
+    def toolchain_identity(self):
+        names = TOOLCHAIN_ENV + ("PATH",)
+        return list(probe_toolchain(tuple((name, os.environ.get(name, "")) for name in names)))
+
+    def key_for(self, source_dir, build_dir, options, manifest=None):
+        manifest = manifest if manifest is not None else self.source_manifest(source_dir, build_dir)
+        digest = hashlib.sha256()
+        # Checkouts of the same tree at different paths share a key; only where
+        # the build dir sits relative to the sources matters. A tree restored
+        # elsewhere is relocated with a reconfigure (see MesonBuild.setup).
+        digest.update(os.path.relpath(os.path.abspath(build_dir), os.path.abspath(source_dir)).encode() + b"\0")
+        digest.update(" ".join(options.split()).encode() + b"\0")
+        for line in self.toolchain_identity():
+            digest.update(line.encode() + b"\0")
+        for relpath, (_, _, file_digest) in sorted(manifest.items()):
+            digest.update(f"{relpath}\0{file_digest}\0".encode())
+        return digest.hexdigest()
+
+    def entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def restore(self, key, source_dir, build_dir):
+        # Returns the index entry, which names the dirs the tree was built in,
+        # or None on a miss.
+        index = self.load_index()
+        entry = index["entries"].get(key)
+        if entry is None or not os.path.isdir(os.path.join(self.entry_dir(key), "tree")):
+            index["stats"]["misses"] += 1
+            save_json(self.index_path, index)
+            return None
+        if os.path.exists(build_dir):
+            shutil.rmtree(build_dir)
+        shutil.copytree(os.path.join(self.entry_dir(key), "tree"), build_dir, symlinks=True)
+        restamp_build_tree(build_dir, self.newest_source_mtime(source_dir, build_dir))
+        entry["last_used"] = time.time()
+        index["stats"]["hits"] += 1
+        save_json(self.index_path, index)
+        return entry
+
+    def contains(self, key):
+        return key in self.load_index()["entries"]
+
+    def store(self, key, source_dir, build_dir, manifest=None):
+        manifest = manifest if manifest is not None else self.source_manifest(source_dir, build_dir)
+        entry_dir = self.entry_dir(key)
+        temp_dir = f"{entry_dir}.tmp"
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        os.makedirs(temp_dir)
+        shutil.copytree(
+            build_dir,
+            os.path.join(temp_dir, "tree"),
+            symlinks=True,
+            ignore=shutil.ignore_patterns(STATE_DIR_NAME),
+        )
+        save_json(os.path.join(temp_dir, "sources.json"), manifest)
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        os.replace(temp_dir, entry_dir)
+
+        index = self.load_index()
+        now = time.time()
+        index["entries"][key] = {
+            "source_dir": os.path.abspath(source_dir),
+            "build_dir": os.path.abspath(build_dir),
+            "size": self.tree_size(entry_dir),
+            "created": now,
+            "last_used": now,
+        }
+        index["stats"]["stores"] += 1
+        save_json(self.index_path, index)
+        self.evict()
+
+    def tree_size(self, path):
+        total = 0
+        for root, _, files in os.walk(path):
+            for name in files:
+                try:
+                    total += os.lstat(os.path.join(root, name)).st_size
+                except OSError:
+                    pass
+        return total
+
+    def evict(self, now=None):
+        now = time.time() if now is None else now
+        index = self.load_index()
+        entries = index["entries"]
+        doomed = [key for key, entry in entries.items() if now - entry["last_used"] > self.max_age]
+        remaining = sorted(
+            (key for key in entries if key not in doomed), key=lambda key: entries[key]["last_used"]
+        )
+        total = sum(entries[key]["size"] for key in remaining)
+        while remaining and total > self.max_size:
+            key = remaining.pop(0)
+            total -= entries[key]["size"]
+            doomed.append(key)
+        for key in doomed:
+            shutil.rmtree(self.entry_dir(key), ignore_errors=True)
+            del entries[key]
+        index["stats"]["evictions"] += len(doomed)
+        save_json(self.index_path, index)
+        return doomed
+
+    def report(self):
+        index = self.load_index()
+        stats = index["stats"]
+        lookups = stats["hits"] + stats["misses"]
+        ratio = 100.0 * stats["hits"] / lookups if lookups else 0.0
+        size = sum(entry["size"] for entry in index["entries"].values())
+        return (
+            f"Build cache: {len(index['entries'])} entries, {format_bytes(size)} "
+            f"of {format_bytes(self.max_size)}; {stats['hits']} hits, {stats['misses']} misses "
+            f"({ratio:.0f}% hit rate), {stats['stores']} stores, {stats['evictions']} evictions"
+        )
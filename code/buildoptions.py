@@ -0,0 +1,84 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+from code.affected import load_intro
+
+SECTION_ORDER = ("user", "core", "base", "compiler", "directory", "backend", "test")
+
+
+def load_build_options(build_dir):
+    # Reading the introspection file avoids starting meson just to fill a dialog.
+    return load_intro(build_dir, "buildoptions")
+
+
+def option_key(option):
+    name = option["name"]
+    if option.get("machine") == "build" and not name.startswith("build."):
+        return f"build.{name}"
+    return name
+
+
+def display_value(option):
+    value = option["value"]
+    if option["name"].endswith("install_umask") and isinstance(value, int):
+        return f"{value:04o}"
+    if option["type"] == "array":
+        return ",".join(str(item) for item in value)
+    return value
+
+
+def parse_value(option, text):
+    kind = option["type"]
+    if kind == "boolean":
+        return bool(text)
+    if kind == "integer" and not option["name"].endswith("install_umask"):
+        try:
+            return int(str(text).strip())
+        except ValueError:
+            raise ValueError(f"{option_key(option)} expects an integer, got '{text}'")
+    if kind in ("combo", "feature") and option.get("choices") and text not in option["choices"]:
+        raise ValueError(f"{option_key(option)} must be one of {', '.join(option['choices'])}")
+    if kind == "array":
+        items = [item.strip() for item in str(text).split(",") if item.strip()]
+        invalid = [item for item in items if option.get("choices") and item not in option["choices"]]
+        if invalid:
+            raise ValueError(f"{option_key(option)} does not accept {', '.join(invalid)}")
+        return items
+    return str(text)
+
+
+def format_argument(option, value):
+    if option["type"] == "boolean":
+        value = "true" if value else "false"
+    elif option["type"] == "array":
+        value = ",".join(value)
+    return f"-D{option_key(option)}={value}"
+
+
+def changed_arguments(options, edited):
+    arguments = []
+    for option in options:
+        key = option_key(option)
+        if key not in edited:
+            continue
+        value = parse_value(option, edited[key])
+        if value != parse_value(option, display_value(option)):
+            arguments.append(format_argument(option, value))
+    return arguments
+
+
+def options_by_section(options):
+    sections = {}
+    for option in options:
+        sections.setdefault(option["section"], []).append(option)
+    order = list(SECTION_ORDER) + sorted(set(sections) - set(SECTION_ORDER))
+    return [(section, sections[section]) for section in order if section in sections]
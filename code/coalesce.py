@@ -0,0 +1,70 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+import threading
+import time
+
+
+class PendingRequest:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.joined = 0
+
+
+class RequestCoalescer:
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._cache = {}
+
+    def run(self, key, function, on_join=None):
+        # Returns (result, shared). A caller that finds the same request already
+        # running waits for it and gets its result instead of starting another.
+        with self._lock:
+            request = self._pending.get(key)
+            owner = request is None
+            if owner:
+                request = self._pending[key] = PendingRequest()
+            else:
+                request.joined += 1
+        if not owner:
+            if on_join is not None:
+                on_join()
+            request.done.wait()
+            if request.error is not None:
+                raise request.error
+            return request.result, True
+        try:
+            request.result = function()
+        except Exception as e:
+            request.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._pending[key]
+            request.done.set()
+        return request.result, False
+
+    def cached(self, key, function, ttl, keep=None):
+        now = self.clock()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1], True
+        result, shared = self.run(key, function)
+        if not shared and (keep is None or keep(result)):
+            with self._lock:
+                self._cache[key] = (self.clock() + ttl, result)
+        return result, shared
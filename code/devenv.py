@@ -0,0 +1,139 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+from code.affected import load_intro
+from code.statedir import build_state_dir, load_json, save_json
+
+CACHE_FILE = "devenv.json"
+CACHE_VERSION = 2
+# One NAME="value" line per variable "meson devenv --dump" defines.
+DUMP_LINE = re.compile(r'^([A-Za-z_][A-Za-z0-9_]*)="(.*)"$')
+DUMP_SCRIPT = "import json, os, sys; sys.stdout.write(json.dumps(dict(os.environ)))"
+STAMP_FILES = (
+    os.path.join("meson-private", "coredata.dat"),
+    os.path.join("meson-info", "meson-info.json"),
+)
+
+
+class DevEnvironment:
+    def __init__(self, meson_build):
+        self.meson_build = meson_build
+
+    @property
+    def build_dir(self):
+        return self.meson_build.build_dir
+
+    @property
+    def cache_path(self):
+        return os.path.join(build_state_dir(self.build_dir), CACHE_FILE)
+
+    def stamp(self):
+        # Both files are rewritten whenever meson reconfigures the build dir.
+        stamp = []
+        for name in STAMP_FILES:
+            try:
+                stamp.append(os.stat(os.path.join(self.build_dir, name)).st_mtime_ns)
+            except OSError:
+                stamp.append(None)
+        return stamp
+
+    def defined_variables(self):
+        # {name: "set" | "prepend" | "append"} for what devenv defines, or None
+        # when this meson has no --dump. The dumped values are not shell-quoted,
+        # so only the names and where "$NAME" appears are read from them.
+        result = self.meson_build.run_command(["meson", "devenv", "-C", self.build_dir, "--dump"])
+        if not result.ok:
+            return None
+        modes = {}
+        for line in str(result.output).splitlines():
+            match = DUMP_LINE.match(line)
+            if match is None:
+                continue
+            key, value = match.groups()
+            if value.endswith(f"{os.pathsep}${key}"):
+                modes[key] = "prepend"
+            elif value.startswith(f"${key}{os.pathsep}"):
+                modes[key] = "append"
+            else:
+                modes[key] = "set"
+        return modes
+
+    def capture(self):
+        modes = self.defined_variables()
+        result = self.meson_build.run_command(
+            ["meson", "devenv", "-C", self.build_dir, sys.executable, "-c", DUMP_SCRIPT]
+        )
+        if not result.ok:
+            raise RuntimeError(str(result.output))
+        output = str(result.output)
+        environment = json.loads(output[output.index("{"):])
+        # Path-like variables are stored as what devenv added, so later PATH
+        # changes in the calling shell are still honoured. Variables devenv
+        # does not define are left to the shell, even if they differ now.
+        changes = {"set": {}, "prepend": {}, "append": {}}
+        for key, value in environment.items():
+            current = os.environ.get(key)
+            mode = modes.get(key) if modes is not None else None
+            if (modes is not None and key not in modes) or (modes is None and current == value):
+                continue
+            if current and value.endswith(os.pathsep + current) and mode in (None, "prepend"):
+                changes["prepend"][key] = value[: -len(os.pathsep + current)]
+            elif current and value.startswith(current + os.pathsep) and mode in (None, "append"):
+                changes["append"][key] = value[len(current + os.pathsep):]
+            elif not current and mode in ("prepend", "append"):
+                changes[mode][key] = value
+            else:
+                changes["set"][key] = value
+        return changes
+
+    def changes(self):
+        stamp = self.stamp()
+        cached = load_json(self.cache_path, {})
+        if cached.get("stamp") == stamp and cached.get("version") == CACHE_VERSION:
+            return cached["env"]
+        changes = self.capture()
+        save_json(self.cache_path, {"version": CACHE_VERSION, "stamp": stamp, "env": changes})
+        return changes
+
+    def environment(self):
+        changes = self.changes()
+        environment = dict(os.environ)
+        environment.update(changes["set"])
+        # An empty entry in a search path means the working directory, so the
+        # separator is only added next to an existing value.
+        for key, prefix in changes["prepend"].items():
+            current = environment.get(key)
+            environment[key] = prefix + os.pathsep + current if current else prefix
+        for key, suffix in changes["append"].items():
+            current = environment.get(key)
+            environment[key] = current + os.pathsep + suffix if current else suffix
+        return environment
+
+    def resolve_program(self, program, environment):
+        if os.path.dirname(program):
+            return os.path.join(self.build_dir, program) if not os.path.isabs(program) else program
+        for target in load_intro(self.build_dir, "targets", []):
+            if target["name"] == program and target.get("type") == "executable":
+                return target["filename"][0]
+        return shutil.which(program, path=environment.get("PATH")) or program
+
+    def launch(self, program, args=(), **kwargs):
+        environment = self.environment()
+        command = [self.resolve_program(program, environment)] + list(args)
+        return subprocess.Popen(command, env=environment, **kwargs)
@@ -0,0 +1,97 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+import concurrent.futures
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+
+from code.affected import git_head, load_stamp
+from code.buildcache import hash_file
+
+ARCHIVE_EXTENSIONS = {
+    "xztar": ".tar.xz",
+    "gztar": ".tar.gz",
+    "bztar": ".tar.bz2",
+    "zip": ".zip",
+}
+
+
+def tested_build_is_current(build_dir, source_dir):
+    # meson dist archives HEAD, so a commit made since the green test run
+    # has not been tested even if nothing was recompiled.
+    tested = load_stamp(build_dir, "test")
+    compiled = load_stamp(build_dir, "compile")
+    if tested is None or (compiled is not None and tested["time"] < compiled["time"]):
+        return False
+    return tested.get("head") == git_head(source_dir)
+
+
+def write_checksum(path):
+    with open(f"{path}.sha256sum", "w") as handle:
+        handle.write(f"{hash_file(path)} *{os.path.basename(path)}\n")
+
+
+def make_archive(root_dir, base_dir, archive_format, output_base):
+    # Runs in a worker process; returns the archive path and its duration.
+    started = time.perf_counter()
+    path = shutil.make_archive(output_base, archive_format, root_dir=root_dir, base_dir=base_dir)
+    write_checksum(path)
+    return path, time.perf_counter() - started
+
+
+def newest_archive(dist_dir, archive_format):
+    extension = ARCHIVE_EXTENSIONS[archive_format]
+    candidates = [
+        os.path.join(dist_dir, name) for name in os.listdir(dist_dir) if name.endswith(extension)
+    ]
+    return max(candidates, key=os.path.getmtime) if candidates else None
+
+
+def repack_archives(primary, formats, on_progress=None):
+    timings = {}
+    outputs = []
+    if not formats:
+        return outputs, timings
+    dist_dir = os.path.dirname(primary)
+    name = os.path.basename(primary)
+    for extension in ARCHIVE_EXTENSIONS.values():
+        if name.endswith(extension):
+            name = name[: -len(extension)]
+
+    with tempfile.TemporaryDirectory(prefix="fossil-dist-") as scratch:
+        started = time.perf_counter()
+        if primary.endswith(".zip"):
+            shutil.unpack_archive(primary, scratch)
+        else:
+            with tarfile.open(primary) as archive:
+                if hasattr(tarfile, "data_filter"):
+                    archive.extractall(scratch, filter="data")
+                else:
+                    archive.extractall(scratch)
+        timings["extract"] = time.perf_counter() - started
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=len(formats)) as pool:
+            futures = {
+                pool.submit(make_archive, scratch, name, archive_format,
+                            os.path.join(dist_dir, name)): archive_format
+                for archive_format in formats
+            }
+            for future in concurrent.futures.as_completed(futures):
+                path, elapsed = future.result()
+                timings[f"archive {futures[future]}"] = elapsed
+                outputs.append(path)
+                if on_progress is not None:
+                    on_progress(f"Created {path} in {elapsed:.1f}s\n")
+    return outputs, timings
@@ -0,0 +1,227 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+import itertools
+import json
+import os
+import re
+import socket
+import threading
+import time
+
+from code.history import command_action
+from code.statedir import load_json, save_json, user_cache_dir
+
+EVENTS_FILE = "events.jsonl"
+METRICS_FILE = "fossil-builder.prom"
+METRICS_STATE_FILE = "metrics.json"
+DURATION_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600)
+PROGRESS = re.compile(r"^\[(\d+)/(\d+)\]")
+DIAGNOSTIC = re.compile(r":\d+(?::\d+)?: (?:fatal )?(warning|error):")
+
+
+def count_diagnostics(lines):
+    counts = {"warning": 0, "error": 0}
+    for line in lines:
+        match = DIAGNOSTIC.search(line)
+        if match:
+            counts[match.group(1)] += 1
+    return counts
+
+
+class EventStream:
+    # Writes one JSON object per line to a file, "unix:<path>" or
+    # "tcp:<host>:<port>". Telemetry is best effort: a dead listener or a full
+    # disk drops events instead of failing the build.
+    def __init__(self, target=None, metrics=None, clock=time.time, progress_interval=0.5):
+        self.target = target or os.path.join(user_cache_dir(), EVENTS_FILE)
+        self.metrics = metrics
+        self.clock = clock
+        self.progress_interval = progress_interval
+        self._lock = threading.Lock()
+        self._socket = None
+        self._ids = itertools.count(1)
+        self.session = f"{os.getpid()}-{int(clock())}"
+
+    def connect(self):
+        kind, _, address = self.target.partition(":")
+        if kind == "unix":
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            connection.settimeout(1)
+            connection.connect(address)
+            return connection
+        host, _, port = address.rpartition(":")
+        return socket.create_connection((host, int(port)), timeout=1)
+
+    def write(self, data):
+        if not self.target.startswith(("unix:", "tcp:")):
+            with open(self.target, "a", encoding="utf-8") as handle:
+                handle.write(data)
+            return
+        if self._socket is None:
+            self._socket = self.connect()
+        try:
+            self._socket.sendall(data.encode("utf-8"))
+        except OSError:
+            self._socket.close()
+            self._socket = None
+            raise
+
+    def emit(self, event, **fields):
+        record = {"event": event, "time": round(self.clock(), 3), "session": self.session}
+        record.update(fields)
+        with self._lock:
+            try:
+                self.write(json.dumps(record, sort_keys=True) + "\n")
+            except (OSError, ValueError):
+                pass
+
+    def start(self, command, build_dir):
+        return JobEvents(self, next(self._ids), command, build_dir)
+
+    def close(self):
+        with self._lock:
+            if self._socket is not None:
+                self._socket.close()
+                self._socket = None
+
+
+class JobEvents:
+    def __init__(self, stream, job, command, build_dir):
+        self.stream = stream
+        self.job = job
+        self.action = command_action(command)
+        self.build_dir = os.path.abspath(build_dir)
+        self.started = stream.clock()
+        self.streamed = False
+        self.diagnostics = {"warning": 0, "error": 0}
+        self.last_progress = None
+        self.emit("start", command=" ".join(command))
+
+    def emit(self, event, **fields):
+        self.stream.emit(event, job=self.job, action=self.action, build_dir=self.build_dir, **fields)
+
+    def output_handler(self, on_output=None):
+        self.streamed = True
+
+        def handle(line):
+            match = PROGRESS.match(line)
+            if match:
+                done, total = int(match.group(1)), int(match.group(2))
+                now = self.stream.clock()
+                # Ninja prints a status line per edge; forward a sample of them.
+                due = self.last_progress is None or now - self.last_progress >= self.stream.progress_interval
+                if due or done == total:
+                    self.last_progress = now
+                    self.emit("progress", done=done, total=total)
+            else:
+                match = DIAGNOSTIC.search(line)
+                if match:
+                    self.diagnostics[match.group(1)] += 1
+            if on_output is not None:
+                on_output(line)
+
+        return handle
+
+    def finish(self, returncode, output):
+        if not self.streamed:
+            self.diagnostics = count_diagnostics(str(output).splitlines())
+        duration = self.stream.clock() - self.started
+        self.emit(
+            "finish",
+            duration=round(duration, 3),
+            returncode=returncode,
+            output_size=len(output),
+            warnings=self.diagnostics["warning"],
+            errors=self.diagnostics["error"],
+        )
+        if self.stream.metrics is not None:
+            self.stream.metrics.observe(self.action, returncode, duration, len(output), self.diagnostics)
+
+
+class MetricsFile:
+    # Counters and histograms kept across runs in a JSON state file and
+    # rendered to a Prometheus textfile for node_exporter's textfile collector.
+    def __init__(self, path=None, state_path=None, buckets=DURATION_BUCKETS):
+        self.path = path or os.path.join(user_cache_dir(), METRICS_FILE)
+        self.state_path = state_path or os.path.join(user_cache_dir(), METRICS_STATE_FILE)
+        self.buckets = buckets
+        self._lock = threading.Lock()
+
+    def observe(self, action, returncode, duration, output_size, diagnostics):
+        with self._lock:
+            state = load_json(self.state_path, {})
+            result = "success" if returncode == 0 else "failure"
+            jobs = state.setdefault("jobs", {}).setdefault(action, {})
+            jobs[result] = jobs.get(result, 0) + 1
+            histogram = state.setdefault("durations", {}).setdefault(
+                action, {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            )
+            for index, bound in enumerate(self.buckets):
+                if duration <= bound:
+                    histogram["buckets"][index] += 1
+            histogram["sum"] += duration
+            histogram["count"] += 1
+            output = state.setdefault("output_bytes", {})
+            output[action] = output.get(action, 0) + output_size
+            totals = state.setdefault("diagnostics", {})
+            for severity, count in diagnostics.items():
+                totals[severity] = totals.get(severity, 0) + count
+            state["last_finish"] = time.time()
+            try:
+                save_json(self.state_path, state)
+                self.render(state)
+            except OSError:
+                pass
+
+    def render(self, state):
+        lines = [
+            "# HELP fossil_builder_jobs_total Meson commands run, by action and result.",
+            "# TYPE fossil_builder_jobs_total counter",
+        ]
+        for action, results in sorted(state.get("jobs", {}).items()):
+            for result, count in sorted(results.items()):
+                lines.append(f'fossil_builder_jobs_total{{action="{action}",result="{result}"}} {count}')
+        lines += [
+            "# HELP fossil_builder_job_duration_seconds Wall-clock duration of meson commands.",
+            "# TYPE fossil_builder_job_duration_seconds histogram",
+        ]
+        for action, histogram in sorted(state.get("durations", {}).items()):
+            for bound, count in zip(self.buckets, histogram["buckets"]):
+                lines.append(f'fossil_builder_job_duration_seconds_bucket{{action="{action}",le="{bound:g}"}} {count}')
+            lines.append(
+                f'fossil_builder_job_duration_seconds_bucket{{action="{action}",le="+Inf"}} {histogram["count"]}'
+            )
+            lines.append(f'fossil_builder_job_duration_seconds_sum{{action="{action}"}} {histogram["sum"]:.3f}')
+            lines.append(f'fossil_builder_job_duration_seconds_count{{action="{action}"}} {histogram["count"]}')
+        lines += [
+            "# HELP fossil_builder_output_bytes_total Bytes of command output produced.",
+            "# TYPE fossil_builder_output_bytes_total counter",
+        ]
+        for action, size in sorted(state.get("output_bytes", {}).items()):
+            lines.append(f'fossil_builder_output_bytes_total{{action="{action}"}} {size}')
+        lines += [
+            "# HELP fossil_builder_diagnostics_total Compiler warnings and errors seen in command output.",
+            "# TYPE fossil_builder_diagnostics_total counter",
+        ]
+        for severity, count in sorted(state.get("diagnostics", {}).items()):
+            lines.append(f'fossil_builder_diagnostics_total{{severity="{severity}"}} {count}')
+        lines += [
+            "# HELP fossil_builder_last_finish_timestamp_seconds When the last command finished.",
+            "# TYPE fossil_builder_last_finish_timestamp_seconds gauge",
+            f"fossil_builder_last_finish_timestamp_seconds {state.get('last_finish', 0):.3f}",
+        ]
+        # The collector may read at any moment, so swap the whole file in.
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as handle:
+            handle.write("\n".join(lines) + "\n")
+        os.replace(temp_path, self.path)
@@ -0,0 +1,99 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+import os
+
+from code.advisor import OBJECT_SUFFIXES
+from code.affected import load_intro, object_owners
+from code.ninjafiles import graph_outputs, read_deps, read_ninja_log, target_durations
+
+SOURCE_SUFFIXES = {".c", ".cc", ".cpp", ".cxx", ".c++", ".C", ".m", ".mm", ".s", ".S", ".f", ".f90", ".rs", ".d"}
+
+
+class HeaderCost:
+    def __init__(self, header):
+        self.header = header
+        self.units = 0
+        self.targets = set()
+        self.cost_ms = 0
+
+    def format(self, total_ms, source_dir=None):
+        name = self.header
+        if source_dir and name.startswith(os.path.abspath(source_dir) + os.sep):
+            name = os.path.relpath(name, source_dir)
+        share = self.cost_ms / total_ms if total_ms else 0.0
+        return (
+            f"{name}: {self.units} TUs in {len(self.targets)} targets, "
+            f"{self.cost_ms / 1000:.1f}s to touch ({share:.0%} of a full compile)"
+        )
+
+
+class FanoutReport:
+    def __init__(self, headers, units, total_ms):
+        self.headers = headers
+        self.units = units
+        self.total_ms = total_ms
+
+    def summary(self):
+        if not self.units:
+            return "No header dependencies recorded; compile the project once first."
+        return (
+            f"{len(self.headers)} headers feed {self.units} translation units "
+            f"({self.total_ms / 1000:.1f}s of compile time)."
+        )
+
+    def format(self, source_dir=None, limit=20):
+        if not self.units:
+            return self.summary() + "\n"
+        lines = [f"{self.summary()} Costliest to touch:"]
+        lines.extend(f"  {header.format(self.total_ms, source_dir)}" for header in self.headers[:limit])
+        return "\n".join(lines) + "\n"
+
+
+def is_header(path):
+    return os.path.splitext(path)[1] not in SOURCE_SUFFIXES
+
+
+def header_fanout(build_dir, source_dir=None, project_only=True, deps=None, durations=None, targets=None):
+    # Inverts ninja's per-object dependency lists: for every header, the TUs
+    # that include it and the compile time touching it would cost again.
+    deps = deps if deps is not None else read_deps(build_dir)
+    targets = targets if targets is not None else load_intro(build_dir, "targets", [])
+    if durations is None:
+        durations = target_durations(read_ninja_log(build_dir))
+        current = graph_outputs(build_dir)
+        if current is not None:
+            deps = {output: inputs for output, inputs in deps.items() if output in current}
+    owners = object_owners(targets, build_dir)
+    root = os.path.abspath(source_dir) + os.sep if source_dir else None
+    headers = {}
+    units = 0
+    total_ms = 0
+    for output, inputs in deps.items():
+        if not output.endswith(OBJECT_SUFFIXES):
+            continue
+        units += 1
+        duration = durations.get(output)
+        total_ms += duration or 0
+        owner = owners.get(output[:output.find(".p/") + 2]) if ".p/" in output else None
+        for path in set(inputs):
+            if not is_header(path) or (project_only and root and not path.startswith(root)):
+                continue
+            cost = headers.get(path)
+            if cost is None:
+                cost = headers[path] = HeaderCost(path)
+            cost.units += 1
+            if owner is not None:
+                cost.targets.add(owner)
+            cost.cost_ms += duration or 0
+    ranked = sorted(headers.values(), key=lambda cost: (cost.cost_ms, cost.units), reverse=True)
+    return FanoutReport(ranked, units, total_ms)
@@ -0,0 +1,146 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+import contextlib
+import os
+import sqlite3
+import time
+
+from code.statedir import user_cache_dir
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    action TEXT NOT NULL,
+    command TEXT NOT NULL,
+    options TEXT NOT NULL,
+    build_dir TEXT NOT NULL,
+    started REAL NOT NULL,
+    finished REAL NOT NULL,
+    duration REAL NOT NULL,
+    returncode INTEGER,
+    output_size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_build_dir ON runs (build_dir, action, started);
+CREATE INDEX IF NOT EXISTS runs_by_time ON runs (started);
+CREATE TABLE IF NOT EXISTS target_timings (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    output TEXT NOT NULL,
+    duration_ms INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS target_timings_by_run ON target_timings (run_id);
+"""
+
+
+def command_action(command):
+    if len(command) > 1 and os.path.basename(command[0]).startswith("meson"):
+        return command[1]
+    return os.path.basename(command[0]) if command else ""
+
+
+class RunHistory:
+    def __init__(self, path=None):
+        self.path = path or os.path.join(user_cache_dir(), "history.sqlite3")
+        with self.connect() as connection:
+            connection.executescript(SCHEMA)
+
+    @contextlib.contextmanager
+    def connect(self):
+        # One short-lived connection per call keeps the store usable from the
+        # worker threads every GUI action runs on.
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            connection.execute("PRAGMA foreign_keys = ON")
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def record(self, command, build_dir, started, finished, returncode, output_size):
+        action = command_action(command)
+        options = command[2:] if len(command) > 1 and command[1] == action else command[1:]
+        # Losing a history row must never fail the build that produced it.
+        with contextlib.suppress(sqlite3.Error), self.connect() as connection:
+            cursor = connection.execute(
+                "INSERT INTO runs (action, command, options, build_dir, started, finished, "
+                "duration, returncode, output_size) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    action,
+                    " ".join(command),
+                    " ".join(options),
+                    os.path.abspath(build_dir),
+                    started,
+                    finished,
+                    finished - started,
+                    returncode,
+                    output_size,
+                ),
+            )
+            return cursor.lastrowid
+        return None
+
+    def record_targets(self, run_id, durations):
+        with contextlib.suppress(sqlite3.Error), self.connect() as connection:
+            connection.executemany(
+                "INSERT INTO target_timings (run_id, output, duration_ms) VALUES (?, ?, ?)",
+                [(run_id, output, duration) for output, duration in durations.items()],
+            )
+
+    def median_duration(self, build_dir, action="compile", days=30, now=None, successful=True):
+        since = (time.time() if now is None else now) - days * 86400
+        query = "FROM runs WHERE build_dir = ? AND action = ? AND started >= ?"
+        parameters = [os.path.abspath(build_dir), action, since]
+        if successful:
+            query += " AND returncode = 0"
+        with self.connect() as connection:
+            count = connection.execute(f"SELECT COUNT(*) {query}", parameters).fetchone()[0]
+            if not count:
+                return None
+            # Only the middle one or two rows are fetched, not the whole window.
+            middle = connection.execute(
+                f"SELECT duration {query} ORDER BY duration LIMIT ? OFFSET ?",
+                parameters + [2 - count % 2, (count - 1) // 2],
+            ).fetchall()
+        return sum(row[0] for row in middle) / len(middle)
+
+    def daily_summary(self, build_dir, action="compile", days=30, now=None):
+        since = (time.time() if now is None else now) - days * 86400
+        with self.connect() as connection:
+            return connection.execute(
+                "SELECT date(started, 'unixepoch', 'localtime') AS day, COUNT(*), "
+                "AVG(duration), MIN(duration), MAX(duration), "
+                "SUM(returncode != 0) FROM runs "
+                "WHERE build_dir = ? AND action = ? AND started >= ? GROUP BY day ORDER BY day",
+                (os.path.abspath(build_dir), action, since),
+            ).fetchall()
+
+    def slowest_targets(self, build_dir, days=30, limit=10, now=None):
+        since = (time.time() if now is None else now) - days * 86400
+        with self.connect() as connection:
+            return connection.execute(
+                "SELECT target_timings.output, COUNT(*), AVG(target_timings.duration_ms), "
+                "MAX(target_timings.duration_ms) FROM runs "
+                "JOIN target_timings ON target_timings.run_id = runs.id "
+                "WHERE runs.build_dir = ? AND runs.action = 'compile' AND runs.started >= ? "
+                "GROUP BY target_timings.output ORDER BY AVG(target_timings.duration_ms) DESC LIMIT ?",
+                (os.path.abspath(build_dir), since, limit),
+            ).fetchall()
+
+    def recent(self, limit=100, build_dir=None):
+        query = "SELECT id, action, options, build_dir, started, duration, returncode, output_size FROM runs"
+        parameters = []
+        if build_dir is not None:
+            query += " WHERE build_dir = ?"
+            parameters.append(os.path.abspath(build_dir))
+        query += " ORDER BY started DESC LIMIT ?"
+        with self.connect() as connection:
+            return connection.execute(query, parameters + [limit]).fetchall()
@@ -0,0 +1,210 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+import os
+import pickle
+import shutil
+import stat
+
+from code.affected import load_intro
+from code.buildcache import hash_file
+from code.statedir import build_state_dir, load_json, save_json
+
+MANIFEST_FILE = "install-manifest.json"
+PLAN_SECTIONS = ("targets", "data", "headers", "man", "install_subdirs")
+
+
+def destdir_path(destination, destdir):
+    if not destdir:
+        return destination
+    drive, path = os.path.splitdrive(destination)
+    return os.path.join(destdir, path.lstrip("\\/"))
+
+
+def load_install_data(build_dir):
+    # meson-private/install.dat is what meson install itself reads. It is a
+    # pickle of meson's own classes, so it can only be read where mesonbuild
+    # is importable; None otherwise.
+    try:
+        import mesonbuild  # noqa: F401
+    except ImportError:
+        return None
+    try:
+        with open(os.path.join(build_dir, "meson-private", "install.dat"), "rb") as handle:
+            return pickle.load(handle)
+    except (OSError, EOFError, AttributeError, ImportError, TypeError, pickle.UnpicklingError):
+        return None
+
+
+def has_install_mode(entry):
+    mode = getattr(entry, "install_mode", None)
+    return mode is not None and (
+        getattr(mode, "perms", -1) != -1 or mode.owner is not None or mode.group is not None
+    )
+
+
+class InstallAction:
+    def __init__(self, kind, source, destination):
+        self.kind = kind
+        self.source = source
+        self.destination = destination
+
+    def format(self):
+        symbol = {"add": "+", "update": "~", "remove": "-"}[self.kind]
+        if self.kind == "remove":
+            return f"{symbol} {self.destination}"
+        return f"{symbol} {self.destination} <- {self.source}"
+
+
+class IncrementalInstall:
+    def __init__(self, build_dir, destdir=None, use_hash=False):
+        self.build_dir = build_dir
+        self.destdir = os.environ.get("DESTDIR", "") if destdir is None else destdir
+        self.use_hash = use_hash
+        self.umask = None
+
+    @property
+    def manifest_path(self):
+        return os.path.join(build_state_dir(self.build_dir), MANIFEST_FILE)
+
+    def install_plan(self):
+        # intro-installed has the resolved destinations; intro-install_plan
+        # adds what an install_subdir leaves out. Older meson has only the former.
+        plan = load_intro(self.build_dir, "install_plan", {})
+        entries = {}
+        for section in PLAN_SECTIONS:
+            entries.update(plan.get(section, {}))
+        files = {}
+        for source, destination in load_intro(self.build_dir, "installed", {}).items():
+            destination = destdir_path(destination, self.destdir)
+            if os.path.isdir(source):
+                entry = entries.get(source, {})
+                exclude_dirs = set(entry.get("exclude_dirs", []))
+                exclude_files = set(entry.get("exclude_files", []))
+                for root, dirs, names in os.walk(source):
+                    relroot = os.path.relpath(root, source)
+                    dirs[:] = [name for name in dirs if os.path.normpath(os.path.join(relroot, name)) not in exclude_dirs]
+                    for name in names:
+                        relpath = os.path.normpath(os.path.join(relroot, name))
+                        if relpath not in exclude_files:
+                            files[os.path.join(destination, relpath)] = os.path.join(root, name)
+            else:
+                files[destination] = source
+        return files
+
+    def meson_only(self):
+        # What a plain copy cannot reproduce: install scripts, install_mode,
+        # stripping, symlinks and empty dirs. intro-install_plan does not
+        # record these, so they come from meson's install data; when that
+        # cannot be read, every install goes through meson.
+        data = load_install_data(self.build_dir)
+        if data is None:
+            return ["meson's install data could not be read"]
+        reasons = []
+        if getattr(data, "install_scripts", None):
+            reasons.append(f"{len(data.install_scripts)} install scripts")
+        if any(getattr(target, "strip", False) for target in getattr(data, "targets", [])):
+            reasons.append("stripped targets")
+        if any(has_install_mode(entry) for section in PLAN_SECTIONS + ("emptydir",)
+               for entry in getattr(data, section, [])):
+            reasons.append("install_mode")
+        if getattr(data, "symlinks", None):
+            reasons.append("install_symlink")
+        if getattr(data, "emptydir", None):
+            reasons.append("install_emptydir")
+        umask = getattr(data, "install_umask", "preserve")
+        self.umask = umask if isinstance(umask, int) else None
+        return reasons
+
+    def needs_fixups(self):
+        # Targets whose rpaths meson rewrites at install time cannot be copied as-is.
+        plan = load_intro(self.build_dir, "install_plan", {})
+        return {
+            source for source, entry in plan.get("targets", {}).items()
+            if entry.get("build_rpaths") or entry.get("install_rpath")
+        }
+
+    def previous_destinations(self):
+        destinations = set(load_json(self.manifest_path, {}))
+        log_path = os.path.join(self.build_dir, "meson-logs", "install-log.txt")
+        try:
+            with open(log_path) as handle:
+                for line in handle:
+                    line = line.strip()
+                    if line and not line.startswith("#"):
+                        destinations.add(destdir_path(line, self.destdir))
+        except OSError:
+            pass
+        return destinations
+
+    def is_current(self, source, destination, manifest):
+        try:
+            source_stat = os.stat(source)
+            dest_stat = os.stat(destination)
+        except OSError:
+            return False
+        # Installed binaries may have been rewritten (rpaths), so an unchanged
+        # source since the last install is enough.
+        recorded = manifest.get(destination)
+        if recorded and recorded[1:] == [source_stat.st_size, source_stat.st_mtime_ns]:
+            return True
+        if source_stat.st_size != dest_stat.st_size:
+            return False
+        if source_stat.st_mtime_ns == dest_stat.st_mtime_ns:
+            return True
+        if self.use_hash and hash_file(source) == hash_file(destination):
+            os.utime(destination, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+            return True
+        return False
+
+    def diff(self):
+        plan = self.install_plan()
+        manifest = load_json(self.manifest_path, {})
+        actions = []
+        for destination, source in sorted(plan.items()):
+            if not os.path.exists(destination):
+                actions.append(InstallAction("add", source, destination))
+            elif not self.is_current(source, destination, manifest):
+                actions.append(InstallAction("update", source, destination))
+        for destination in sorted(self.previous_destinations() - set(plan)):
+            if os.path.isfile(destination) or os.path.islink(destination):
+                actions.append(InstallAction("remove", None, destination))
+        return actions
+
+    def place(self, source, destination):
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        temp_path = f"{destination}.fossil-tmp"
+        if os.path.lexists(temp_path):
+            os.remove(temp_path)
+        shutil.copy2(source, temp_path, follow_symlinks=False)
+        if self.umask is not None and not os.path.islink(temp_path):
+            # As meson install does for files without install_mode.
+            executable = os.stat(temp_path).st_mode & stat.S_IXUSR
+            os.chmod(temp_path, (0o777 if executable else 0o666) & ~self.umask)
+        os.replace(temp_path, destination)
+
+    def apply(self, actions):
+        for action in actions:
+            if action.kind == "remove":
+                os.remove(action.destination)
+            else:
+                self.place(action.source, action.destination)
+
+    def save_manifest(self):
+        manifest = {}
+        for destination, source in self.install_plan().items():
+            try:
+                stat = os.stat(source)
+            except OSError:
+                continue
+            manifest[destination] = [source, stat.st_size, stat.st_mtime_ns]
+        save_json(self.manifest_path, manifest)
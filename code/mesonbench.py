@@ -0,0 +1,170 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+import json
+import math
+import os
+import statistics
+
+from code.statedir import STATE_DIR_NAME, build_state_dir, load_json, save_json
+
+BENCHMARK_LOG = "fossil-benchmark"
+LAST_RUN_FILE = "benchmark-last.json"
+BASELINE_FILE = "benchmark-baseline.json"
+# Two-sided 95% Student t quantiles for 1..30 degrees of freedom.
+T_95 = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)
+
+
+def t_critical(df):
+    if df < 1:
+        return float("inf")
+    return T_95[int(df) - 1] if df <= len(T_95) else 1.96
+
+
+def benchmark_command(build_dir, repeat=5, benchmarks=None):
+    # --repeat runs every benchmark in one meson invocation; --logbase keeps
+    # the results apart from the regular testlog.json.
+    return [
+        "meson", "test", "-C", build_dir, "--benchmark", "--repeat", str(repeat),
+        "--logbase", BENCHMARK_LOG,
+    ] + list(benchmarks or [])
+
+
+def read_benchmark_log(build_dir):
+    # Returns ({name: [seconds]}, failed names) from meson's JSON-lines log.
+    samples = {}
+    failed = set()
+    path = os.path.join(build_dir, "meson-logs", f"{BENCHMARK_LOG}.json")
+    try:
+        with open(path) as handle:
+            for line in handle:
+                try:
+                    result = json.loads(line)
+                except ValueError:
+                    continue
+                if result.get("result") in ("OK", "EXPECTEDFAIL"):
+                    samples.setdefault(result["name"], []).append(result["duration"])
+                else:
+                    failed.add(result.get("name"))
+    except OSError:
+        pass
+    return samples, failed
+
+
+class BenchmarkStats:
+    def __init__(self, name, samples):
+        self.name = name
+        self.samples = list(samples)
+        self.mean = statistics.mean(self.samples)
+        self.stdev = statistics.stdev(self.samples) if len(self.samples) > 1 else 0.0
+
+    @property
+    def interval(self):
+        # Half-width of the 95% confidence interval of the mean.
+        if len(self.samples) < 2:
+            return float("inf")
+        return t_critical(len(self.samples) - 1) * self.stdev / math.sqrt(len(self.samples))
+
+
+class BenchmarkComparison:
+    def __init__(self, current, reference, min_change=0.02):
+        self.current = current
+        self.reference = reference
+        self.min_change = min_change
+
+    @property
+    def name(self):
+        return self.current.name
+
+    @property
+    def delta(self):
+        return self.current.mean - self.reference.mean
+
+    @property
+    def change(self):
+        return self.delta / self.reference.mean if self.reference.mean else 0.0
+
+    @property
+    def interval(self):
+        # Welch's t-interval for the difference of two means.
+        a, b = self.current, self.reference
+        if len(a.samples) < 2 or len(b.samples) < 2:
+            return float("inf")
+        va = a.stdev ** 2 / len(a.samples)
+        vb = b.stdev ** 2 / len(b.samples)
+        if va + vb == 0:
+            return 0.0
+        df = (va + vb) ** 2 / (va ** 2 / (len(a.samples) - 1) + vb ** 2 / (len(b.samples) - 1))
+        return t_critical(df) * math.sqrt(va + vb)
+
+    @property
+    def verdict(self):
+        # Only a difference whose whole interval sits on one side of zero, and
+        # that is large enough to matter, counts; everything else is noise.
+        if abs(self.change) < self.min_change:
+            return "same"
+        if self.delta - self.interval > 0:
+            return "regression"
+        if self.delta + self.interval < 0:
+            return "improvement"
+        return "same"
+
+    def format(self):
+        return (
+            f"{self.name}: {self.current.mean * 1000:.2f}ms vs {self.reference.mean * 1000:.2f}ms "
+            f"({self.change:+.1%}, ±{self.interval * 1000:.2f}ms) {self.verdict}"
+        )
+
+
+def benchmark_stats(samples):
+    return {name: BenchmarkStats(name, values) for name, values in samples.items() if values}
+
+
+def compare_benchmarks(current, reference, min_change=0.02):
+    current = benchmark_stats(current)
+    reference = benchmark_stats(reference)
+    return [
+        BenchmarkComparison(current[name], reference[name], min_change)
+        for name in sorted(current) if name in reference
+    ]
+
+
+def load_samples(build_dir, name=LAST_RUN_FILE):
+    # Reads without creating a state dir, since the reference may be another
+    # team member's build dir.
+    return load_json(os.path.join(build_dir, STATE_DIR_NAME, name), {}).get("samples", {})
+
+
+def save_samples(build_dir, samples, name=LAST_RUN_FILE):
+    save_json(os.path.join(build_state_dir(build_dir), name), {"samples": samples})
+
+
+def format_benchmarks(samples, comparisons=None, failed=()):
+    lines = []
+    by_name = {comparison.name: comparison for comparison in comparisons or []}
+    for name, stats in sorted(benchmark_stats(samples).items()):
+        line = f"{name}: {stats.mean * 1000:.2f}ms ± {stats.interval * 1000:.2f}ms over {len(stats.samples)} runs"
+        if name in by_name:
+            comparison = by_name[name]
+            line += f"; {comparison.change:+.1%} vs reference ({comparison.verdict})"
+        lines.append(line)
+    lines.extend(f"{name}: failed" for name in sorted(failed))
+    if not lines:
+        lines.append("No benchmark results; the project may define no benchmarks.")
+    regressions = [comparison for comparison in comparisons or [] if comparison.verdict == "regression"]
+    if regressions:
+        lines.append(f"{len(regressions)} benchmarks are slower than the reference beyond noise.")
+    return "\n".join(lines) + "\n"
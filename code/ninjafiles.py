@@ -0,0 +1,207 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+import os
+import struct
+import subprocess
+
+DEPS_LOG_MAGIC = b"# ninjadeps\n"
+
+
+def ninja_command():
+    return os.environ.get("NINJA", "ninja")
+
+
+def parse_deps(text, build_dir):
+    deps = {}
+    output = None
+    for line in text.splitlines():
+        if not line.strip():
+            output = None
+        elif not line[0].isspace():
+            output = line.split(":", 1)[0]
+            deps[output] = []
+        elif output is not None:
+            deps[output].append(os.path.normpath(os.path.join(build_dir, line.strip())))
+    return deps
+
+
+def read_deps(build_dir):
+    # Header dependencies recorded in .ninja_deps, keyed by output path
+    # relative to the build dir; inputs are returned as absolute paths.
+    try:
+        result = subprocess.run(
+            [ninja_command(), "-C", build_dir, "-t", "deps"],
+            capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return {}
+    return parse_deps(result.stdout, os.path.abspath(build_dir))
+
+
+def graph_outputs(build_dir):
+    # Outputs of the current build graph. .ninja_log keeps lines for outputs a
+    # regenerate dropped until ninja recompacts it, so callers filter with this.
+    try:
+        result = subprocess.run(
+            [ninja_command(), "-C", build_dir, "-t", "targets", "all"],
+            capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return {line.rsplit(": ", 1)[0] for line in result.stdout.splitlines() if ": " in line}
+
+
+def ninja_log_path(build_dir):
+    return os.path.join(build_dir, ".ninja_log")
+
+
+def ninja_log_size(build_dir):
+    try:
+        return os.path.getsize(ninja_log_path(build_dir))
+    except OSError:
+        return 0
+
+
+def read_ninja_log(build_dir, offset=0):
+    # Entries are (start_ms, end_ms, output). Passing the size the log had
+    # before a build returns just the edges that build ran; if ninja rewrote
+    # the log in between (recompaction), the whole log is read instead.
+    path = ninja_log_path(build_dir)
+    try:
+        if offset and os.path.getsize(path) < offset:
+            offset = 0
+        with open(path, "rb") as handle:
+            handle.seek(offset)
+            data = handle.read().decode("utf-8", "replace")
+    except OSError:
+        return []
+    entries = []
+    for line in data.splitlines():
+        if line.startswith("#"):
+            continue
+        fields = line.split("\t")
+        if len(fields) < 4:
+            continue
+        try:
+            entries.append((int(fields[0]), int(fields[1]), fields[3]))
+        except ValueError:
+            continue
+    return entries
+
+
+def restamp_ninja_log(build_dir, mtime_ns):
+    # Rewrites the output mtime ninja recorded for every edge. Ninja since
+    # 1.10 records nanoseconds; older logs hold seconds.
+    path = ninja_log_path(build_dir)
+    try:
+        with open(path, "rb") as handle:
+            lines = handle.read().decode("utf-8", "replace").splitlines(keepends=True)
+    except OSError:
+        return
+    for index, line in enumerate(lines):
+        fields = line.split("\t")
+        if line.startswith("#") or len(fields) < 5 or not fields[2].isdigit():
+            continue
+        fields[2] = str(mtime_ns if int(fields[2]) > 10**12 else mtime_ns // 10**9)
+        lines[index] = "\t".join(fields)
+    with open(path + ".tmp", "wb") as handle:
+        handle.write("".join(lines).encode("utf-8"))
+    os.replace(path + ".tmp", path)
+
+
+def restamp_ninja_deps(build_dir, mtime_ns):
+    # Rewrites the output mtime stored with each deps record of a version 4
+    # .ninja_deps. Other versions are removed; ninja then rescans the headers
+    # of the outputs that need them, which costs a rebuild but stays correct.
+    path = os.path.join(build_dir, ".ninja_deps")
+    try:
+        with open(path, "rb") as handle:
+            data = bytearray(handle.read())
+    except OSError:
+        return
+    header = len(DEPS_LOG_MAGIC) + 4
+    if data[:len(DEPS_LOG_MAGIC)] != DEPS_LOG_MAGIC or struct.unpack_from("<i", data, len(DEPS_LOG_MAGIC))[0] != 4:
+        os.remove(path)
+        return
+    position = header
+    while position + 4 <= len(data):
+        size, = struct.unpack_from("<I", data, position)
+        position += 4
+        if size & 0x80000000 and position + 12 <= len(data):
+            # Deps record: output id, then the mtime as low and high 32 bits.
+            struct.pack_into("<II", data, position + 4, mtime_ns & 0xFFFFFFFF, mtime_ns >> 32)
+        position += size & 0x7FFFFFFF
+    with open(path + ".tmp", "wb") as handle:
+        handle.write(data)
+    os.replace(path + ".tmp", path)
+
+
+def target_durations(entries):
+    # A restat or rebuild appends a fresh line for the same output; the last one wins.
+    durations = {}
+    for start, end, output in entries:
+        durations[output] = max(end - start, 0)
+    return durations
+
+
+class DirtyPlan:
+    def __init__(self, pending, total, steps, regenerate=False):
+        self.pending = pending
+        self.total = total
+        self.steps = steps
+        self.regenerate = regenerate
+
+    @property
+    def up_to_date(self):
+        return self.pending == 0
+
+    def format(self, limit=0):
+        if self.up_to_date:
+            return "Up to date."
+        text = f"{self.pending:,} of {max(self.total, self.pending):,} steps pending"
+        if self.regenerate:
+            text += " (build files need regenerating)"
+        lines = [text + "."]
+        lines.extend(f"  {step}" for step in self.steps[:limit])
+        if limit and len(self.steps) > limit:
+            lines.append(f"  ... and {len(self.steps) - limit} more")
+        return "\n".join(lines)
+
+
+def parse_dry_run(text):
+    # With NINJA_STATUS set to "[%f/%t] " every planned edge prints one status
+    # line; its description names the output for meson's rules.
+    steps = []
+    for line in text.splitlines():
+        if line.startswith("[") and "] " in line:
+            steps.append(line.split("] ", 1)[1])
+    return steps
+
+
+def dry_run_plan(build_dir, targets=None):
+    environment = dict(os.environ, NINJA_STATUS="[%f/%t] ")
+    try:
+        plan = subprocess.run(
+            [ninja_command(), "-C", build_dir, "-n"] + list(targets or []),
+            capture_output=True, text=True, check=True, env=environment,
+        )
+        commands = subprocess.run(
+            [ninja_command(), "-C", build_dir, "-t", "commands"] + list(targets or []),
+            capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    steps = parse_dry_run(plan.stdout)
+    regenerate = any(step.startswith("Regenerating build files") for step in steps)
+    total = sum(1 for line in commands.stdout.splitlines() if line.strip())
+    return DirtyPlan(len(steps), total, steps, regenerate)
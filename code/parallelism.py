@@ -0,0 +1,75 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+import os
+
+from code.sampler import format_bytes, read_meminfo
+from code.statedir import build_state_dir, load_json, save_json
+
+HISTORY_FILE = "parallelism.json"
+HISTORY_LENGTH = 10
+
+
+class ParallelismPlan:
+    def __init__(self, jobs, load_average, reason):
+        self.jobs = jobs
+        self.load_average = load_average
+        self.reason = reason
+
+    def format(self):
+        return f"Adaptive parallelism: -j {self.jobs} -l {self.load_average:g} ({self.reason})"
+
+
+class AdaptiveParallelism:
+    def __init__(self, build_dir, memory_reserve=512 << 20, default_edge_memory=512 << 20):
+        self.build_dir = build_dir
+        self.memory_reserve = memory_reserve
+        self.default_edge_memory = default_edge_memory
+
+    @property
+    def history_path(self):
+        return os.path.join(build_state_dir(self.build_dir), HISTORY_FILE)
+
+    def edge_memory(self):
+        history = load_json(self.history_path, {}).get("edge_peak_rss", [])
+        return max(history) if history else self.default_edge_memory
+
+    def plan(self, cpu_count=None, load=None, available_memory=None):
+        cpu_count = cpu_count or os.cpu_count() or 1
+        if load is None:
+            load = os.getloadavg()[0] if hasattr(os, "getloadavg") else 0.0
+        if available_memory is None:
+            available_memory = read_meminfo().get("MemAvailable")
+
+        cpu_jobs = max(1, int(cpu_count - load + 0.5))
+        jobs = cpu_jobs
+        reason = f"load {load:.2f} on {cpu_count} CPUs"
+        if available_memory is not None:
+            edge_memory = self.edge_memory()
+            memory_jobs = max(1, int((available_memory - self.memory_reserve) // edge_memory))
+            if memory_jobs < jobs:
+                jobs = memory_jobs
+                reason = (
+                    f"{format_bytes(available_memory)} available, "
+                    f"{format_bytes(edge_memory)} peak per edge"
+                )
+        # ninja stops starting new edges while the load average exceeds -l.
+        return ParallelismPlan(jobs, float(cpu_count), reason)
+
+    def record(self, summary):
+        if summary is None or not summary.peak_process_rss:
+            return
+        history = load_json(self.history_path, {})
+        peaks = history.get("edge_peak_rss", [])
+        peaks.append(summary.peak_process_rss)
+        history["edge_peak_rss"] = peaks[-HISTORY_LENGTH:]
+        save_json(self.history_path, history)
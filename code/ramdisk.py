@@ -0,0 +1,150 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+import hashlib
+import os
+import shutil
+
+from code.affected import load_intro
+from code.sampler import format_bytes, read_meminfo
+from code.statedir import build_state_dir, load_json, save_json
+
+MAPPING_FILE = "tmpfs.json"
+SYNC_EXTRA = ("compile_commands.json", "meson-info", "meson-logs")
+
+
+def default_tmpfs_root():
+    for path in ("/dev/shm", os.environ.get("XDG_RUNTIME_DIR", "")):
+        if path and os.path.isdir(path) and os.access(path, os.W_OK):
+            return path
+    return None
+
+
+class TmpfsStaging:
+    # The configured build dir keeps a small mapping file plus the artifacts
+    # synced back after each build; meson itself works in a directory on tmpfs.
+    def __init__(self, root=None, reserve=None, sync_extra=SYNC_EXTRA, shortage_limit=3):
+        self.root = root or default_tmpfs_root()
+        self.reserve = reserve
+        self.sync_extra = sync_extra
+        self.shortage_limit = shortage_limit
+        self._staged = {}
+        self._shortages = {}
+
+    def mapping_path(self, build_dir):
+        return os.path.join(build_state_dir(build_dir), MAPPING_FILE)
+
+    def path_for(self, build_dir):
+        build_dir = os.path.abspath(build_dir)
+        digest = hashlib.sha256(build_dir.encode()).hexdigest()[:12]
+        return os.path.join(self.root, "fossil-builddir", f"{os.path.basename(build_dir)}-{digest}")
+
+    def free_memory(self):
+        free = shutil.disk_usage(self.root).free
+        available = read_meminfo().get("MemAvailable")
+        return min(free, available) if available is not None else free
+
+    def required_free(self):
+        if self.reserve is not None:
+            return self.reserve
+        return max(1 << 30, read_meminfo().get("MemTotal", 0) // 10)
+
+    def has_room(self):
+        if self.root is None:
+            return False
+        return self.free_memory() >= self.required_free()
+
+    def short_of_room(self, build_dir):
+        # Consecutive checks without room for this build dir; a brief dip in
+        # MemAvailable is not worth throwing the staged tree away for.
+        key = os.path.abspath(build_dir)
+        if self.has_room():
+            self._shortages.pop(key, None)
+            return 0
+        self._shortages[key] = self._shortages.get(key, 0) + 1
+        return self._shortages[key]
+
+    def shortage(self):
+        return (
+            f"only {format_bytes(self.free_memory())} free on {self.root}, "
+            f"{format_bytes(self.required_free())} required"
+        )
+
+    def staged_dir(self, build_dir):
+        key = os.path.abspath(build_dir)
+        if key not in self._staged:
+            mapping_path = os.path.join(key, ".fossil-builddir", MAPPING_FILE)
+            self._staged[key] = load_json(mapping_path, {}).get("staged")
+        staged = self._staged[key]
+        # tmpfs does not survive a reboot; a vanished tree means no staging.
+        if staged and os.path.isdir(staged):
+            return staged
+        return None
+
+    def setup_options(self, build_dir):
+        return load_json(self.mapping_path(build_dir), {}).get("setup_options", "")
+
+    def stage(self, build_dir, setup_options=""):
+        staged = self.path_for(build_dir)
+        shutil.rmtree(staged, ignore_errors=True)
+        os.makedirs(staged)
+        save_json(self.mapping_path(build_dir), {"staged": staged, "setup_options": setup_options})
+        self._staged[os.path.abspath(build_dir)] = staged
+        return staged
+
+    def unstage(self, build_dir):
+        staged = self.staged_dir(build_dir)
+        if staged is not None:
+            shutil.rmtree(staged, ignore_errors=True)
+        try:
+            os.remove(self.mapping_path(build_dir))
+        except OSError:
+            pass
+        self._staged.pop(os.path.abspath(build_dir), None)
+        self._shortages.pop(os.path.abspath(build_dir), None)
+
+    def artifacts(self, staged):
+        paths = set()
+        for target in load_intro(staged, "targets", []):
+            for filename in target.get("filename", []):
+                if os.path.abspath(filename).startswith(os.path.abspath(staged) + os.sep):
+                    paths.add(os.path.relpath(filename, staged))
+        for name in self.sync_extra:
+            path = os.path.join(staged, name)
+            if os.path.isdir(path):
+                for root, _, files in os.walk(path):
+                    paths.update(os.path.relpath(os.path.join(root, file), staged) for file in files)
+            elif os.path.exists(path):
+                paths.add(name)
+        return sorted(paths)
+
+    def sync_back(self, staged, build_dir):
+        copied = 0
+        size = 0
+        for relpath in self.artifacts(staged):
+            source = os.path.join(staged, relpath)
+            destination = os.path.join(build_dir, relpath)
+            try:
+                source_stat = os.stat(source)
+            except OSError:
+                continue
+            try:
+                dest_stat = os.stat(destination)
+                if (dest_stat.st_size, dest_stat.st_mtime_ns) == (source_stat.st_size, source_stat.st_mtime_ns):
+                    continue
+            except OSError:
+                pass
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            shutil.copy2(source, destination)
+            copied += 1
+            size += source_stat.st_size
+        return copied, size
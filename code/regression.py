@@ -0,0 +1,106 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+import hashlib
+import json
+import os
+import statistics
+
+from code.buildoptions import load_build_options, option_key
+from code.statedir import build_state_dir, load_json, save_json
+
+BASELINE_FILE = "timing-baseline.json"
+
+
+def options_fingerprint(build_dir):
+    # Timings are only comparable between builds with the same option set.
+    options = sorted((option_key(option), option["value"]) for option in load_build_options(build_dir) or [])
+    return hashlib.sha256(json.dumps(options).encode()).hexdigest()[:16]
+
+
+class TimingRegression:
+    def __init__(self, output, duration, mean, stdev, samples):
+        self.output = output
+        self.duration = duration
+        self.mean = mean
+        self.stdev = stdev
+        self.samples = samples
+
+    @property
+    def ratio(self):
+        return self.duration / self.mean if self.mean else float("inf")
+
+    def format(self):
+        return (
+            f"{self.output}: {self.duration / 1000:.2f}s vs {self.mean / 1000:.2f}s "
+            f"± {self.stdev / 1000:.2f}s over {self.samples} builds ({self.ratio:.1f}x)"
+        )
+
+
+class TimingBaseline:
+    def __init__(self, build_dir, window=10, min_samples=3, sigmas=3.0,
+                 min_increase=0.25, min_delta_ms=100, state_dir=None):
+        self.build_dir = build_dir
+        # Where the baseline is kept, when that is not the build dir itself.
+        self.state_dir = state_dir or build_dir
+        self.window = window
+        self.min_samples = min_samples
+        self.sigmas = sigmas
+        self.min_increase = min_increase
+        self.min_delta_ms = min_delta_ms
+        self.fingerprint = options_fingerprint(build_dir)
+
+    @property
+    def path(self):
+        return os.path.join(build_state_dir(self.state_dir), BASELINE_FILE)
+
+    def samples(self):
+        return load_json(self.path, {}).get(self.fingerprint, {})
+
+    def check(self, durations):
+        # A target regresses when it is both statistically unusual (beyond
+        # mean + sigmas * stdev) and materially slower, so noisy sub-second
+        # edges and tiny relative jitter do not raise alarms.
+        regressions = []
+        baseline = self.samples()
+        for output, duration in durations.items():
+            history = baseline.get(output, [])
+            if len(history) < self.min_samples:
+                continue
+            mean = statistics.mean(history)
+            stdev = statistics.pstdev(history)
+            limit = mean + max(self.sigmas * stdev, self.min_increase * mean, self.min_delta_ms)
+            if duration > limit:
+                regressions.append(TimingRegression(output, duration, mean, stdev, len(history)))
+        regressions.sort(key=lambda regression: regression.duration - regression.mean, reverse=True)
+        return regressions
+
+    def record(self, durations):
+        data = load_json(self.path, {})
+        baseline = data.setdefault(self.fingerprint, {})
+        for output, duration in durations.items():
+            baseline[output] = (baseline.get(output, []) + [duration])[-self.window:]
+        save_json(self.path, data)
+
+
+def format_regressions(regressions, limit=10):
+    if not regressions:
+        return ""
+    added = sum(regression.duration - regression.mean for regression in regressions)
+    lines = [
+        f"Build-time regression: {len(regressions)} targets slower than their baseline "
+        f"(+{added / 1000:.1f}s of compile/link time in total)"
+    ]
+    lines.extend(f"  {regression.format()}" for regression in regressions[:limit])
+    if len(regressions) > limit:
+        lines.append(f"  ... and {len(regressions) - limit} more")
+    return "\n".join(lines) + "\n"
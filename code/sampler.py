@@ -0,0 +1,248 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+import collections
+import os
+import threading
+import time
+
+PROC_ROOT = "/proc"
+
+
+def sampler_supported():
+    return os.path.isdir(os.path.join(PROC_ROOT, "self"))
+
+
+def read_meminfo():
+    info = {}
+    try:
+        with open(os.path.join(PROC_ROOT, "meminfo")) as handle:
+            for line in handle:
+                key, _, value = line.partition(":")
+                fields = value.split()
+                if fields:
+                    info[key] = int(fields[0]) * 1024
+    except OSError:
+        pass
+    return info
+
+
+def format_bytes(count):
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(count) < 1024:
+            return f"{count:.1f} {unit}" if unit != "B" else f"{count} {unit}"
+        count /= 1024.0
+    return f"{count:.1f} TiB"
+
+
+class ProcessSample:
+    def __init__(self, timestamp, cpu_percent, rss, read_bytes, write_bytes, processes):
+        self.timestamp = timestamp
+        self.cpu_percent = cpu_percent
+        self.rss = rss
+        self.read_bytes = read_bytes
+        self.write_bytes = write_bytes
+        self.processes = processes
+
+
+class ResourceSummary:
+    def __init__(self, duration, samples, peak_rss, read_bytes, write_bytes,
+                 cpu_seconds, io_wait_seconds, mem_total, cpu_count, peak_process_rss=0):
+        self.duration = duration
+        self.samples = samples
+        self.peak_rss = peak_rss
+        self.peak_process_rss = peak_process_rss
+        self.read_bytes = read_bytes
+        self.write_bytes = write_bytes
+        self.cpu_seconds = cpu_seconds
+        self.io_wait_seconds = io_wait_seconds
+        self.mem_total = mem_total
+        self.cpu_count = cpu_count
+
+    @property
+    def avg_cpu_percent(self):
+        if self.duration <= 0:
+            return 0.0
+        return 100.0 * self.cpu_seconds / self.duration
+
+    @property
+    def cpu_utilization(self):
+        return self.avg_cpu_percent / (100.0 * max(self.cpu_count, 1))
+
+    def bound(self):
+        if self.mem_total and self.peak_rss >= 0.8 * self.mem_total:
+            return "memory-bound"
+        if self.cpu_utilization >= 0.6:
+            return "CPU-bound"
+        io_rate = (self.read_bytes + self.write_bytes) / max(self.duration, 1e-6)
+        if self.duration and self.io_wait_seconds >= 0.3 * self.duration:
+            return "I/O-bound"
+        if self.cpu_utilization < 0.25 and io_rate >= 10 * 1024 * 1024:
+            return "I/O-bound"
+        if self.cpu_utilization < 0.25:
+            return "mostly idle/waiting"
+        return "mixed"
+
+    def format(self):
+        return (
+            f"Resources: {self.duration:.1f}s wall, "
+            f"avg CPU {self.avg_cpu_percent:.0f}% of {self.cpu_count} cores, "
+            f"peak RSS {format_bytes(self.peak_rss)}, "
+            f"read {format_bytes(self.read_bytes)}, "
+            f"written {format_bytes(self.write_bytes)} ({self.bound()})"
+        )
+
+
+class ProcessTreeSampler:
+    def __init__(self, pid, interval=0.25, history=480):
+        self.pid = pid
+        self.interval = interval
+        self.samples = collections.deque(maxlen=history)
+        self.clock_ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+        self.page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+        self.cpu_count = os.cpu_count() or 1
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._started = None
+        self._last_time = None
+        self._last_ticks = None
+        self._first_ticks = None
+        self._first_blkio = None
+        self._max_ticks = 0
+        self._max_blkio = 0
+        self._max_read = 0
+        self._max_write = 0
+        self._first_read = None
+        self._first_write = None
+        self.peak_rss = 0
+        self.peak_process_rss = 0
+
+    def start(self):
+        self._started = time.monotonic()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.summary()
+
+    def summary(self):
+        duration = time.monotonic() - self._started if self._started else 0.0
+        cpu_ticks = self._max_ticks - (self._first_ticks or 0)
+        blkio_ticks = self._max_blkio - (self._first_blkio or 0)
+        return ResourceSummary(
+            duration=duration,
+            samples=len(self.samples),
+            peak_rss=self.peak_rss,
+            peak_process_rss=self.peak_process_rss,
+            read_bytes=self._max_read - (self._first_read or 0),
+            write_bytes=self._max_write - (self._first_write or 0),
+            cpu_seconds=max(cpu_ticks, 0) / self.clock_ticks,
+            io_wait_seconds=max(blkio_ticks, 0) / self.clock_ticks,
+            mem_total=read_meminfo().get("MemTotal", 0),
+            cpu_count=self.cpu_count,
+        )
+
+    def _run(self):
+        while True:
+            self.sample()
+            if self._stop_event.wait(self.interval):
+                break
+
+    def process_tree(self):
+        children = collections.defaultdict(list)
+        stats = {}
+        for entry in os.listdir(PROC_ROOT):
+            if not entry.isdigit():
+                continue
+            fields = self._read_stat(int(entry))
+            if fields is None:
+                continue
+            stats[int(entry)] = fields
+            children[int(fields[1])].append(int(entry))
+        tree = {}
+        pending = [self.pid]
+        while pending:
+            pid = pending.pop()
+            if pid in tree or pid not in stats:
+                continue
+            tree[pid] = stats[pid]
+            pending.extend(children.get(pid, ()))
+        return tree
+
+    def sample(self):
+        tree = self.process_tree()
+        if not tree:
+            return None
+        now = time.monotonic()
+        ticks = 0
+        blkio = 0
+        rss = 0
+        read_bytes = 0
+        write_bytes = 0
+        for pid, fields in tree.items():
+            # utime, stime, cutime and cstime: reaped children roll into their parent.
+            ticks += sum(int(value) for value in fields[11:15])
+            process_rss = int(fields[21]) * self.page_size
+            rss += process_rss
+            if pid != self.pid:
+                self.peak_process_rss = max(self.peak_process_rss, process_rss)
+            if len(fields) > 39:
+                blkio += int(fields[39])
+            io = self._read_io(pid)
+            read_bytes += io.get("read_bytes", 0)
+            write_bytes += io.get("write_bytes", 0)
+
+        if self._first_ticks is None:
+            self._first_ticks = ticks
+            self._first_blkio = blkio
+            self._first_read = read_bytes
+            self._first_write = write_bytes
+        self._max_ticks = max(self._max_ticks, ticks)
+        self._max_blkio = max(self._max_blkio, blkio)
+        self._max_read = max(self._max_read, read_bytes)
+        self._max_write = max(self._max_write, write_bytes)
+        self.peak_rss = max(self.peak_rss, rss)
+
+        cpu_percent = 0.0
+        if self._last_time is not None and now > self._last_time:
+            delta = max(ticks - self._last_ticks, 0) / self.clock_ticks
+            cpu_percent = 100.0 * delta / (now - self._last_time)
+        self._last_time = now
+        self._last_ticks = ticks
+
+        sample = ProcessSample(now, cpu_percent, rss, read_bytes, write_bytes, len(tree))
+        self.samples.append(sample)
+        return sample
+
+    def _read_stat(self, pid):
+        try:
+            with open(os.path.join(PROC_ROOT, str(pid), "stat")) as handle:
+                data = handle.read()
+        except OSError:
+            return None
+        # The command name may contain spaces, so split after its closing paren.
+        return data[data.rfind(")") + 2:].split()
+
+    def _read_io(self, pid):
+        io = {}
+        try:
+            with open(os.path.join(PROC_ROOT, str(pid), "io")) as handle:
+                for line in handle:
+                    key, _, value = line.partition(":")
+                    io[key] = int(value)
+        except (OSError, ValueError):
+            pass
+        return io
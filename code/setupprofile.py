@@ -0,0 +1,218 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+import collections
+import os
+import pstats
+import re
+import time
+
+INTERPRETER_PROFILE = "profile-interpreter.log"
+
+SUBPROJECT_PREFIX = re.compile(r"^([\w.+-]+)\| ?(.*)$")
+TIMESTAMP = re.compile(r"^\[(\d+\.\d+)\] ?(.*)$")
+QUOTED = re.compile(r"\"([^\"]+)\"|'([^']+)'")
+STEP_KINDS = (
+    ("dependency", re.compile(r"^(?:Run-time dependency|Build-time dependency|Dependency) (\S+) found")),
+    ("dependency", re.compile(r"^Library (\S+) found")),
+    ("dependency", re.compile(r"^Found (pkg-config|CMake)")),
+    ("program", re.compile(r"^Program (\S+) found")),
+    ("compiler detection", re.compile(r"^(.+? (?:compiler|linker)) for the \w+ machine")),
+    ("compiler check", re.compile(
+        r"^(?:Checking|Has header|Check usable header|Header|Fetching value|Compiler for|Does)\b.*?(?= : |:\s*(?:YES|NO)|$)"
+    )),
+)
+# Interpreter entry points worth reporting from meson's own cProfile dump.
+HOTSPOT = re.compile(r"^(func_\w+|\w+_method)$")
+
+
+def split_line(line):
+    # Returns (subproject, timestamp, text); meson puts the subproject prefix
+    # in front of the "[seconds]" stamp that --profile-self adds.
+    subproject = None
+    line = line.rstrip("\n")
+    match = SUBPROJECT_PREFIX.match(line)
+    if match:
+        subproject, line = match.groups()
+    match = TIMESTAMP.match(line)
+    if match:
+        return subproject, float(match.group(1)), match.group(2).strip()
+    return subproject, None, line.strip()
+
+
+def classify(text):
+    # Returns (kind, label, name); name is what a meson.build would quote.
+    for kind, pattern in STEP_KINDS:
+        match = pattern.match(text)
+        if match is None:
+            continue
+        if kind == "compiler check":
+            label = match.group(0).strip()
+            quoted = QUOTED.search(label)
+            return kind, label, (quoted.group(1) or quoted.group(2)) if quoted else None
+        if kind == "compiler detection":
+            return kind, text.partition(":")[0], None
+        return kind, text, match.group(1)
+    return None, text, None
+
+
+class ProfileStep:
+    def __init__(self, kind, label, seconds, subproject=None, name=None):
+        self.kind = kind
+        self.label = label
+        self.seconds = seconds
+        self.subproject = subproject
+        self.name = name
+
+
+class OutputTimeline:
+    # Records when each output line arrived, for meson versions whose
+    # --profile-self does not stamp the lines itself.
+    def __init__(self, on_output=None, clock=time.monotonic):
+        self.on_output = on_output
+        self.clock = clock
+        self.lines = []
+
+    def __call__(self, line):
+        self.lines.append((self.clock(), line))
+        if self.on_output is not None:
+            self.on_output(line)
+
+
+class SetupProfile:
+    def __init__(self, steps, total, hotspots=None):
+        self.steps = steps
+        self.total = total
+        self.hotspots = hotspots or []
+
+    @classmethod
+    def from_lines(cls, timed_lines):
+        # A check's result line is printed once the check finishes, so each
+        # line is charged with the time since the previous one.
+        parsed = [(arrival, split_line(line)) for arrival, line in timed_lines]
+        stamped = any(stamp is not None for _, (_, stamp, _) in parsed)
+        steps = []
+        previous = None
+        first = None
+        for arrival, (subproject, stamp, text) in parsed:
+            moment = stamp if stamped else arrival
+            if moment is None:
+                continue
+            if first is None:
+                first = previous = moment
+            elapsed = max(moment - previous, 0.0)
+            previous = moment
+            if not text:
+                continue
+            kind, label, name = classify(text)
+            steps.append(ProfileStep(kind or "other", label, elapsed, subproject, name))
+        total = previous - first if first is not None else 0.0
+        return cls(steps, total)
+
+    def costliest(self, kind, limit=10):
+        steps = [step for step in self.steps if step.kind == kind]
+        return sorted(steps, key=lambda step: step.seconds, reverse=True)[:limit]
+
+    def by_kind(self):
+        totals = collections.Counter()
+        for step in self.steps:
+            totals[step.kind] += step.seconds
+        return totals.most_common()
+
+    def by_subproject(self):
+        totals = collections.Counter()
+        for step in self.steps:
+            totals[step.subproject or "(main project)"] += step.seconds
+        return totals.most_common()
+
+    def by_file(self, source_dir):
+        # Meson does not say which meson.build it is evaluating, so checks and
+        # lookups are charged to the build files that name them; a name used
+        # by several files is split between them.
+        files = meson_build_files(source_dir)
+        totals = collections.Counter()
+        for step in self.steps:
+            if step.name is None or step.kind not in ("dependency", "program", "compiler check"):
+                continue
+            root = os.path.join("subprojects", step.subproject) + os.sep if step.subproject else None
+            candidates = [
+                path for path, text in files.items()
+                if (path.startswith(root) if root else not path.startswith("subprojects" + os.sep))
+                and (f"'{step.name}'" in text or f'"{step.name}"' in text)
+            ]
+            for path in candidates:
+                totals[path] += step.seconds / len(candidates)
+        return totals.most_common()
+
+    def format(self, source_dir=None, limit=10):
+        lines = [f"Setup took {self.total:.2f}s."]
+        lines.append("Time by step kind:")
+        lines.extend(f"  {kind}: {seconds:.2f}s" for kind, seconds in self.by_kind())
+        subprojects = self.by_subproject()
+        if len(subprojects) > 1:
+            lines.append("Time by subproject:")
+            lines.extend(f"  {name}: {seconds:.2f}s" for name, seconds in subprojects)
+        if source_dir is not None:
+            files = self.by_file(source_dir)[:limit]
+            if files:
+                lines.append("Costliest meson.build files (checks and lookups they trigger):")
+                lines.extend(f"  {path}: {seconds:.2f}s" for path, seconds in files)
+        for kind, title in (("dependency", "Costliest dependency lookups:"),
+                            ("compiler check", "Costliest compiler checks:")):
+            steps = self.costliest(kind, limit)
+            if steps:
+                lines.append(title)
+                lines.extend(
+                    f"  {step.seconds:.2f}s {step.subproject + '| ' if step.subproject else ''}{step.label}"
+                    for step in steps
+                )
+        if self.hotspots:
+            lines.append("Interpreter hot spots (cumulative, from meson's profile):")
+            lines.extend(f"  {seconds:.2f}s {calls}x {name}" for name, calls, seconds in self.hotspots[:limit])
+        return "\n".join(lines) + "\n"
+
+
+def meson_build_files(source_dir):
+    files = {}
+    for root, dirs, names in os.walk(source_dir):
+        # Skip build dirs and VCS metadata; both start with a dot or hold meson-private.
+        dirs[:] = [
+            name for name in dirs
+            if not name.startswith(".") and not os.path.isdir(os.path.join(root, name, "meson-private"))
+        ]
+        if "meson.build" in names:
+            path = os.path.join(root, "meson.build")
+            try:
+                with open(path, encoding="utf-8", errors="replace") as handle:
+                    files[os.path.relpath(path, source_dir)] = handle.read()
+            except OSError:
+                continue
+    return files
+
+
+def profile_hotspots(build_dir):
+    # Cumulative time of meson's interpreter functions, e.g. func_dependency or
+    # has_header_method, across all calls.
+    path = os.path.join(build_dir, "meson-logs", INTERPRETER_PROFILE)
+    try:
+        stats = pstats.Stats(path)
+    except (OSError, TypeError, ValueError, EOFError):
+        return []
+    hotspots = collections.defaultdict(lambda: [0, 0.0])
+    for (_, _, function), (_, calls, _, cumulative, _) in stats.stats.items():
+        if HOTSPOT.match(function):
+            hotspots[function][0] += calls
+            hotspots[function][1] += cumulative
+    return sorted(
+        ((name, calls, seconds) for name, (calls, seconds) in hotspots.items()),
+        key=lambda hotspot: hotspot[2], reverse=True,
+    )
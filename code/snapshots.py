@@ -0,0 +1,223 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+import errno
+import os
+import shutil
+import time
+
+from code.statedir import load_json, save_json
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+FICLONE = 0x40049409
+SNAPSHOT_FILE = "snapshot.json"
+# Files ninja and meson update in place; a hardlink would let the next build
+# rewrite the snapshot's copy too.
+MUTABLE_FILES = {".ninja_log", ".ninja_deps", "build.ninja", "compile_commands.json"}
+MUTABLE_DIRS = {"meson-private", "meson-info", "meson-logs", ".fossil-builddir"}
+UNSUPPORTED = {errno.EOPNOTSUPP, errno.EXDEV, errno.EINVAL, errno.ENOTTY, errno.EPERM, errno.ENOSYS}
+
+
+def snapshots_root(build_dir):
+    # A sibling of the build dir: same filesystem, so reflinks, hardlinks and
+    # the rename that swaps a snapshot in all work.
+    build_dir = os.path.abspath(build_dir)
+    return os.path.join(os.path.dirname(build_dir), f".{os.path.basename(build_dir)}.snapshots")
+
+
+def is_mutable(relpath):
+    parts = relpath.split(os.sep)
+    return parts[-1] in MUTABLE_FILES or parts[0] in MUTABLE_DIRS
+
+
+def reflink(source, destination):
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    shutil.copystat(source, destination)
+
+
+class SnapshotCopier:
+    # Tries reflink, then hardlink, then a plain copy, and stops trying a
+    # method for the rest of the tree once the filesystem refuses it.
+    def __init__(self, methods=("reflink", "hardlink", "copy")):
+        self.methods = [method for method in methods if method != "reflink" or fcntl is not None]
+        self.counts = {}
+
+    def copy(self, source, destination, mutable):
+        for method in self.methods:
+            if mutable and method == "hardlink":
+                continue
+            try:
+                if method == "reflink":
+                    reflink(source, destination)
+                elif method == "hardlink":
+                    os.link(source, destination)
+                else:
+                    shutil.copy2(source, destination)
+            except OSError as e:
+                if method == "copy" or e.errno not in UNSUPPORTED:
+                    raise
+                if os.path.lexists(destination):
+                    os.remove(destination)
+                self.methods.remove(method)
+                continue
+            self.counts[method] = self.counts.get(method, 0) + 1
+            return method
+        raise OSError(errno.EOPNOTSUPP, f"Cannot copy {source}")
+
+
+class BuildSnapshots:
+    def __init__(self, build_dir, max_snapshots=3, methods=("reflink", "hardlink", "copy")):
+        self.build_dir = os.path.abspath(build_dir)
+        self.root = snapshots_root(build_dir)
+        self.max_snapshots = max_snapshots
+        self.methods = methods
+
+    def path_for(self, snapshot_id):
+        return os.path.join(self.root, snapshot_id)
+
+    def list(self):
+        snapshots = []
+        try:
+            names = os.listdir(self.root)
+        except OSError:
+            return snapshots
+        for name in names:
+            info = load_json(os.path.join(self.root, name, SNAPSHOT_FILE))
+            if info is not None and os.path.isdir(os.path.join(self.root, name, "tree")):
+                snapshots.append(info)
+        return sorted(snapshots, key=lambda info: info["created"], reverse=True)
+
+    def new_id(self):
+        created = time.time()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(created))
+        snapshot_id = base = f"{stamp}-{int(created * 1000) % 1000:03d}"
+        # A restore right after a create can land in the same millisecond.
+        suffix = 1
+        while os.path.lexists(self.path_for(snapshot_id)):
+            snapshot_id = f"{base}-{suffix}"
+            suffix += 1
+        return snapshot_id, created
+
+    def record(self, snapshot_id, created, label, methods=None):
+        path = self.path_for(snapshot_id)
+        tree = os.path.join(path, "tree")
+        manifest = {}
+        size = 0
+        for directory, _, files in os.walk(tree):
+            for name in files:
+                file_path = os.path.join(directory, name)
+                if os.path.islink(file_path):
+                    continue
+                stat = os.stat(file_path)
+                manifest[os.path.relpath(file_path, tree)] = [stat.st_size, stat.st_mtime_ns]
+                size += stat.st_size
+        info = {
+            "id": snapshot_id,
+            "label": label,
+            "created": created,
+            "files": len(manifest),
+            "size": size,
+            "methods": methods if methods is not None else {"moved": len(manifest)},
+        }
+        save_json(os.path.join(path, "manifest.json"), manifest)
+        save_json(os.path.join(path, SNAPSHOT_FILE), info)
+        return info
+
+    def create(self, label):
+        snapshot_id, created = self.new_id()
+        path = self.path_for(snapshot_id)
+        copier = SnapshotCopier(self.methods)
+        try:
+            for directory, dirs, files in os.walk(self.build_dir):
+                relative = os.path.relpath(directory, self.build_dir)
+                target = os.path.normpath(os.path.join(path, "tree", relative))
+                os.makedirs(target, exist_ok=True)
+                for name in [name for name in dirs if os.path.islink(os.path.join(directory, name))]:
+                    os.symlink(os.readlink(os.path.join(directory, name)), os.path.join(target, name))
+                    dirs.remove(name)
+                for name in files:
+                    source_path = os.path.join(directory, name)
+                    if os.path.islink(source_path):
+                        os.symlink(os.readlink(source_path), os.path.join(target, name))
+                    else:
+                        relpath = os.path.normpath(os.path.join(relative, name))
+                        copier.copy(source_path, os.path.join(target, name), is_mutable(relpath))
+        except OSError:
+            shutil.rmtree(path, ignore_errors=True)
+            raise
+        info = self.record(snapshot_id, created, label, copier.counts)
+        self.prune()
+        return info
+
+    def verify(self, snapshot_id):
+        # Returns the files whose size or mtime changed since the snapshot; a
+        # hardlinked output the compiler rewrote in place shows up here.
+        path = self.path_for(snapshot_id)
+        manifest = load_json(os.path.join(path, "manifest.json"), {})
+        stale = []
+        for relpath, (size, mtime_ns) in manifest.items():
+            try:
+                stat = os.stat(os.path.join(path, "tree", relpath))
+            except OSError:
+                stale.append(relpath)
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+                stale.append(relpath)
+        return sorted(stale)
+
+    def restore(self, snapshot_id, keep_current=True):
+        # Two renames swap the snapshot in, so nothing is copied and every
+        # restored file keeps the mtime ninja recorded for it. Returns (stale
+        # files dropped, snapshot made of the replaced tree or None).
+        path = self.path_for(snapshot_id)
+        tree = os.path.join(path, "tree")
+        if not os.path.isdir(tree):
+            raise ValueError(f"No snapshot '{snapshot_id}' for {self.build_dir}")
+        stale = self.verify(snapshot_id)
+        for relpath in stale:
+            # Without the file ninja rebuilds just that output instead of
+            # trusting contents that belong to a later build.
+            if os.path.lexists(os.path.join(tree, relpath)):
+                os.remove(os.path.join(tree, relpath))
+        label = load_json(os.path.join(path, SNAPSHOT_FILE), {}).get("label", snapshot_id)
+        current = None
+        if os.path.isdir(self.build_dir):
+            current_id, created = self.new_id()
+            os.makedirs(self.path_for(current_id))
+            os.rename(self.build_dir, os.path.join(self.path_for(current_id), "tree"))
+            os.rename(tree, self.build_dir)
+            if keep_current:
+                current = self.record(current_id, created, f"before restoring '{label}'")
+            else:
+                self.delete(current_id)
+        else:
+            os.rename(tree, self.build_dir)
+        self.delete(snapshot_id)
+        self.prune()
+        return stale, current
+
+    def delete(self, snapshot_id):
+        shutil.rmtree(self.path_for(snapshot_id), ignore_errors=True)
+
+    def prune(self):
+        for info in self.list()[self.max_snapshots:]:
+            self.delete(info["id"])
+
+
+def format_snapshot(info):
+    methods = ", ".join(f"{count} {method}" for method, count in sorted(info.get("methods", {}).items()))
+    return f"{info['id']} '{info['label']}': {info['files']} files ({methods})"
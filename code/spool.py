@@ -0,0 +1,143 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+import collections
+import tempfile
+import threading
+
+from code.sampler import format_bytes
+
+SPOOL_THRESHOLD = 1 << 20
+
+
+class CommandOutput:
+    # Command output kept in memory up to a threshold and spooled to an
+    # anonymous temporary file beyond it.
+    def __init__(self, threshold=SPOOL_THRESHOLD):
+        self._file = tempfile.SpooledTemporaryFile(max_size=threshold, mode="w+b")
+        self._lock = threading.Lock()
+        self.header = ""
+        self.size = 0
+        self.line_count = 0
+
+    def __len__(self):
+        return len(self.header) + self.size
+
+    def __str__(self):
+        return self.read()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def spooled(self):
+        return getattr(self._file, "_rolled", False)
+
+    def write(self, text):
+        data = text.encode("utf-8", "replace")
+        with self._lock:
+            self._file.seek(0, 2)
+            self._file.write(data)
+            self.size += len(data)
+            self.line_count += text.count("\n")
+
+    def chunks(self, size=1 << 16):
+        # Reads hold the lock per chunk, so a build can keep writing meanwhile.
+        position = 0
+        while True:
+            with self._lock:
+                self._file.seek(position)
+                data = self._file.read(size)
+            if not data:
+                return
+            position += len(data)
+            yield data
+
+    def lines(self):
+        if self.header:
+            yield from self.header.splitlines(keepends=True)
+        pending = b""
+        for data in self.chunks():
+            pending += data
+            *complete, pending = pending.split(b"\n")
+            for line in complete:
+                yield line.decode("utf-8", "replace") + "\n"
+        if pending:
+            yield pending.decode("utf-8", "replace")
+
+    def read(self):
+        return self.header + b"".join(self.chunks()).decode("utf-8", "replace")
+
+    def tail(self, lines=200, max_bytes=1 << 18):
+        with self._lock:
+            start = max(self.size - max_bytes, 0)
+            self._file.seek(start)
+            data = self._file.read(max_bytes)
+        text = data.decode("utf-8", "replace")
+        if start:
+            # The first line was cut by the byte limit.
+            text = text.partition("\n")[2]
+        return "".join(collections.deque(text.splitlines(keepends=True), maxlen=lines))
+
+    def display(self, lines=2000):
+        if self.line_count <= lines:
+            return self.read()
+        tail = self.tail(lines)
+        hidden = self.line_count - tail.count("\n")
+        return (
+            f"{self.header}[{hidden} earlier lines of {format_bytes(self.size)} output not shown]\n"
+            f"{tail}"
+        )
+
+    def save(self, path):
+        with open(path, "wb") as handle:
+            handle.write(self.header.encode("utf-8"))
+            for data in self.chunks():
+                handle.write(data)
+
+    def close(self):
+        self._file.close()
+
+
+class CommandResult:
+    # What one command produced: its output together with its own exit status
+    # and resource summary, so concurrent actions never read each other's.
+    def __init__(self, output, returncode, resources=None, run_id=None):
+        self.output = output
+        self.returncode = returncode
+        self.resources = resources
+        self.run_id = run_id
+
+    def __str__(self):
+        return str(self.output)
+
+    def __len__(self):
+        return len(self.output)
+
+    @property
+    def ok(self):
+        return self.returncode == 0
+
+    def with_output(self, output):
+        return CommandResult(output, self.returncode, self.resources, self.run_id)
+
+
+def prepend(header, output):
+    if isinstance(output, CommandResult):
+        return output.with_output(prepend(header, output.output))
+    if isinstance(output, CommandOutput):
+        output.header = header + output.header
+        return output
+    return header + output
@@ -0,0 +1,47 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+import json
+import os
+
+STATE_DIR_NAME = ".fossil-builddir"
+
+
+def build_state_dir(build_dir):
+    path = os.path.join(build_dir, STATE_DIR_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def user_cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA")
+    if not base:
+        base = os.path.join(os.path.expanduser("~"), ".cache")
+    path = os.path.join(base, "fossil-builddir")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def load_json(path, default=None):
+    try:
+        with open(path) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return default
+
+
+def save_json(path, data):
+    # Write through a temporary file so readers never see a half-written state.
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as handle:
+        json.dump(data, handle, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
@@ -0,0 +1,108 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+import tkinter as tk
+from tkinter import ttk
+
+THEMES = {
+    "light": {
+        "background": "white",
+        "foreground": "black",
+        "button_background": "white",
+        "button_foreground": "black",
+        "terminal_background": "black",
+        "terminal_foreground": "white",
+    },
+    "dark": {
+        "background": "black",
+        "foreground": "light blue",
+        "button_background": "black",
+        "button_foreground": "blue",
+        "terminal_background": "black",
+        "terminal_foreground": "light blue",
+    },
+    "meson": {
+        "background": "dark gray",
+        "foreground": "black",
+        "button_background": "#ADD8E6",
+        "button_foreground": "black",
+        "terminal_background": "black",
+        "terminal_foreground": "white",
+    },
+}
+
+
+def style_settings(palette):
+    return {
+        ".": {"configure": {
+            "background": palette["background"],
+            "foreground": palette["foreground"],
+            "fieldbackground": palette["background"],
+            "insertcolor": palette["foreground"],
+        }},
+        "TEntry": {"configure": {"fieldbackground": palette["background"]}},
+        "TButton": {"configure": {
+            "background": palette["button_background"],
+            "foreground": palette["button_foreground"],
+        }},
+        "Blue.TButton": {"configure": {
+            "background": palette["button_background"],
+            "foreground": palette["button_foreground"],
+            "font": ("Helvetica", 10, "bold"),
+        }},
+        "Path.TLabel": {"configure": {
+            "background": palette["background"],
+            "foreground": palette["foreground"],
+            "font": ("Helvetica", 10, "bold"),
+        }},
+        "Treeview": {"configure": {"fieldbackground": palette["background"]}},
+    }
+
+
+class ThemeEngine:
+    # Every palette becomes a ttk theme the first time it is used, so a switch
+    # is a single theme_use: ttk restyles all widgets itself instead of us
+    # configuring them one by one.
+    def __init__(self, root, themes=THEMES):
+        self.root = root
+        self.themes = themes
+        self.style = ttk.Style(root)
+        self.parent_theme = self.style.theme_use()
+        self.current = None
+
+    @staticmethod
+    def ttk_name(name):
+        return f"fossil-{name}"
+
+    @property
+    def palette(self):
+        return self.themes[self.current]
+
+    def ensure(self, name):
+        if self.ttk_name(name) not in self.style.theme_names():
+            self.style.theme_create(
+                self.ttk_name(name), parent=self.parent_theme, settings=style_settings(self.themes[name])
+            )
+
+    def use(self, name):
+        if name not in self.themes:
+            raise ValueError(f"Unknown theme '{name}'")
+        self.ensure(name)
+        self.style.theme_use(self.ttk_name(name))
+        self.current = name
+        background = self.palette["background"]
+        # Plain Tk windows are not styled by ttk; they only need their own background.
+        self.root.option_add("*Toplevel.background", background)
+        self.root.configure(bg=background)
+        for child in self.root.winfo_children():
+            if isinstance(child, tk.Toplevel):
+                child.configure(bg=background)
@@ -0,0 +1,181 @@
+#
+# ==============================================================================
+# Author: Michael Gene Brockus (Dreamer)
+# Email: michaelbrockus@gmail.com
+# Organization: Fossil Logic
+# Description:
+#     This file is part of the Fossil Logic project, where innovation meets
+#     excellence in software development. Michael Gene Brockus, also known as
+#     "Dreamer," is a dedicated contributor to this project. For any inquiries,
+#     feel free to contact Michael at michaelbrockus@gmail.com.
+# ==============================================================================
+#
+import concurrent.futures
+import os
+import time
+
+from code.buildcache import is_build_dir
+from code.statedir import load_json, save_json
+
+WORKSPACE_FILE = "workspace.json"
+
+
+class WorkspaceProject:
+    def __init__(self, name, source_dir, build_dir, depends=()):
+        self.name = name
+        self.source_dir = source_dir
+        self.build_dir = build_dir
+        self.depends = list(depends)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "source_dir": self.source_dir,
+            "build_dir": self.build_dir,
+            "depends": self.depends,
+        }
+
+
+class Workspace:
+    def __init__(self, path=WORKSPACE_FILE):
+        self.path = path
+        data = load_json(path, {})
+        self.max_parallel = data.get("max_parallel", 2)
+        self.jobs = data.get("jobs", os.cpu_count() or 1)
+        self.projects = [
+            WorkspaceProject(entry["name"], entry["source_dir"], entry["build_dir"], entry.get("depends", ()))
+            for entry in data.get("projects", [])
+        ]
+
+    def save(self):
+        save_json(self.path, {
+            "max_parallel": self.max_parallel,
+            "jobs": self.jobs,
+            "projects": [project.to_dict() for project in self.projects],
+        })
+
+    def project(self, name):
+        for project in self.projects:
+            if project.name == name:
+                return project
+        return None
+
+    def add(self, project):
+        if self.project(project.name) is not None:
+            raise ValueError(f"A project named '{project.name}' is already in the workspace.")
+        self.projects.append(project)
+        try:
+            self.build_order()
+        except ValueError:
+            self.projects.remove(project)
+            raise
+
+    def remove(self, name):
+        self.projects = [project for project in self.projects if project.name != name]
+        for project in self.projects:
+            if name in project.depends:
+                project.depends.remove(name)
+
+    def build_order(self):
+        names = {project.name for project in self.projects}
+        for project in self.projects:
+            unknown = [name for name in project.depends if name not in names]
+            if unknown:
+                raise ValueError(f"{project.name} depends on unknown projects: {', '.join(unknown)}")
+        order = []
+        done = set()
+        remaining = list(self.projects)
+        while remaining:
+            ready = [project for project in remaining if set(project.depends) <= done]
+            if not ready:
+                cycle = ", ".join(project.name for project in remaining)
+                raise ValueError(f"Dependency cycle between: {cycle}")
+            for project in ready:
+                order.append(project)
+                done.add(project.name)
+                remaining.remove(project)
+        return order
+
+
+class WorkspaceBuilder:
+    def __init__(self, workspace, build_factory, on_status=None):
+        self.workspace = workspace
+        self.build_factory = build_factory
+        self.on_status = on_status
+        self.status = {}
+        self.outputs = {}
+
+    def set_status(self, name, status, detail=""):
+        self.status[name] = status
+        if self.on_status is not None:
+            self.on_status(name, status, detail)
+
+    def job_share(self, free, starting):
+        # Jobs are a shared budget: a project takes its share of the jobs no
+        # running project holds and gives them back when it finishes, so the
+        # workspace as a whole never asks for more than its global limit.
+        return max(1, free // max(1, starting))
+
+    def build_project(self, project, jobs):
+        started = time.monotonic()
+        meson_build = self.build_factory(project.source_dir, project.build_dir)
+        output = ""
+        if not is_build_dir(project.build_dir):
+            self.set_status(project.name, "setting up")
+            result = meson_build.setup()
+            output += str(result.output)
+            if not result.ok:
+                return False, output, time.monotonic() - started
+        self.set_status(project.name, "compiling", f"-j {jobs}")
+        result = meson_build.compile(jobs=jobs)
+        output += str(result.output)
+        return result.ok, output, time.monotonic() - started
+
+    def build(self):
+        order = self.workspace.build_order()
+        pending = list(order)
+        finished = set()
+        failed = set()
+        for project in order:
+            self.set_status(project.name, "pending")
+
+        limit = max(1, self.workspace.max_parallel)
+        free = max(1, self.workspace.jobs)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=limit) as executor:
+            running = {}
+            while pending or running:
+                for project in list(pending):
+                    if set(project.depends) & failed:
+                        pending.remove(project)
+                        failed.add(project.name)
+                        self.set_status(project.name, "skipped", "a dependency failed")
+
+                ready = [project for project in pending if set(project.depends) <= finished]
+                # A project that finds no free jobs waits for one to finish.
+                starting = ready[:min(limit - len(running), free)]
+                for index, project in enumerate(starting):
+                    jobs = self.job_share(free, len(starting) - index)
+                    free -= jobs
+                    pending.remove(project)
+                    running[executor.submit(self.build_project, project, jobs)] = project, jobs
+                if not running:
+                    break
+
+                done, _ = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    project, jobs = running.pop(future)
+                    free += jobs
+                    try:
+                        success, output, elapsed = future.result()
+                    except Exception as e:
+                        success, output, elapsed = False, f"Error: {str(e)}\n", 0.0
+                    self.outputs[project.name] = output
+                    if success:
+                        finished.add(project.name)
+                        self.set_status(project.name, "done", f"{elapsed:.1f}s")
+                    else:
+                        failed.add(project.name)
+                        self.set_status(project.name, "failed", f"{elapsed:.1f}s")
+        return not failed
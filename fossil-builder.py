@@ -15,5 +15,28 @@ if __name__ == "__main__":
         from test import test_cases
         suite = unittest.TestLoader().loadTestsFromModule(test_cases)
         unittest.TextTestRunner(verbosity=2).run(suite)
+    elif sys.argv[1] == "run" and len(sys.argv) >= 4:
+        # "run <build_dir> <program> [args...]" launches a built program with the cached devenv.
+        from code.app import MesonBuild
+        from code.devenv import DevEnvironment
+        process = DevEnvironment(MesonBuild(os.getcwd(), sys.argv[2])).launch(sys.argv[3], sys.argv[4:])
+        sys.exit(process.wait())
+    elif sys.argv[1] == "dirty" and len(sys.argv) == 3:
+        # "dirty <build_dir>" asks ninja for a dry-run plan; exits 1 when anything is out of date.
+        from code.ninjafiles import dry_run_plan
+        plan = dry_run_plan(sys.argv[2])
+        if plan is None:
+            print(f"Could not get a dry-run plan from ninja for {sys.argv[2]}.")
+            sys.exit(2)
+        print(plan.format(limit=20))
+        sys.exit(0 if plan.up_to_date else 1)
+    elif sys.argv[1] == "bench" and sys.argv[2:3] == ["scaling"]:
+        # "bench scaling" drives a real meson over generated projects of growing size.
+        from bench.bench_scaling import main as scaling_main
+        sys.exit(scaling_main(sys.argv[3:]))
+    elif sys.argv[1] == "bench":
+        # If the argument "bench" is provided, run the benchmarks against the stored baseline.
+        from bench.bench_gui import main as bench_main
+        sys.exit(bench_main(sys.argv[2:]))
     else:
-        print("Usage: python run_project.py [test]")
+        print("Usage: python run_project.py [test|bench [--update-baseline]|bench scaling [--sizes 5x5x5,...]|run <build_dir> <program> [args...]|dirty <build_dir>]")
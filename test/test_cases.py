@@ -16,10 +16,53 @@ Purpose:
 
 For more information on the Native Python Application and the Trilobite Coder Lab project, please refer to the project documentation and website.
 """
+import json
+import os
+import shutil
+import stat
+import subprocess
+import sys
+import tarfile
+import tempfile
+import threading
+import time
 import unittest
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 from tkinter import Tk
-from code.app import MesonBuildGUI, SetupDialog
+from code.app import MesonBuild, MesonBuildGUI, SetupDialog
+from bench.bench_gui import GUI_METRICS, BenchResult, compare, skipped
+from bench.fake_meson import fake_meson_on_path
+from bench.synth_project import generate_project
+from code.advisor import advise
+from code.affected import affected_target_ids, affected_tests, load_stamp, record_stamp, target_spec
+from code.buildcache import TOOLCHAIN_ENV, BuildDirCache, probe_toolchain
+from code.buildoptions import changed_arguments, load_build_options, option_key, options_by_section
+from code.coalesce import RequestCoalescer
+from code.devenv import DevEnvironment
+from code.events import EventStream, MetricsFile
+from code import dist
+from code.dist import repack_archives
+from code.fanout import header_fanout
+from code.history import RunHistory
+from code.incinstall import IncrementalInstall
+from code.mesonbench import compare_benchmarks, format_benchmarks, read_benchmark_log
+from code.ninjafiles import dry_run_plan, ninja_log_size, read_ninja_log, target_durations
+from code.parallelism import AdaptiveParallelism
+from code.ramdisk import TmpfsStaging
+from code.regression import TimingBaseline, format_regressions
+from code.sampler import ProcessTreeSampler, ResourceSummary, sampler_supported
+from code.setupprofile import SetupProfile
+from code.snapshots import BuildSnapshots
+from code.spool import CommandOutput, CommandResult
+from code.themes import THEMES, style_settings
+from code.workspace import Workspace, WorkspaceBuilder, WorkspaceProject
+
+def temp_dir(test):
+    path = tempfile.mkdtemp()
+    test.addCleanup(shutil.rmtree, path, True)
+    return path
+
 
 class TestMesonBuildGUI(unittest.TestCase):
     @classmethod
@@ -95,5 +138,1016 @@ class TestMesonBuildGUI(unittest.TestCase):
             mock_popen.assert_called_once_with(["ninja", "-C", "build_dir", "install"], cwd="build_dir")
             self.app.update_terminal.assert_called_with("Mock Output")
 
+class TestProcessTreeSampler(unittest.TestCase):
+    @unittest.skipUnless(sampler_supported(), "requires /proc")
+    def test_samples_child_processes(self):
+        script = (
+            "import subprocess, sys; "
+            "subprocess.run([sys.executable, '-c', 'x = bytearray(32 << 20); sum(range(3000000))'])"
+        )
+        process = subprocess.Popen([sys.executable, "-c", script])
+        sampler = ProcessTreeSampler(process.pid, interval=0.05).start()
+        process.wait()
+        summary = sampler.stop()
+
+        self.assertGreater(summary.samples, 0)
+        self.assertGreaterEqual(summary.peak_rss, 32 << 20)
+        self.assertTrue(any(sample.processes >= 2 for sample in sampler.samples))
+
+    def test_summary_classification(self):
+        def summary(cpu_seconds=0.0, peak_rss=0, io_wait=0.0, read_bytes=0):
+            return ResourceSummary(
+                duration=10.0, samples=20, peak_rss=peak_rss, read_bytes=read_bytes,
+                write_bytes=0, cpu_seconds=cpu_seconds, io_wait_seconds=io_wait,
+                mem_total=1000, cpu_count=4,
+            )
+
+        self.assertEqual(summary(peak_rss=900).bound(), "memory-bound")
+        self.assertEqual(summary(cpu_seconds=35.0).bound(), "CPU-bound")
+        self.assertEqual(summary(cpu_seconds=5.0, io_wait=4.0).bound(), "I/O-bound")
+        self.assertEqual(summary(read_bytes=500 << 20).bound(), "I/O-bound")
+        self.assertEqual(summary().bound(), "mostly idle/waiting")
+
+
+class TestAdaptiveParallelism(unittest.TestCase):
+    def setUp(self):
+        self.build_dir = temp_dir(self)
+
+    def test_plan_follows_load(self):
+        plan = AdaptiveParallelism(self.build_dir).plan(
+            cpu_count=8, load=3.0, available_memory=64 << 30
+        )
+        self.assertEqual(plan.jobs, 5)
+        self.assertEqual(plan.load_average, 8.0)
+
+    def test_plan_uses_recorded_edge_memory(self):
+        parallelism = AdaptiveParallelism(self.build_dir, memory_reserve=0)
+        parallelism.record(ResourceSummary(
+            duration=1.0, samples=1, peak_rss=0, read_bytes=0, write_bytes=0,
+            cpu_seconds=0.0, io_wait_seconds=0.0, mem_total=0, cpu_count=8,
+            peak_process_rss=2 << 30,
+        ))
+        plan = parallelism.plan(cpu_count=8, load=0.0, available_memory=6 << 30)
+        self.assertEqual(plan.jobs, 3)
+
+
+class TestBenchmarkHarness(unittest.TestCase):
+    def test_fake_meson_output_volume(self):
+        build = MesonBuild("source_dir", "build_dir")
+        with fake_meson_on_path(lines=250, line_size=40):
+            output = build.run_command(["meson", "compile"]).output
+            version = build.run_command(["meson", "--version"]).output
+        self.assertEqual(len(output.splitlines()), 250)
+        self.assertTrue(output.splitlines()[-1].startswith("[250/250]"))
+        self.assertEqual(version.strip(), "1.0.0-fake")
+
+    def test_compare_flags_regressions_in_both_directions(self):
+        baseline = {
+            "latency": {"value": 10.0},
+            "throughput": {"value": 100.0},
+        }
+        results = [
+            BenchResult("latency", 14.0, "ms"),
+            BenchResult("throughput", 60.0, "MiB/s", higher_is_better=True),
+            BenchResult("new_metric", 1.0, "ms"),
+        ]
+        regressions, unbaselined = compare(results, baseline, tolerance=0.25)
+        self.assertEqual([result.name for result, _, _ in regressions], ["latency", "throughput"])
+        # Gated metrics without a baseline fail, whether measured or not.
+        self.assertEqual(unbaselined, sorted(set(GUI_METRICS) | {"new_metric"}))
+        self.assertEqual(skipped(results, baseline), [])
+
+    def test_headless_run_skips_baselined_gui_metrics(self):
+        baseline = {name: {"value": 1.0} for name in GUI_METRICS + ("latency",)}
+        results = [BenchResult("latency", 1.0, "ms")]
+        self.assertEqual(compare(results, baseline), ([], []))
+        self.assertEqual(skipped(results, baseline), sorted(GUI_METRICS))
+
+    def test_synthetic_project_layout(self):
+        root = generate_project(temp_dir(self), targets=3, sources=4, tests=5)
+        self.assertEqual(sorted(os.listdir(os.path.join(root, "lib2"))), [
+            "lib2.h", "meson.build", "source0.c", "source1.c", "source2.c", "source3.c",
+        ])
+        with open(os.path.join(root, "tests", "meson.build")) as handle:
+            self.assertEqual(handle.read().count("test('"), 5)
+        with open(os.path.join(root, "lib1", "meson.build")) as handle:
+            self.assertIn("link_with: lib0", handle.read())
+
+
+class TestBuildDirCache(unittest.TestCase):
+    def setUp(self):
+        self.workspace = temp_dir(self)
+        self.source_dir = os.path.join(self.workspace, "src")
+        self.build_dir = os.path.join(self.source_dir, "builddir")
+        os.makedirs(os.path.join(self.build_dir, "meson-private"))
+        with open(os.path.join(self.source_dir, "meson.build"), "w") as handle:
+            handle.write("project('demo', 'c')\n")
+        with open(os.path.join(self.build_dir, "build.ninja"), "w") as handle:
+            handle.write("# generated\n")
+        self.cache = BuildDirCache(os.path.join(self.workspace, "cache"))
+        patcher = patch.object(BuildDirCache, "toolchain_identity", return_value=["cc=test"])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_key_tracks_sources_and_options(self):
+        key = self.cache.key_for(self.source_dir, self.build_dir, "-Dfoo=1")
+        self.assertEqual(key, self.cache.key_for(self.source_dir, self.build_dir, "  -Dfoo=1 "))
+        self.assertNotEqual(key, self.cache.key_for(self.source_dir, self.build_dir, "-Dfoo=2"))
+        with open(os.path.join(self.source_dir, "meson.build"), "a") as handle:
+            handle.write("# edit\n")
+        self.assertNotEqual(key, self.cache.key_for(self.source_dir, self.build_dir, "-Dfoo=1"))
+
+    def test_key_is_shared_by_checkouts_at_other_paths(self):
+        key = self.cache.key_for(self.source_dir, self.build_dir, "")
+        copy = os.path.join(self.workspace, "copy")
+        shutil.copytree(self.source_dir, copy)
+        self.assertEqual(key, self.cache.key_for(copy, os.path.join(copy, "builddir"), ""))
+        self.assertNotEqual(key, self.cache.key_for(copy, os.path.join(copy, "other"), ""))
+
+    def test_toolchain_is_probed_once_per_process(self):
+        probe_toolchain.cache_clear()
+        self.addCleanup(probe_toolchain.cache_clear)
+        environment = tuple((name, os.environ.get(name, "")) for name in TOOLCHAIN_ENV + ("PATH",))
+        completed = subprocess.CompletedProcess([], 0, stdout="tool 1.0\n")
+        with patch("code.buildcache.subprocess.run", return_value=completed) as run:
+            first = probe_toolchain(environment)
+            calls = run.call_count
+            self.assertEqual(probe_toolchain(environment), first)
+            self.assertEqual(run.call_count, calls)
+
+    def test_store_restore_and_evict(self):
+        key = self.cache.key_for(self.source_dir, self.build_dir, "")
+        self.cache.store(key, self.source_dir, self.build_dir)
+        stored_mtime = os.stat(os.path.join(self.source_dir, "meson.build")).st_mtime_ns
+
+        shutil.rmtree(self.build_dir)
+        touched = stored_mtime + 10**9
+        os.utime(os.path.join(self.source_dir, "meson.build"), ns=(1, touched))
+        self.assertTrue(self.cache.restore(key, self.source_dir, self.build_dir))
+        self.assertTrue(os.path.exists(os.path.join(self.build_dir, "build.ninja")))
+        # Sources keep their mtimes; the restored tree is made at least as new.
+        self.assertEqual(os.stat(os.path.join(self.source_dir, "meson.build")).st_mtime_ns, touched)
+        self.assertGreaterEqual(os.stat(os.path.join(self.build_dir, "build.ninja")).st_mtime_ns, touched)
+        self.assertFalse(self.cache.restore("missing", self.source_dir, self.build_dir))
+        self.assertIn("1 hits, 1 misses", self.cache.report())
+
+        self.assertEqual(self.cache.evict(now=time.time() + 30 * 86400), [key])
+        self.assertFalse(self.cache.contains(key))
+
+    @unittest.skipUnless(shutil.which("meson") and shutil.which("ninja") and shutil.which("cc"),
+                         "requires meson, ninja and a C compiler")
+    def test_restored_build_is_up_to_date_after_checkout(self):
+        shutil.rmtree(self.build_dir)
+        with open(os.path.join(self.source_dir, "meson.build"), "w") as handle:
+            handle.write("project('demo', 'c')\nexecutable('demo', 'main.c')\n")
+        with open(os.path.join(self.source_dir, "main.c"), "w") as handle:
+            handle.write('#include "main.h"\nint main(void) { return 0; }\n')
+        open(os.path.join(self.source_dir, "main.h"), "w").close()
+        meson_build = MesonBuild(self.source_dir, self.build_dir)
+        meson_build.sample_resources = False
+        meson_build.build_cache = self.cache
+        self.assertTrue(meson_build.setup().ok)
+        self.assertTrue(meson_build.compile().ok)
+        meson_build.wait_for_cache_store()
+        self.assertEqual(len(self.cache.load_index()["entries"]), 1)
+
+        # A fresh checkout at another path: the same bytes, newer mtimes, no build dir.
+        source_dir = os.path.join(self.workspace, "checkout")
+        shutil.copytree(self.source_dir, source_dir, ignore=shutil.ignore_patterns("builddir"))
+        time.sleep(0.01)
+        checkout = time.time_ns()
+        for name in ("meson.build", "main.c", "main.h"):
+            os.utime(os.path.join(source_dir, name), ns=(checkout, checkout))
+        meson_build = MesonBuild(source_dir, os.path.join(source_dir, "builddir"))
+        meson_build.sample_resources = False
+        meson_build.build_cache = self.cache
+        result = meson_build.setup()
+        self.assertTrue(result.ok)
+        self.assertIn("Restored", str(result))
+        self.assertTrue(dry_run_plan(meson_build.build_dir).up_to_date)
+        self.assertEqual(os.stat(os.path.join(source_dir, "main.h")).st_mtime_ns, checkout)
+
+
+class TestAffectedTargets(unittest.TestCase):
+    def setUp(self):
+        self.source_dir = os.path.abspath("project")
+        self.build_dir = os.path.join(self.source_dir, "build")
+
+        def target(name, kind, subdir, filename, sources, parameters=()):
+            return {
+                "name": name, "id": f"{name}@id", "type": kind,
+                "defined_in": os.path.join(self.source_dir, subdir, "meson.build"),
+                "filename": [os.path.join(self.build_dir, filename)],
+                "target_sources": [
+                    {"sources": [os.path.join(self.source_dir, source) for source in sources]},
+                    {"linker": ["cc"], "parameters": list(parameters)},
+                ],
+                "depends": [],
+            }
+
+        self.targets = [
+            target("foo", "static library", "lib", "lib/libfoo.a", ["lib/foo.c"]),
+            target("bar", "static library", "bar", "bar/libbar.a", ["bar/bar.c"]),
+            target("prog", "executable", ".", "prog", ["main.c"], ["lib/libfoo.a"]),
+        ]
+        self.deps = {
+            "lib/libfoo.a.p/foo.c.o": [os.path.join(self.source_dir, "lib/foo.h")],
+            "prog.p/main.c.o": [os.path.join(self.source_dir, "lib/foo.h")],
+        }
+
+    def affected(self, *paths):
+        changed = {os.path.join(self.source_dir, path) for path in paths}
+        return affected_target_ids(self.build_dir, changed, self.targets, self.deps)
+
+    def test_source_change_includes_dependents(self):
+        self.assertEqual(self.affected("lib/foo.c"), {"foo@id", "prog@id"})
+        self.assertEqual(self.affected("bar/bar.c"), {"bar@id"})
+
+    def test_header_change_uses_recorded_deps(self):
+        self.assertEqual(self.affected("lib/foo.h"), {"foo@id", "prog@id"})
+        self.assertEqual(self.affected("README.md"), set())
+
+    def test_tests_follow_affected_targets(self):
+        tests = [
+            {"name": "prog_test", "cmd": [os.path.join(self.build_dir, "prog")], "depends": ["prog@id"]},
+            {"name": "bar_test", "cmd": [os.path.join(self.build_dir, "bar_test")], "depends": ["bar@id"]},
+            {"name": "script_test", "cmd": [sys.executable, os.path.join(self.source_dir, "check.py")],
+             "depends": []},
+        ]
+        changed = {os.path.join(self.source_dir, "lib/foo.c"), os.path.join(self.source_dir, "check.py")}
+        self.assertEqual(
+            affected_tests(self.build_dir, changed, self.targets, tests, self.deps),
+            ["prog_test", "script_test"],
+        )
+
+    def test_target_spec(self):
+        self.assertEqual(target_spec(self.targets[0], self.source_dir), "lib/foo:static_library")
+        self.assertEqual(target_spec(self.targets[2], self.source_dir), "prog:executable")
+
+
+class TestIncrementalInstall(unittest.TestCase):
+    def setUp(self):
+        self.workspace = temp_dir(self)
+        self.build_dir = os.path.join(self.workspace, "build")
+        self.prefix = os.path.join(self.workspace, "prefix")
+        os.makedirs(os.path.join(self.build_dir, "meson-info"))
+        self.files = {}
+        for name in ("prog", "libfoo.a"):
+            path = os.path.join(self.build_dir, name)
+            with open(path, "w") as handle:
+                handle.write(name)
+            self.files[path] = os.path.join(self.prefix, "bin", name)
+        self.write_plan()
+
+    def write_plan(self):
+        with open(os.path.join(self.build_dir, "meson-info", "intro-installed.json"), "w") as handle:
+            json.dump(self.files, handle)
+
+    def kinds(self, installer):
+        return [(action.kind, os.path.basename(action.destination)) for action in installer.diff()]
+
+    def test_copies_only_changes_and_removes_stale(self):
+        installer = IncrementalInstall(self.build_dir, destdir="")
+        self.assertEqual(self.kinds(installer), [("add", "libfoo.a"), ("add", "prog")])
+        installer.apply(installer.diff())
+        installer.save_manifest()
+        self.assertEqual(self.kinds(installer), [])
+
+        prog = os.path.join(self.build_dir, "prog")
+        with open(prog, "w") as handle:
+            handle.write("prog v2")
+        del self.files[os.path.join(self.build_dir, "libfoo.a")]
+        self.write_plan()
+        self.assertEqual(self.kinds(installer), [("update", "prog"), ("remove", "libfoo.a")])
+
+        installer.apply(installer.diff())
+        with open(os.path.join(self.prefix, "bin", "prog")) as handle:
+            self.assertEqual(handle.read(), "prog v2")
+        self.assertFalse(os.path.exists(os.path.join(self.prefix, "bin", "libfoo.a")))
+
+    def test_install_subdir_excludes_come_from_the_install_plan(self):
+        subdir = os.path.join(self.build_dir, "sub")
+        for relpath in ("keep.txt", os.path.join("skip", "x.txt"), os.path.join("drop", "y.txt")):
+            os.makedirs(os.path.dirname(os.path.join(subdir, relpath)), exist_ok=True)
+            open(os.path.join(subdir, relpath), "w").close()
+        self.files = {subdir: os.path.join(self.prefix, "share", "sub")}
+        self.write_plan()
+        plan = {"install_subdirs": {subdir: {"exclude_files": ["skip/x.txt"], "exclude_dirs": ["drop"]}}}
+        with open(os.path.join(self.build_dir, "meson-info", "intro-install_plan.json"), "w") as handle:
+            json.dump(plan, handle)
+        self.assertEqual(self.kinds(IncrementalInstall(self.build_dir, destdir="")), [("add", "keep.txt")])
+
+    def test_scripts_modes_and_strip_need_meson(self):
+        installer = IncrementalInstall(self.build_dir, destdir="")
+        mode = SimpleNamespace(perms=-1, owner=None, group=None)
+        data = SimpleNamespace(install_scripts=[], targets=[SimpleNamespace(strip=False, install_mode=mode)],
+                               data=[], symlinks=[], emptydir=[], install_umask=0o22)
+        with patch("code.incinstall.load_install_data", return_value=data):
+            self.assertEqual(installer.meson_only(), [])
+            self.assertEqual(installer.umask, 0o22)
+            data.install_scripts = ["post.sh"]
+            data.targets[0].strip = True
+            data.data = [SimpleNamespace(install_mode=SimpleNamespace(perms=0o600, owner=None, group=None))]
+            self.assertEqual(installer.meson_only(), ["1 install scripts", "stripped targets", "install_mode"])
+        with patch("code.incinstall.load_install_data", return_value=None):
+            self.assertEqual(len(installer.meson_only()), 1)
+
+    @unittest.skipUnless(shutil.which("meson") and shutil.which("ninja") and shutil.which("cc"),
+                         "requires meson, ninja and a C compiler")
+    def test_install_mode_falls_back_to_meson_install(self):
+        source_dir = os.path.join(self.workspace, "src")
+        os.makedirs(os.path.join(source_dir, "sub", "skip"))
+        with open(os.path.join(source_dir, "meson.build"), "w") as handle:
+            handle.write(
+                "project('demo', 'c')\n"
+                "install_data('secret.txt', install_mode: 'rw-------')\n"
+                "install_subdir('sub', install_dir: 'share', exclude_files: ['skip/x.txt'])\n"
+            )
+        for relpath in ("secret.txt", os.path.join("sub", "a.txt"), os.path.join("sub", "skip", "x.txt")):
+            open(os.path.join(source_dir, relpath), "w").close()
+        meson_build = MesonBuild(source_dir, os.path.join(self.workspace, "builddir"))
+        meson_build.sample_resources = False
+        with patch.dict(os.environ, {"DESTDIR": ""}):
+            self.assertTrue(meson_build.setup(f"--prefix={self.prefix}").ok)
+            result = meson_build.install_incremental()
+        self.assertTrue(result.ok)
+        installed = os.path.join(self.prefix, "share", "demo", "secret.txt")
+        # install_mode needs meson, whether or not its install data is readable here.
+        self.assertIn("meson install --only-changed", str(result))
+        self.assertEqual(stat.S_IMODE(os.stat(installed).st_mode), 0o600)
+        self.assertTrue(os.path.exists(os.path.join(self.prefix, "share", "sub", "a.txt")))
+        self.assertFalse(os.path.exists(os.path.join(self.prefix, "share", "sub", "skip", "x.txt")))
+
+
+class TestDistRepack(unittest.TestCase):
+    def test_repacks_primary_archive_in_parallel(self):
+        workspace = temp_dir(self)
+        tree = os.path.join(workspace, "tree", "demo-1.0")
+        os.makedirs(tree)
+        with open(os.path.join(tree, "meson.build"), "w") as handle:
+            handle.write("project('demo', 'c')\n")
+        dist_dir = os.path.join(workspace, "meson-dist")
+        os.makedirs(dist_dir)
+        primary = shutil.make_archive(
+            os.path.join(dist_dir, "demo-1.0"), "gztar",
+            root_dir=os.path.dirname(tree), base_dir="demo-1.0",
+        )
+
+        outputs, timings = repack_archives(primary, ["zip", "bztar"])
+
+        self.assertEqual(sorted(os.path.basename(path) for path in outputs),
+                         ["demo-1.0.tar.bz2", "demo-1.0.zip"])
+        self.assertIn("archive zip", timings)
+        self.assertTrue(os.path.exists(os.path.join(dist_dir, "demo-1.0.zip.sha256sum")))
+        with tarfile.open(os.path.join(dist_dir, "demo-1.0.tar.bz2")) as archive:
+            self.assertIn("demo-1.0/meson.build", archive.getnames())
+
+    @unittest.skipUnless(shutil.which("git"), "requires git")
+    def test_tested_build_must_match_head(self):
+        source_dir = temp_dir(self)
+        build_dir = temp_dir(self)
+        git = ["git", "-C", source_dir, "-c", "user.name=t", "-c", "user.email=t@t"]
+        subprocess.run(["git", "init", "-q", source_dir], check=True)
+        subprocess.run(git + ["commit", "-q", "--allow-empty", "-m", "one"], check=True)
+        record_stamp(build_dir, source_dir, "compile")
+        record_stamp(build_dir, source_dir, "test")
+        self.assertTrue(dist.tested_build_is_current(build_dir, source_dir))
+        subprocess.run(git + ["commit", "-q", "--allow-empty", "-m", "two"], check=True)
+        self.assertFalse(dist.tested_build_is_current(build_dir, source_dir))
+
+
+class TestDevEnvironment(unittest.TestCase):
+    def setUp(self):
+        self.build_dir = temp_dir(self)
+        os.makedirs(os.path.join(self.build_dir, "meson-private"))
+        self.coredata = os.path.join(self.build_dir, "meson-private", "coredata.dat")
+        open(self.coredata, "w").close()
+
+    def fake_meson_build(self, captured, dump):
+        def run_command(command):
+            return CommandResult(dump if "--dump" in command else "WARNING: noise\n" + json.dumps(captured), 0)
+        return MagicMock(build_dir=self.build_dir, run_command=MagicMock(side_effect=run_command))
+
+    def test_environment_is_cached_until_reconfigure(self):
+        captured = dict(os.environ, PATH="/build/dir" + os.pathsep + os.environ.get("PATH", ""),
+                        MESON_DEVENV="1")
+        dump = f'PATH="/build/dir{os.pathsep}$PATH"\nexport PATH\nMESON_DEVENV="1"\nexport MESON_DEVENV\n'
+        meson_build = self.fake_meson_build(captured, dump)
+
+        devenv = DevEnvironment(meson_build)
+        environment = devenv.environment()
+        self.assertEqual(environment["MESON_DEVENV"], "1")
+        self.assertTrue(environment["PATH"].startswith("/build/dir" + os.pathsep))
+        devenv.environment()
+        self.assertEqual(meson_build.run_command.call_count, 2)
+
+        os.utime(self.coredata, ns=(1, 1))
+        devenv.environment()
+        self.assertEqual(meson_build.run_command.call_count, 4)
+
+    def test_only_variables_devenv_defines_are_kept(self):
+        with patch.dict(os.environ, clear=False):
+            os.environ.pop("LD_LIBRARY_PATH", None)
+            captured = dict(os.environ, LD_LIBRARY_PATH="/build/lib", UNRELATED="changed")
+            dump = f'LD_LIBRARY_PATH="/build/lib{os.pathsep}$LD_LIBRARY_PATH"\nexport LD_LIBRARY_PATH\n'
+            devenv = DevEnvironment(self.fake_meson_build(captured, dump))
+            self.assertEqual(devenv.environment()["LD_LIBRARY_PATH"], "/build/lib")
+            os.environ["LD_LIBRARY_PATH"] = "/opt/lib"
+            environment = devenv.environment()
+        self.assertEqual(environment["LD_LIBRARY_PATH"], "/build/lib" + os.pathsep + "/opt/lib")
+        self.assertNotEqual(environment.get("UNRELATED"), "changed")
+
+
+class TestBuildOptions(unittest.TestCase):
+    OPTIONS = [
+        {"name": "b_lto", "value": False, "section": "base", "machine": "any", "type": "boolean"},
+        {"name": "buildtype", "value": "debug", "section": "core", "machine": "any", "type": "combo",
+         "choices": ["plain", "debug", "debugoptimized", "release"]},
+        {"name": "unity_size", "value": 4, "section": "core", "machine": "any", "type": "integer"},
+        {"name": "c_args", "value": ["-Wall"], "section": "compiler", "machine": "host", "type": "array"},
+        {"name": "pkg_config_path", "value": [], "section": "core", "machine": "build", "type": "array"},
+    ]
+
+    def test_only_changed_options_are_passed(self):
+        edited = {"b_lto": False, "buildtype": "release", "unity_size": "4", "c_args": "-Wall, -O1",
+                  "build.pkg_config_path": ""}
+        self.assertEqual(
+            changed_arguments(self.OPTIONS, edited),
+            ["-Dbuildtype=release", "-Dc_args=-Wall,-O1"],
+        )
+        self.assertEqual(changed_arguments(self.OPTIONS, {"b_lto": True}), ["-Db_lto=true"])
+
+    def test_invalid_values_are_rejected(self):
+        with self.assertRaises(ValueError):
+            changed_arguments(self.OPTIONS, {"unity_size": "many"})
+        with self.assertRaises(ValueError):
+            changed_arguments(self.OPTIONS, {"buildtype": "fast"})
+
+    def test_keys_and_sections(self):
+        self.assertEqual(option_key(self.OPTIONS[4]), "build.pkg_config_path")
+        self.assertEqual([section for section, _ in options_by_section(self.OPTIONS)],
+                         ["core", "base", "compiler"])
+
+
+class TestWorkspace(unittest.TestCase):
+    def make_workspace(self):
+        directory = temp_dir(self)
+        workspace = Workspace(os.path.join(directory, "workspace.json"))
+        workspace.max_parallel = 2
+        workspace.jobs = 8
+        for name, depends in (("core", []), ("net", ["core"]), ("ui", ["core"]), ("app", ["net", "ui"])):
+            workspace.add(WorkspaceProject(name, os.path.join(directory, name),
+                                           os.path.join(directory, name, "builddir"), depends))
+        return workspace
+
+    def test_build_order_and_cycles(self):
+        workspace = self.make_workspace()
+        order = [project.name for project in workspace.build_order()]
+        self.assertEqual(order[0], "core")
+        self.assertEqual(order[-1], "app")
+        workspace.save()
+        self.assertEqual(len(Workspace(workspace.path).projects), 4)
+        with self.assertRaises(ValueError):
+            workspace.add(WorkspaceProject("loop", "src", "build", ["loop"]))
+        self.assertIsNone(workspace.project("loop"))
+
+    def test_builds_concurrently_in_dependency_order(self):
+        workspace = self.make_workspace()
+        events = []
+
+        class FakeBuild:
+            def __init__(self, source_dir, build_dir):
+                self.name = os.path.basename(source_dir)
+
+            def setup(self, options=""):
+                return CommandResult("", 0)
+
+            def compile(self, jobs=None):
+                events.append(("start", self.name, jobs))
+                time.sleep(0.1)
+                events.append(("end", self.name, jobs))
+                return CommandResult(f"{self.name} built\n", 1 if self.name == "ui" else 0)
+
+        builder = WorkspaceBuilder(workspace, FakeBuild)
+        self.assertFalse(builder.build())
+        names = [name for kind, name, _ in events]
+        self.assertLess(names.index("core", 1), names.index("net"))
+        # net and ui overlap and share the global job limit.
+        self.assertEqual(sorted(names[2:4]), ["net", "ui"])
+        self.assertTrue(all(jobs == 4 for kind, name, jobs in events if name in ("net", "ui")))
+        self.assertEqual(builder.status["ui"], "failed")
+        self.assertEqual(builder.status["app"], "skipped")
+        self.assertNotIn("app", names)
+
+    def test_projects_starting_later_stay_within_the_job_limit(self):
+        directory = temp_dir(self)
+        workspace = Workspace(os.path.join(directory, "workspace.json"))
+        workspace.max_parallel = 3
+        workspace.jobs = 9
+        for name, depends in (("slow", []), ("base", []), ("left", ["base"]), ("right", ["base"])):
+            workspace.add(WorkspaceProject(name, os.path.join(directory, name),
+                                           os.path.join(directory, name, "builddir"), depends))
+        lock = threading.Lock()
+        in_use = []
+        peak = []
+
+        class FakeBuild:
+            def __init__(self, source_dir, build_dir):
+                self.name = os.path.basename(source_dir)
+
+            def setup(self, options=""):
+                return CommandResult("", 0)
+
+            def compile(self, jobs=None):
+                with lock:
+                    in_use.append(jobs)
+                    peak.append(sum(in_use))
+                time.sleep(0.3 if self.name == "slow" else 0.05)
+                with lock:
+                    in_use.remove(jobs)
+                return CommandResult("", 0)
+
+        self.assertTrue(WorkspaceBuilder(workspace, FakeBuild).build())
+        self.assertLessEqual(max(peak), 9)
+
+
+class TestRunHistory(unittest.TestCase):
+    def test_median_and_target_timings(self):
+        history = RunHistory(os.path.join(temp_dir(self), "history.sqlite3"))
+        now = time.time()
+        for age_days, duration, returncode in ((1, 10.0, 0), (2, 30.0, 0), (3, 20.0, 0),
+                                               (4, 99.0, 1), (45, 500.0, 0)):
+            started = now - age_days * 86400
+            run_id = history.record(["meson", "compile", "-C", "builddir"], "builddir",
+                                    started, started + duration, returncode, 100)
+        history.record(["meson", "test", "-C", "builddir"], "builddir", now, now + 2.0, 0, 10)
+        history.record_targets(run_id, {"foo.o": 1500, "bar.o": 200})
+
+        self.assertEqual(history.median_duration("builddir", "compile", 30, now=now), 20.0)
+        self.assertEqual(history.median_duration("builddir", "compile", 60, now=now), 25.0)
+        self.assertIsNone(history.median_duration("otherdir", "compile", 30, now=now))
+        self.assertEqual(history.slowest_targets("builddir", 60, now=now)[0][0], "foo.o")
+        self.assertEqual(history.recent(1)[0][1], "test")
+
+    def test_ninja_log_entries_after_offset(self):
+        build_dir = temp_dir(self)
+        with open(os.path.join(build_dir, ".ninja_log"), "w") as handle:
+            handle.write("# ninja log v5\n0\t100\t0\ta.o\tdeadbeef\n")
+        offset = ninja_log_size(build_dir)
+        with open(os.path.join(build_dir, ".ninja_log"), "a") as handle:
+            handle.write("100\t350\t0\tb.o\tbeef\n200\t260\t0\ta.o\tcafe\n")
+        self.assertEqual(target_durations(read_ninja_log(build_dir, offset)), {"b.o": 250, "a.o": 60})
+        self.assertEqual(len(read_ninja_log(build_dir)), 3)
+
+
+class TestTimingBaseline(unittest.TestCase):
+    def test_flags_only_statistical_regressions(self):
+        build_dir = temp_dir(self)
+        baseline = TimingBaseline(build_dir)
+        for jitter in (0, 40, -30, 20):
+            baseline.record({"a.o": 2000 + jitter, "b.o": 50, "app": 800})
+        regressions = baseline.check({"a.o": 4100, "b.o": 120, "app": 830, "new.o": 9000})
+        self.assertEqual([regression.output for regression in regressions], ["a.o"])
+        self.assertIn("1 targets slower", format_regressions(regressions))
+
+    def test_baseline_is_per_option_set(self):
+        build_dir = temp_dir(self)
+        TimingBaseline(build_dir).record({"a.o": 1000})
+        os.makedirs(os.path.join(build_dir, "meson-info"))
+        with open(os.path.join(build_dir, "meson-info", "intro-buildoptions.json"), "w") as handle:
+            json.dump([{"name": "buildtype", "value": "release", "section": "core", "type": "combo"}], handle)
+        self.assertEqual(TimingBaseline(build_dir).samples(), {})
+
+
+class TestCommandOutput(unittest.TestCase):
+    def test_spools_past_threshold_and_keeps_a_tail(self):
+        with CommandOutput(threshold=4096) as output:
+            for index in range(1000):
+                output.write(f"line {index}\n")
+            self.assertTrue(output.spooled)
+            self.assertEqual(output.line_count, 1000)
+            self.assertEqual(output.tail(3), "line 997\nline 998\nline 999\n")
+            self.assertEqual(sum(1 for _ in output.lines()), 1000)
+            display = output.display(10)
+            self.assertTrue(display.startswith("[990 earlier lines"))
+            self.assertTrue(display.endswith("line 999\n"))
+
+    def test_run_command_returns_a_handle_when_spooling(self):
+        build = MesonBuild("source_dir", "build_dir")
+        with fake_meson_on_path(lines=300, line_size=40, exit_code=2):
+            result = build.run_command(["meson", "compile"], spool=True)
+        output = result.output
+        self.assertIsInstance(output, CommandOutput)
+        self.assertEqual(result.returncode, 2)
+        # stderr is merged into the same spool as stdout.
+        self.assertEqual(output.line_count, 301)
+        self.assertTrue(str(output).startswith("Command 'meson compile' failed with error: "))
+        self.assertTrue(output.tail(2).startswith("[300/300]"))
+        self.assertIn("simulated failure", output.tail(1))
+
+    def test_concurrent_spooled_runs_keep_their_own_output(self):
+        build = MesonBuild("source_dir", "build_dir")
+        outputs = []
+        with fake_meson_on_path(lines=2000, line_size=40):
+            threads = [
+                threading.Thread(target=lambda: outputs.append(build.run_command(["meson", "compile"], spool=True).output))
+                for _ in range(2)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual([output.line_count for output in outputs], [2000, 2000])
+        self.assertIn(build.last_output, outputs)
+
+    def test_concurrent_runs_keep_their_own_exit_status(self):
+        build = MesonBuild("source_dir", "build_dir")
+        results = {}
+
+        def run(code, delay):
+            script = f"import time; time.sleep({delay}); raise SystemExit({code})"
+            results[code] = build.run_command([sys.executable, "-c", script])
+
+        threads = [threading.Thread(target=run, args=(3, 0.2)), threading.Thread(target=run, args=(0, 0.0))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual({code: result.returncode for code, result in results.items()}, {3: 3, 0: 0})
+        self.assertFalse(results[3].ok)
+
+
+class TestThemes(unittest.TestCase):
+    def test_every_theme_styles_the_shared_button(self):
+        for name, palette in THEMES.items():
+            settings = style_settings(palette)
+            self.assertEqual(settings["."]["configure"]["background"], palette["background"], name)
+            self.assertEqual(
+                settings["Blue.TButton"]["configure"]["background"], palette["button_background"], name
+            )
+            self.assertEqual(settings["Path.TLabel"]["configure"]["background"], palette["background"], name)
+
+
+class TestRequestCoalescer(unittest.TestCase):
+    def test_identical_requests_share_one_run(self):
+        coalescer = RequestCoalescer()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def compile_once():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "built"
+
+        first = threading.Thread(target=lambda: results.append(coalescer.run(("compile", "b"), compile_once)))
+        first.start()
+        started.wait(5)
+        joined = []
+        second = threading.Thread(target=lambda: results.append(
+            coalescer.run(("compile", "b"), compile_once, on_join=lambda: joined.append(1))
+        ))
+        second.start()
+        while not joined:
+            time.sleep(0.01)
+        release.set()
+        first.join()
+        second.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(results), [("built", False), ("built", True)])
+        # Once finished, the same request runs afresh.
+        release.set()
+        self.assertEqual(coalescer.run(("compile", "b"), compile_once), ("built", False))
+
+    def test_cached_results_expire(self):
+        now = [0.0]
+        coalescer = RequestCoalescer(clock=lambda: now[0])
+        calls = []
+
+        def version():
+            calls.append(1)
+            return ("1.0.0", len(calls))
+
+        self.assertEqual(coalescer.cached(("version",), version, 10)[0], ("1.0.0", 1))
+        now[0] = 5.0
+        self.assertEqual(coalescer.cached(("version",), version, 10), (("1.0.0", 1), True))
+        now[0] = 11.0
+        self.assertEqual(coalescer.cached(("version",), version, 10)[0], ("1.0.0", 2))
+        coalescer.cached(("failing",), version, 10, keep=lambda result: False)
+        coalescer.cached(("failing",), version, 10, keep=lambda result: False)
+        self.assertEqual(len(calls), 4)
+
+
+class TestDirtyCheck(unittest.TestCase):
+    @unittest.skipUnless(shutil.which("ninja"), "requires ninja")
+    def test_dry_run_counts_pending_steps(self):
+        build_dir = temp_dir(self)
+        with open(os.path.join(build_dir, "build.ninja"), "w") as handle:
+            handle.write(
+                "rule copy\n  command = cp $in $out\n  description = Copying $out\n"
+                "build a.out: copy a.in\nbuild b.out: copy b.in\n"
+            )
+        for name in ("a.in", "b.in"):
+            open(os.path.join(build_dir, name), "w").close()
+
+        plan = dry_run_plan(build_dir)
+        self.assertEqual((plan.pending, plan.total), (2, 2))
+        self.assertEqual(plan.format(), "2 of 2 steps pending.")
+        subprocess.run(["ninja", "-C", build_dir], capture_output=True, check=True)
+        self.assertTrue(dry_run_plan(build_dir).up_to_date)
+
+        time.sleep(0.01)
+        os.utime(os.path.join(build_dir, "b.in"))
+        plan = dry_run_plan(build_dir)
+        self.assertEqual(plan.steps, ["Copying b.out"])
+        self.assertEqual(plan.format(limit=5), "1 of 2 steps pending.\n  Copying b.out")
+
+
+class TestTmpfsStaging(unittest.TestCase):
+    @unittest.skipUnless(shutil.which("meson") and shutil.which("ninja") and shutil.which("cc"),
+                         "requires meson, ninja and a C compiler")
+    def test_build_runs_on_tmpfs_and_syncs_back(self):
+        source_dir = temp_dir(self)
+        with open(os.path.join(source_dir, "meson.build"), "w") as handle:
+            handle.write("project('demo', 'c')\nexecutable('demo', 'main.c')\n")
+        with open(os.path.join(source_dir, "main.c"), "w") as handle:
+            handle.write("int main(void) { return 0; }\n")
+        build_dir = os.path.join(source_dir, "builddir")
+        meson_build = MesonBuild(source_dir, build_dir)
+        meson_build.tmpfs = TmpfsStaging(root=temp_dir(self), reserve=0)
+
+        meson_build.setup()
+        staged = meson_build.build_dir
+        self.assertNotEqual(staged, build_dir)
+        self.assertTrue(os.path.isdir(os.path.join(staged, "meson-private")))
+        self.assertTrue(meson_build.compile().ok)
+        self.assertTrue(os.path.exists(os.path.join(build_dir, "demo")))
+        self.assertFalse(os.path.exists(os.path.join(build_dir, "meson-private")))
+
+        self.assertIsNotNone(load_stamp(build_dir, "compile"))
+
+        # A brief shortage is tolerated; a sustained one drops the staged tree
+        # and moves the build to disk.
+        meson_build.tmpfs.reserve = 1 << 62
+        for _ in range(meson_build.tmpfs.shortage_limit - 1):
+            self.assertIn("Memory is low", str(meson_build.compile()))
+            self.assertEqual(meson_build.build_dir, staged)
+        self.assertTrue(meson_build.compile().ok)
+        self.assertEqual(meson_build.build_dir, build_dir)
+        self.assertFalse(os.path.exists(staged))
+
+
+
+class TestSetupProfile(unittest.TestCase):
+    LINES = [
+        "[0.000] The Meson build system\n",
+        "[0.100] C compiler for the host machine: cc (gcc 12.2.0)\n",
+        '[0.150] Has header "stdio.h" : YES\n',
+        "[1.150] Run-time dependency zlib found: YES 1.2.13\n",
+        "Executing subproject foo for machine: host\n",
+        'foo| [1.180] Checking for function "printf" : YES\n',
+        "[1.300] Build targets in project: 1\n",
+    ]
+
+    def test_lines_are_charged_with_time_since_previous(self):
+        profile = SetupProfile.from_lines([(0, line) for line in self.LINES])
+        self.assertAlmostEqual(profile.total, 1.3)
+        self.assertEqual(profile.costliest("dependency")[0].label, "Run-time dependency zlib found: YES 1.2.13")
+        check = profile.costliest("compiler check")[0]
+        self.assertEqual((check.label, check.name), ('Has header "stdio.h"', "stdio.h"))
+        self.assertAlmostEqual(check.seconds, 0.05)
+        subprojects = dict(profile.by_subproject())
+        self.assertAlmostEqual(subprojects["foo"], 0.03)
+        self.assertIn("Costliest dependency lookups:", profile.format())
+
+    def test_unstamped_lines_use_arrival_times(self):
+        lines = [(10.0, "The Meson build system\n"), (12.5, "Run-time dependency zlib found: YES\n")]
+        profile = SetupProfile.from_lines(lines)
+        self.assertAlmostEqual(profile.costliest("dependency")[0].seconds, 2.5)
+
+    def test_checks_are_charged_to_the_build_files_naming_them(self):
+        source_dir = temp_dir(self)
+        os.makedirs(os.path.join(source_dir, "lib"))
+        os.makedirs(os.path.join(source_dir, "subprojects", "foo"))
+        for path, text in (("meson.build", "project('p', 'c')\nsubdir('lib')\n"),
+                           ("lib/meson.build", "dependency('zlib')\ncc.has_header('stdio.h')\n"),
+                           ("subprojects/foo/meson.build", "cc.has_function('printf')\n")):
+            with open(os.path.join(source_dir, path), "w") as handle:
+                handle.write(text)
+        profile = SetupProfile.from_lines([(0, line) for line in self.LINES])
+        files = dict(profile.by_file(source_dir))
+        self.assertAlmostEqual(files[os.path.join("lib", "meson.build")], 1.05)
+        self.assertAlmostEqual(files[os.path.join("subprojects", "foo", "meson.build")], 0.03)
+        self.assertNotIn("meson.build", files)
+
+
+class TestEventStream(unittest.TestCase):
+    def setUp(self):
+        self.directory = temp_dir(self)
+        self.events_path = os.path.join(self.directory, "events.jsonl")
+        self.metrics = MetricsFile(
+            os.path.join(self.directory, "builder.prom"), os.path.join(self.directory, "metrics.json")
+        )
+        self.meson_build = MesonBuild(self.directory, self.directory)
+        self.meson_build.sample_resources = False
+        self.meson_build.events = EventStream(self.events_path, self.metrics, progress_interval=0)
+
+    def read_events(self):
+        with open(self.events_path) as handle:
+            return [json.loads(line) for line in handle]
+
+    def test_streamed_job_emits_progress_and_diagnostics(self):
+        script = "print('[1/2] cc a.c'); print('a.c:3:1: warning: unused'); print('[2/2] ld app')"
+        self.meson_build.run_command([sys.executable, "-c", script], on_output=lambda line: None)
+        events = self.read_events()
+        self.assertEqual([event["event"] for event in events], ["start", "progress", "progress", "finish"])
+        self.assertEqual((events[2]["done"], events[2]["total"]), (2, 2))
+        self.assertEqual((events[-1]["returncode"], events[-1]["warnings"]), (0, 1))
+        self.assertEqual(len({event["job"] for event in events}), 1)
+
+    def test_metrics_textfile_accumulates_across_runs(self):
+        for code in (0, 0, 1):
+            self.meson_build.run_command([sys.executable, "-c", f"raise SystemExit({code})"])
+        with open(self.metrics.path) as handle:
+            text = handle.read()
+        action = os.path.basename(sys.executable)
+        self.assertIn(f'fossil_builder_jobs_total{{action="{action}",result="success"}} 2', text)
+        self.assertIn(f'fossil_builder_jobs_total{{action="{action}",result="failure"}} 1', text)
+        self.assertIn(f'fossil_builder_job_duration_seconds_count{{action="{action}"}} 3', text)
+        self.assertIn(f'fossil_builder_job_duration_seconds_bucket{{action="{action}",le="+Inf"}} 3', text)
+
+    def test_unreachable_socket_does_not_fail_the_command(self):
+        self.meson_build.events = EventStream("unix:" + os.path.join(self.directory, "missing.sock"))
+        result = self.meson_build.run_command([sys.executable, "-c", "print('ok')"])
+        self.assertEqual((result.output, result.returncode), ("ok\n", 0))
+
+
+class TestBuildAdvisor(unittest.TestCase):
+    def setUp(self):
+        self.build_dir = temp_dir(self)
+        self.source_dir = temp_dir(self)
+        sources = [os.path.join(self.source_dir, f"{name}.cpp") for name in "abcd"]
+        self.targets = [
+            {"id": "app@exe", "name": "app", "filename": [os.path.join(self.build_dir, "app")],
+             "subproject": None, "target_sources": [{"sources": sources}]},
+            {"id": "tiny@exe", "name": "tiny", "filename": [os.path.join(self.build_dir, "tiny")],
+             "subproject": None, "target_sources": [{"sources": [os.path.join(self.source_dir, "t.c")]}]},
+        ]
+        common = ["/usr/include/c++/vector", "/usr/include/c++/string"]
+        self.deps = {f"app.p/{name}.cpp.o": common + [os.path.join(self.source_dir, f"{name}.h"), source]
+                     for name, source in zip("abcd", sources)}
+        self.deps["tiny.p/t.c.o"] = [os.path.join(self.source_dir, "t.h")]
+        self.durations = {f"app.p/{name}.cpp.o": 3000 for name in "abcd"}
+        self.durations.update({"tiny.p/t.c.o": 100, "app": 400})
+
+    def test_shared_system_headers_favour_unity_and_pch(self):
+        advice = advise(self.build_dir, self.source_dir, unity_size=4, targets=self.targets,
+                        deps=self.deps, durations=self.durations)
+        app = next(target for target in advice.targets if target.name == "app")
+        self.assertEqual(len(app.units), 4)
+        self.assertEqual(app.stable_headers, ["/usr/include/c++/string", "/usr/include/c++/vector"])
+        # Two thirds of each TU's headers are shared: 4 * 2s parsed once per batch of 4.
+        self.assertAlmostEqual(app.unity_savings, 6000)
+        self.assertAlmostEqual(app.pch_savings, 8000 * 0.8 - 2000)
+        self.assertEqual([target.name for target in advice.unity_targets()], ["app"])
+        self.assertEqual(advice.arguments(), ["-Dunity=on", "-Dunity_size=4", "-Db_pch=true"])
+        self.assertIn("cpp_pch: 'pch/app_pch.h'", advice.format())
+
+    def test_no_pch_without_stable_headers(self):
+        for deps in self.deps.values():
+            deps.append("/usr/include/stdc-predef.h")
+        advice = advise(self.build_dir, self.source_dir, unity_size=4, min_savings_ms=0, targets=self.targets,
+                        deps=self.deps, durations=self.durations)
+        app = next(target for target in advice.targets if target.name == "app")
+        self.assertNotIn("/usr/include/stdc-predef.h", app.stable_headers)
+        self.assertEqual([target.name for target in advice.pch_targets()], ["app"])
+        self.assertNotIn("tiny_pch", advice.format())
+
+    def test_no_timings_means_no_advice(self):
+        advice = advise(self.build_dir, self.source_dir, targets=self.targets, deps=self.deps, durations={})
+        self.assertEqual(advice.arguments(), [])
+        self.assertIn("build the project once", advice.format())
+
+
+class TestMesonBenchmarks(unittest.TestCase):
+    def test_regression_needs_the_whole_interval_above_zero(self):
+        reference = {"p:parse": [1.00, 1.02, 0.98, 1.01, 0.99], "p:noisy": [1.0, 1.4, 0.7, 1.2, 0.8]}
+        current = {"p:parse": [1.20, 1.22, 1.18, 1.21, 1.19], "p:noisy": [1.1, 1.5, 0.8, 1.3, 0.9]}
+        verdicts = {comparison.name: comparison.verdict for comparison in compare_benchmarks(current, reference)}
+        self.assertEqual(verdicts, {"p:noisy": "same", "p:parse": "regression"})
+        faster = {"p:parse": [0.80, 0.82, 0.78, 0.81, 0.79]}
+        self.assertEqual(compare_benchmarks(faster, reference)[0].verdict, "improvement")
+
+    def test_reads_repeated_runs_from_the_benchmark_log(self):
+        build_dir = temp_dir(self)
+        os.makedirs(os.path.join(build_dir, "meson-logs"))
+        with open(os.path.join(build_dir, "meson-logs", "fossil-benchmark.json"), "w") as handle:
+            for duration, result in ((0.5, "OK"), (0.6, "OK"), (0.1, "FAIL")):
+                handle.write(json.dumps({"name": "p:bench" if result == "OK" else "p:broken",
+                                         "result": result, "duration": duration}) + "\n")
+        samples, failed = read_benchmark_log(build_dir)
+        self.assertEqual((samples, failed), ({"p:bench": [0.5, 0.6]}, {"p:broken"}))
+        self.assertIn("p:broken: failed", format_benchmarks(samples, [], failed))
+
+
+class TestBuildSnapshots(unittest.TestCase):
+    def setUp(self):
+        self.build_dir = os.path.join(temp_dir(self), "builddir")
+        os.makedirs(os.path.join(self.build_dir, "meson-private"))
+        for relpath, text in (("app", "binary"), ("build.ninja", "rules"), ("meson-private/coredata.dat", "v1")):
+            with open(os.path.join(self.build_dir, relpath), "w") as handle:
+                handle.write(text)
+
+    def test_outputs_are_linked_and_bookkeeping_is_copied(self):
+        snapshots = BuildSnapshots(self.build_dir, methods=("hardlink", "copy"))
+        info = snapshots.create("before")
+        self.assertEqual(info["methods"], {"hardlink": 1, "copy": 2})
+        tree = os.path.join(snapshots.path_for(info["id"]), "tree")
+        self.assertTrue(os.path.samefile(os.path.join(tree, "app"), os.path.join(self.build_dir, "app")))
+        self.assertFalse(
+            os.path.samefile(os.path.join(tree, "build.ninja"), os.path.join(self.build_dir, "build.ninja"))
+        )
+
+    def test_restore_swaps_trees_and_drops_files_rewritten_in_place(self):
+        snapshots = BuildSnapshots(self.build_dir, methods=("hardlink", "copy"))
+        info = snapshots.create("before")
+        with open(os.path.join(self.build_dir, "meson-private", "coredata.dat"), "w") as handle:
+            handle.write("v2")
+        # Writing through the hardlink changes the snapshot's copy as well.
+        with open(os.path.join(self.build_dir, "app"), "a") as handle:
+            handle.write(" rebuilt")
+        stale, current = snapshots.restore(info["id"])
+        self.assertEqual(stale, ["app"])
+        self.assertFalse(os.path.exists(os.path.join(self.build_dir, "app")))
+        with open(os.path.join(self.build_dir, "meson-private", "coredata.dat")) as handle:
+            self.assertEqual(handle.read(), "v1")
+        self.assertEqual([snapshot["id"] for snapshot in snapshots.list()], [current["id"]])
+
+    def test_restore_within_the_same_millisecond(self):
+        snapshots = BuildSnapshots(self.build_dir, methods=("copy",))
+        with patch("code.snapshots.time.time", return_value=1700000000.5):
+            info = snapshots.create("before")
+            _, current = snapshots.restore(info["id"])
+        self.assertNotEqual(current["id"], info["id"])
+        self.assertEqual([snapshot["id"] for snapshot in snapshots.list()], [current["id"]])
+
+    def test_number_of_snapshots_is_capped(self):
+        snapshots = BuildSnapshots(self.build_dir, max_snapshots=2, methods=("copy",))
+        for label in ("one", "two", "three"):
+            snapshots.create(label)
+            time.sleep(0.002)
+        self.assertEqual([info["label"] for info in snapshots.list()], ["three", "two"])
+
+    @unittest.skipUnless(shutil.which("meson") and shutil.which("ninja") and shutil.which("cc"),
+                         "requires meson, ninja and a C compiler")
+    def test_restore_after_reconfigure_needs_no_rebuild(self):
+        source_dir = temp_dir(self)
+        with open(os.path.join(source_dir, "meson.build"), "w") as handle:
+            handle.write("project('demo', 'c')\nexecutable('demo', 'main.c')\n")
+        with open(os.path.join(source_dir, "main.c"), "w") as handle:
+            handle.write("int main(void) { return 0; }\n")
+        meson_build = MesonBuild(source_dir, os.path.join(source_dir, "builddir"))
+        meson_build.sample_resources = False
+        meson_build.snapshot_before_configure = True
+        meson_build.setup()
+        meson_build.compile()
+        meson_build.configure(["-Dbuildtype=release"])
+        self.assertTrue(meson_build.compile().ok)
+        snapshot = meson_build.snapshots().list()[0]
+        self.assertTrue(snapshot["label"].startswith("before configure -Dbuildtype=release"))
+        meson_build.restore_snapshot(snapshot["id"])
+        self.assertTrue(dry_run_plan(meson_build.build_dir).up_to_date)
+        options = {option["name"]: option["value"] for option in load_build_options(meson_build.build_dir)}
+        self.assertEqual(options["buildtype"], "debug")
+
+
+class TestHeaderFanout(unittest.TestCase):
+    def test_headers_are_ranked_by_the_compile_time_they_trigger(self):
+        source_dir = temp_dir(self)
+        build_dir = os.path.join(source_dir, "builddir")
+        config = os.path.join(source_dir, "config.h")
+        util = os.path.join(source_dir, "util.h")
+        targets = [{"id": "app@exe", "filename": [os.path.join(build_dir, "app")]},
+                   {"id": "lib@sha", "filename": [os.path.join(build_dir, "libx.so")]}]
+        deps = {
+            "app.p/main.c.o": [os.path.join(source_dir, "main.c"), config, util, "/usr/include/stdio.h"],
+            "app.p/util.c.o": [os.path.join(source_dir, "util.c"), util],
+            "libx.so.p/x.c.o": [os.path.join(source_dir, "x.c"), config],
+        }
+        durations = {"app.p/main.c.o": 4000, "app.p/util.c.o": 1000, "libx.so.p/x.c.o": 3000, "app": 500}
+
+        report = header_fanout(build_dir, source_dir, deps=deps, durations=durations, targets=targets)
+        self.assertEqual([cost.header for cost in report.headers], [config, util])
+        self.assertEqual((report.headers[0].cost_ms, report.headers[0].units), (7000, 2))
+        self.assertEqual(len(report.headers[0].targets), 2)
+        self.assertEqual(report.total_ms, 8000)
+        self.assertIn("config.h: 2 TUs in 2 targets, 7.0s to touch (88% of a full compile)",
+                      report.format(source_dir))
+        everything = header_fanout(build_dir, source_dir, project_only=False, deps=deps,
+                                   durations=durations, targets=targets)
+        self.assertIn("/usr/include/stdio.h", [cost.header for cost in everything.headers])
+
 if __name__ == '__main__':
     unittest.main()